@@ -8,17 +8,308 @@ Classification : Positif (>0.1), Négatif (<-0.1), Neutre (sinon)
 
 import pandas as pd
 import numpy as np
-from nltk.sentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
-import nltk
 import os
-from typing import Dict, List, Tuple
+import re
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
+from typing import Dict, List, Optional, Tuple
 
-# Télécharger VADER lexicon si nécessaire
 try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon', quiet=True)
+    from .nltk_resources import ensure_nltk_resource
+    from .partitioned_results import PartitionedResults, get_results_partition_dir
+    from .results_store import ResultsStore, get_results_db_path
+    from .score_cache import SentimentScoreCache
+    from .tesla_storage import data_path, read_table, stream_transform, write_table
+except ImportError:
+    from nltk_resources import ensure_nltk_resource
+    from partitioned_results import PartitionedResults, get_results_partition_dir
+    from results_store import ResultsStore, get_results_db_path
+    from score_cache import SentimentScoreCache
+    from tesla_storage import data_path, read_table, stream_transform, write_table
+
+# Colonnes de scores produites pour chaque tweet
+SCORE_COLUMNS = [
+    'vader_compound', 'vader_pos', 'vader_neu', 'vader_neg',
+    'textblob_polarity', 'textblob_subjectivity'
+]
+
+# Moteurs VADER disponibles : 'nltk' (SentimentIntensityAnalyzer) ou 'fast'
+# (lexique compilé, voir FastVaderScorer)
+VADER_ENGINES = ('nltk', 'fast')
+
+# Textes pris en charge par le moteur rapide : texte nettoyé (minuscules, sans ponctuation)
+FAST_VADER_TEXT_PATTERN = re.compile(r'[a-z ]*')
+
+# Version de la méthode de scoring (à incrémenter si le calcul des scores change)
+SCORING_VERSION = '1'
+
+
+def get_analyzer_version() -> str:
+    """
+    Retourne la version de l'analyseur (méthode de scoring, NLTK, TextBlob).
+    """
+    versions = [f"scoring={SCORING_VERSION}"]
+    for package in ('nltk', 'textblob'):
+        try:
+            versions.append(f"{package}={version(package)}")
+        except PackageNotFoundError:
+            versions.append(f"{package}=?")
+    return '|'.join(versions)
+
+# Le lexique VADER et TextBlob sont chargés à la première utilisation, et non
+# à l'import du module (les dashboards importent ce module)
+_textblob_class = None
+
+
+def _get_textblob():
+    """
+    Importe TextBlob à la première utilisation.
+    """
+    global _textblob_class
+    if _textblob_class is None:
+        from textblob import TextBlob
+        _textblob_class = TextBlob
+    return _textblob_class
+
+
+class FastVaderScorer:
+    """
+    Moteur VADER compilé pour les textes nettoyés ([a-z ]).
+    
+    Le lexique et les tables de boosters, de négations et d'expressions
+    idiomatiques sont compilés en tableaux NumPy indexés par identifiant de
+    mot. Un lot de textes est converti en séquences d'identifiants, puis noté
+    en quelques opérations vectorisées qui reproduisent les règles de
+    SentimentIntensityAnalyzer.polarity_scores (fenêtre de 3 mots précédents,
+    négations, "never so", "least", "but", idiomes).
+    
+    Sur du texte [a-z ] (ni majuscules ni ponctuation, donc sans les règles
+    correspondantes), les scores sont identiques à ceux de VADER à 1e-9 près.
+    Les autres textes sont confiés à l'analyseur VADER d'origine.
+    """
+    
+    def __init__(self, analyzer):
+        """
+        Compile les tables de l'analyseur VADER.
+        
+        Args:
+            analyzer: Instance de SentimentIntensityAnalyzer
+        """
+        self.analyzer = analyzer
+        self.constants = analyzer.constants
+        lexicon = analyzer.lexicon
+        boosters = self.constants.BOOSTER_DICT
+        idioms = self.constants.SPECIAL_CASE_IDIOMS
+        
+        words = set(lexicon) | set(boosters) | set(self.constants.NEGATE)
+        words |= {'never', 'so', 'this', 'least', 'at', 'very', 'but', 'kind', 'of'}
+        for phrase in list(idioms) + list(boosters):
+            words.update(phrase.split())
+        
+        # Identifiant 0 : mot inconnu (sans rôle dans les règles) ;
+        # dernier identifiant : position hors du texte
+        self.vocabulary = {word: i for i, word in enumerate(sorted(words), start=1)}
+        size = len(self.vocabulary) + 2
+        self.outside = size - 1
+        
+        self.valence = np.zeros(size)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        self.booster = np.zeros(size)
+        self.is_booster = np.zeros(size, dtype=bool)
+        self.negation = np.zeros(size, dtype=bool)
+        for word, i in self.vocabulary.items():
+            if word in lexicon:
+                self.valence[i] = lexicon[word]
+                self.in_lexicon[i] = True
+            if word in boosters:
+                self.booster[i] = boosters[word]
+                self.is_booster[i] = True
+            self.negation[i] = self.constants.negated([word])
+        
+        self.ids = {word: self.vocabulary[word] for word in
+                    ('never', 'so', 'this', 'least', 'at', 'very', 'but', 'kind', 'of')}
+        self.idioms = [
+            (tuple(self.vocabulary[word] for word in phrase.split()), value)
+            for phrase, value in idioms.items()
+        ]
+        self.booster_bigrams = [
+            tuple(self.vocabulary[word] for word in phrase.split())
+            for phrase in boosters if len(phrase.split()) == 2
+        ]
+    
+    def encode(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convertit des textes en séquences d'identifiants de mots.
+        
+        Comme VADER, les mots d'un seul caractère sont ignorés.
+        
+        Returns:
+            (identifiants concaténés, nombre de mots de chaque texte)
+        """
+        get = self.vocabulary.get
+        sequences = [[get(word, 0) for word in text.split() if len(word) > 1] for text in texts]
+        lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+        ids = np.fromiter(
+            (i for sequence in sequences for i in sequence), dtype=np.int64, count=int(lengths.sum())
+        )
+        return ids, lengths
+    
+    def score_ids(self, ids: np.ndarray, lengths: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Note un lot de séquences d'identifiants.
+        
+        Args:
+            ids: Identifiants concaténés (voir encode)
+            lengths: Nombre de mots de chaque texte
+            
+        Returns:
+            Dictionnaire 'compound', 'pos', 'neu', 'neg' -> tableau de scores
+        """
+        constants = self.constants
+        n_texts = len(lengths)
+        text_index = np.repeat(np.arange(n_texts), lengths)
+        starts = np.cumsum(lengths) - lengths
+        position = np.arange(len(ids)) - starts[text_index]
+        remaining = lengths[text_index] - position - 1
+        
+        # Mots voisins dans le même texte (offset négatif = mots précédents)
+        window = {0: ids}
+        for offset in (-3, -2, -1, 1, 2):
+            valid = position >= -offset if offset < 0 else remaining >= offset
+            neighbours = np.full(len(ids), self.outside)
+            neighbours[valid] = ids[np.flatnonzero(valid) + offset]
+            window[offset] = neighbours
+        
+        def so_or_this(words):
+            return (words == self.ids['so']) | (words == self.ids['this'])
+        
+        # Valence de chaque mot du lexique, modifiée par les 3 mots précédents
+        valence = self.valence[ids]
+        is_lexicon = self.in_lexicon[ids]
+        for k, scale in enumerate((1.0, 0.95, 0.9)):
+            previous = window[-(k + 1)]
+            active = is_lexicon & (position > k) & ~self.in_lexicon[previous]
+            
+            scalar = np.where(valence < 0, -self.booster[previous], self.booster[previous]) * scale
+            valence = np.where(active, valence + scalar, valence)
+            
+            if k == 1:
+                emphasis, factor = (window[-2] == self.ids['never']) & so_or_this(window[-1]), 1.5
+            elif k == 2:
+                emphasis = (window[-3] == self.ids['never']) & so_or_this(window[-2]) | so_or_this(window[-1])
+                factor = 1.25
+            else:
+                emphasis, factor = np.zeros(len(ids), dtype=bool), 1.0
+            negated = active & ~emphasis & self.negation[previous]
+            valence = np.where(active & emphasis, valence * factor, valence)
+            valence = np.where(negated, valence * constants.N_SCALAR, valence)
+            
+            if k == 2:
+                valence = self._idioms_check(valence, active, window)
+        
+        # Négation par "least" (sauf "at least" et "very least")
+        least = ~self.in_lexicon[window[-1]] & (window[-1] == self.ids['least'])
+        far = position > 1
+        keep = (window[-2] == self.ids['at']) | (window[-2] == self.ids['very'])
+        valence = np.where(is_lexicon & least & far & ~keep, valence * constants.N_SCALAR, valence)
+        valence = np.where(is_lexicon & least & ~far & (position > 0), valence * constants.N_SCALAR, valence)
+        
+        valence = np.where(is_lexicon, valence, 0.0)
+        skipped = self.is_booster[ids] | ((ids == self.ids['kind']) & (window[1] == self.ids['of']))
+        valence[skipped] = 0.0
+        
+        # VADER évalue chaque mot à sa première occurrence dans le texte (list.index)
+        _, first, inverse = np.unique(
+            text_index * len(self.valence) + ids, return_index=True, return_inverse=True
+        )
+        sentiments = valence[first[inverse]]
+        
+        # "but" : mots précédents atténués, mots suivants renforcés
+        is_but = ids == self.ids['but']
+        no_but = np.iinfo(np.int64).max
+        but_position = np.full(n_texts, no_but)
+        np.minimum.at(but_position, text_index[is_but], position[is_but])
+        but_position = but_position[text_index]
+        factor = np.where(position < but_position, 0.5, np.where(position > but_position, 1.5, 1.0))
+        sentiments = np.where(but_position != no_but, sentiments * factor, sentiments)
+        
+        # Agrégation par texte (sommes dans l'ordre des mots, comme VADER)
+        sum_s = np.bincount(text_index, weights=sentiments, minlength=n_texts)
+        pos_sum = np.bincount(text_index, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_texts)
+        neg_sum = np.bincount(text_index, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_texts)
+        neu_count = np.bincount(text_index[sentiments == 0], minlength=n_texts)
+        
+        has_words = lengths > 0
+        total = np.where(has_words, pos_sum + np.abs(neg_sum) + neu_count, 1.0)
+        scores = {
+            'compound': np.where(has_words, sum_s / np.sqrt(sum_s * sum_s + 15), 0.0),
+            'pos': np.where(has_words, np.abs(pos_sum / total), 0.0),
+            'neu': np.where(has_words, np.abs(neu_count / total), 0.0),
+            'neg': np.where(has_words, np.abs(neg_sum / total), 0.0),
+        }
+        
+        # Même arrondi que VADER (round de Python)
+        for key, digits in (('compound', 4), ('pos', 3), ('neu', 3), ('neg', 3)):
+            scores[key] = np.array([round(value, digits) for value in scores[key].tolist()])
+        return scores
+    
+    def _idioms_check(self, valence: np.ndarray, active: np.ndarray, window: Dict[int, np.ndarray]) -> np.ndarray:
+        """
+        Applique les expressions idiomatiques et les boosters de deux mots
+        ("kind of", "sort of"...) autour de chaque mot.
+        """
+        def matches(offsets, phrase_ids):
+            match = np.ones(len(valence), dtype=bool)
+            for offset, word_id in zip(offsets, phrase_ids):
+                match &= window[offset] == word_id
+            return match
+        
+        # Premier idiome trouvé parmi les mots précédents (dans l'ordre de VADER)
+        replaced = np.zeros(len(valence), dtype=bool)
+        idiom_valence = np.zeros(len(valence))
+        for offsets in ((-1, 0), (-2, -1, 0), (-2, -1), (-3, -2, -1), (-3, -2)):
+            for phrase_ids, value in self.idioms:
+                if len(phrase_ids) == len(offsets):
+                    match = ~replaced & matches(offsets, phrase_ids)
+                    idiom_valence[match] = value
+                    replaced |= match
+        valence = np.where(active & replaced, idiom_valence, valence)
+        
+        # Idiomes commençant par le mot lui-même
+        for offsets in ((0, 1), (0, 1, 2)):
+            for phrase_ids, value in self.idioms:
+                if len(phrase_ids) == len(offsets):
+                    valence = np.where(active & matches(offsets, phrase_ids), value, valence)
+        
+        bigram = np.zeros(len(valence), dtype=bool)
+        for phrase_ids in self.booster_bigrams:
+            bigram |= matches((-3, -2), phrase_ids) | matches((-2, -1), phrase_ids)
+        return np.where(active & bigram, valence + self.constants.B_DECR, valence)
+    
+    def score(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Calcule les scores VADER d'une liste de textes.
+        
+        Returns:
+            Dictionnaire 'compound', 'pos', 'neu', 'neg' -> tableau de scores
+        """
+        supported = [i for i, text in enumerate(texts) if FAST_VADER_TEXT_PATTERN.fullmatch(text)]
+        scores = {key: np.zeros(len(texts)) for key in ('compound', 'pos', 'neu', 'neg')}
+        
+        fast_scores = self.score_ids(*self.encode([texts[i] for i in supported]))
+        for key in scores:
+            scores[key][supported] = fast_scores[key]
+        
+        # Textes bruts (majuscules, ponctuation...) : analyseur VADER d'origine
+        if len(supported) < len(texts):
+            is_supported = np.zeros(len(texts), dtype=bool)
+            is_supported[supported] = True
+            for i in np.flatnonzero(~is_supported):
+                vader = self.analyzer.polarity_scores(texts[i])
+                for key in scores:
+                    scores[key][i] = vader[key]
+        
+        return scores
 
 
 class TeslaSentimentAnalyzer:
@@ -28,15 +319,63 @@ class TeslaSentimentAnalyzer:
     Utilise VADER (adapté aux réseaux sociaux) et TextBlob pour comparer.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        cache_max_entries: int = 5_000_000,
+        vader_engine: str = 'nltk'
+    ):
         """
         Initialise les analyseurs de sentiment.
+        
+        Le lexique VADER n'est chargé qu'à la première analyse.
+        
+        Args:
+            cache_path: Fichier SQLite du cache de scores (None = pas de cache)
+            cache_max_entries: Taille maximale du cache (éviction LRU au-delà)
+            vader_engine: Moteur VADER ('nltk' ou 'fast', voir FastVaderScorer)
+        """
+        if vader_engine not in VADER_ENGINES:
+            raise ValueError(
+                f"Moteur VADER inconnu : {vader_engine} (disponibles : {', '.join(VADER_ENGINES)})"
+            )
+        
+        self.vader_engine = vader_engine
+        self._vader_analyzer = None
+        self._fast_vader = None
+        
+        # Cache persistant des scores, indexé par texte nettoyé + version
+        if cache_path:
+            self.cache = SentimentScoreCache(
+                cache_path, SCORE_COLUMNS, get_analyzer_version(), cache_max_entries
+            )
+        else:
+            self.cache = None
+    
+    @property
+    def vader_analyzer(self):
+        """
+        Analyseur VADER (chargé à la première utilisation).
         """
-        # Initialiser VADER (Valence Aware Dictionary and sEntiment Reasoner)
-        # VADER est spécialement conçu pour les textes des réseaux sociaux
-        self.vader_analyzer = SentimentIntensityAnalyzer()
+        if self._vader_analyzer is None:
+            # Initialiser VADER (Valence Aware Dictionary and sEntiment Reasoner)
+            # VADER est spécialement conçu pour les textes des réseaux sociaux
+            ensure_nltk_resource('sentiment/vader_lexicon.zip', 'vader_lexicon')
+            from nltk.sentiment import SentimentIntensityAnalyzer
+            
+            self._vader_analyzer = SentimentIntensityAnalyzer()
+            print("✅ Analyseurs de sentiment initialisés (VADER + TextBlob)")
         
-        print("✅ Analyseurs de sentiment initialisés (VADER + TextBlob)")
+        return self._vader_analyzer
+    
+    @property
+    def fast_vader(self) -> FastVaderScorer:
+        """
+        Moteur VADER compilé (construit à la première utilisation).
+        """
+        if self._fast_vader is None:
+            self._fast_vader = FastVaderScorer(self.vader_analyzer)
+        return self._fast_vader
     
     def analyze_with_vader(self, text: str) -> Dict[str, float]:
         """
@@ -75,7 +414,7 @@ class TeslaSentimentAnalyzer:
                 'subjectivity': 0.0
             }
         
-        blob = TextBlob(str(text))
+        blob = _get_textblob()(str(text))
         return {
             'polarity': blob.sentiment.polarity,  # Entre -1 et 1
             'subjectivity': blob.sentiment.subjectivity  # Entre 0 et 1
@@ -101,51 +440,208 @@ class TeslaSentimentAnalyzer:
         else:
             return 'neutral'
     
-    def analyze_dataframe(self, df: pd.DataFrame, text_column: str = 'text_cleaned') -> pd.DataFrame:
+    def classify_sentiments(self, polarities: np.ndarray) -> np.ndarray:
+        """
+        Version vectorisée de classify_sentiment pour un tableau de polarités.
+        
+        Args:
+            polarities: Scores de polarité
+            
+        Returns:
+            Tableau de labels 'positive', 'negative' ou 'neutral'
+        """
+        polarities = np.asarray(polarities, dtype=float)
+        return np.select(
+            [polarities > 0.1, polarities < -0.1],
+            ['positive', 'negative'],
+            default='neutral'
+        ).astype(object)
+    
+    def score_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Calcule les scores VADER et TextBlob d'une liste de textes.
+        
+        Les scores sont écrits directement dans un tableau NumPy préalloué par
+        colonne ; un texte vide reçoit des scores nuls.
+        
+        Args:
+            texts: Textes nettoyés
+            
+        Returns:
+            Dictionnaire colonne -> tableau de scores (dans l'ordre des textes)
+        """
+        scores = {column: np.zeros(len(texts)) for column in SCORE_COLUMNS}
+        if not any(texts):
+            return scores
+        
+        compound, pos, neu, neg, polarity, subjectivity = (scores[column] for column in SCORE_COLUMNS)
+        TextBlob = _get_textblob()
+        
+        if self.vader_engine == 'fast':
+            vader = self.fast_vader.score(texts)
+            compound[:], pos[:], neu[:], neg[:] = vader['compound'], vader['pos'], vader['neu'], vader['neg']
+            polarity_scores = None
+        else:
+            polarity_scores = self.vader_analyzer.polarity_scores
+        
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            if polarity_scores is not None:
+                vader = polarity_scores(text)
+                compound[i] = vader['compound']
+                pos[i] = vader['pos']
+                neu[i] = vader['neu']
+                neg[i] = vader['neg']
+            
+            sentiment = TextBlob(text).sentiment
+            polarity[i] = sentiment.polarity
+            subjectivity[i] = sentiment.subjectivity
+        
+        return scores
+    
+    def score_texts(
+        self,
+        texts: pd.Series,
+        n_jobs: int = 1,
+        chunk_size: Optional[int] = None,
+        verbose: bool = False
+    ) -> pd.DataFrame:
+        """
+        Calcule les scores VADER et TextBlob d'une série de textes.
+        
+        Chaque texte distinct n'est analysé qu'une fois ; avec un cache, seuls
+        les textes jamais vus lors des exécutions précédentes sont analysés.
+        
+        Args:
+            texts: Série contenant les textes nettoyés
+            n_jobs: Nombre de processus (1 = séquentiel, -1 = tous les cœurs)
+            chunk_size: Nombre de textes par chunk en mode parallèle
+            verbose: Si True, affiche la progression
+            
+        Returns:
+            DataFrame (même index que l'entrée) avec une colonne par score
+        """
+        # Les valeurs manquantes reçoivent le code -1
+        codes, uniques = pd.factorize(texts)
+        unique_texts = [str(text) for text in uniques]
+        
+        # Une ligne de plus (scores nuls) pour les valeurs manquantes (code -1)
+        scores = {column: np.zeros(len(unique_texts) + 1) for column in SCORE_COLUMNS}
+        
+        # Rechercher les scores déjà connus
+        known = self.cache.get_many(unique_texts) if self.cache is not None else {}
+        if known:
+            known_positions = [i for i, text in enumerate(unique_texts) if text in known]
+            known_values = np.array([known[unique_texts[i]] for i in known_positions], dtype=float)
+            for j, column in enumerate(SCORE_COLUMNS):
+                scores[column][known_positions] = known_values[:, j]
+        
+        missing_positions = [i for i, text in enumerate(unique_texts) if text not in known]
+        missing = [unique_texts[i] for i in missing_positions]
+        
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        
+        if n_jobs > 1 and len(missing) > 1:
+            computed = self._score_parallel(missing, n_jobs, chunk_size, verbose)
+        else:
+            computed = self.score_batch(missing)
+        for column in SCORE_COLUMNS:
+            scores[column][missing_positions] = computed[column]
+        
+        if self.cache is not None:
+            rows = zip(*(computed[column].tolist() for column in SCORE_COLUMNS))
+            self.cache.put_many(dict(zip(missing, rows)))
+            if verbose:
+                stats = self.cache.stats()
+                print(f"   💾 Cache : {stats['hits']} hits / {stats['misses']} misses "
+                      f"({stats['hit_rate'] * 100:.1f}%)")
+        
+        return pd.DataFrame(
+            {column: values[codes] for column, values in scores.items()},
+            index=texts.index
+        )
+    
+    def analyze_dataframe(
+        self,
+        df: pd.DataFrame,
+        text_column: str = 'text_cleaned',
+        n_jobs: int = 1,
+        chunk_size: Optional[int] = None,
+        verbose: bool = True
+    ) -> pd.DataFrame:
         """
         Analyse le sentiment pour tous les tweets du DataFrame.
         
         Args:
             df: DataFrame avec les tweets nettoyés
             text_column: Nom de la colonne contenant le texte nettoyé
+            n_jobs: Nombre de processus (1 = séquentiel, -1 = tous les cœurs)
+            chunk_size: Nombre de tweets par chunk en mode parallèle
+                (défaut : 4 chunks par processus)
+            verbose: Si False, n'affiche pas la progression
             
         Returns:
             DataFrame avec les colonnes d'analyse de sentiment ajoutées
         """
-        print(f"📊 Analyse de sentiment pour {len(df)} tweets...")
+        if verbose:
+            print(f"📊 Analyse de sentiment pour {len(df)} tweets...")
         
         df_analyzed = df.copy()
         
-        # Analyse avec VADER
-        print("   🔍 Analyse VADER en cours...")
-        vader_scores = df_analyzed[text_column].apply(self.analyze_with_vader)
+        # Analyse avec VADER et TextBlob (pour comparaison)
+        if verbose:
+            print("   🔍 Analyse VADER et TextBlob en cours...")
+        scores = self.score_texts(df_analyzed[text_column], n_jobs, chunk_size, verbose)
         
-        df_analyzed['vader_compound'] = [s['compound'] for s in vader_scores]
-        df_analyzed['vader_pos'] = [s['pos'] for s in vader_scores]
-        df_analyzed['vader_neu'] = [s['neu'] for s in vader_scores]
-        df_analyzed['vader_neg'] = [s['neg'] for s in vader_scores]
+        for column in scores.columns:
+            df_analyzed[column] = scores[column]
         
         # Classification avec VADER (utilise compound score)
-        df_analyzed['sentiment_vader'] = df_analyzed['vader_compound'].apply(self.classify_sentiment)
-        
-        # Analyse avec TextBlob (pour comparaison)
-        print("   🔍 Analyse TextBlob en cours...")
-        textblob_scores = df_analyzed[text_column].apply(self.analyze_with_textblob)
-        
-        df_analyzed['textblob_polarity'] = [s['polarity'] for s in textblob_scores]
-        df_analyzed['textblob_subjectivity'] = [s['subjectivity'] for s in textblob_scores]
+        df_analyzed['sentiment_vader'] = self.classify_sentiments(scores['vader_compound'].to_numpy())
         
         # Classification avec TextBlob
-        df_analyzed['sentiment_textblob'] = df_analyzed['textblob_polarity'].apply(self.classify_sentiment)
+        df_analyzed['sentiment_textblob'] = self.classify_sentiments(scores['textblob_polarity'].to_numpy())
         
         # Utiliser VADER comme classification principale (plus adapté aux réseaux sociaux)
         df_analyzed['sentiment'] = df_analyzed['sentiment_vader']
         df_analyzed['polarity'] = df_analyzed['vader_compound']
         
-        print("✅ Analyse de sentiment terminée")
+        if verbose:
+            print("✅ Analyse de sentiment terminée")
         
         return df_analyzed
     
+    def _score_parallel(
+        self,
+        texts: List[str],
+        n_jobs: int,
+        chunk_size: Optional[int],
+        verbose: bool = True
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calcule les scores par chunks dans un pool de processus.
+        
+        Chaque worker charge une seule fois le lexique VADER ; les résultats
+        sont réassemblés dans l'ordre d'origine des textes.
+        """
+        if not chunk_size:
+            chunk_size = max(1, -(-len(texts) // (n_jobs * 4)))
+        
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        if verbose:
+            print(f"   ⚡ {len(chunks)} chunks répartis sur {n_jobs} processus")
+        
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                                 initargs=(self.vader_engine,)) as executor:
+            results = list(executor.map(_score_chunk, chunks))
+        
+        return {
+            column: np.concatenate([chunk_scores[column] for chunk_scores in results])
+            for column in SCORE_COLUMNS
+        }
+    
     def get_top_negative_tweets(self, df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
         """
         Identifie les N tweets les plus négatifs.
@@ -233,33 +729,147 @@ class TeslaSentimentAnalyzer:
         return indicators
 
 
-def main():
+# Analyseur propre à chaque processus worker (créé une seule fois par worker)
+_worker_analyzer = None
+
+
+def _init_worker(vader_engine: str = 'nltk'):
     """
-    Fonction principale pour exécuter l'analyse de sentiment.
+    Initialise l'analyseur (lexique VADER) d'un processus worker.
+    """
+    global _worker_analyzer
+    _worker_analyzer = TeslaSentimentAnalyzer(vader_engine=vader_engine)
+    # Charger (et compiler) le lexique VADER une fois pour toutes dans ce worker
+    _worker_analyzer.vader_analyzer
+    if vader_engine == 'fast':
+        _worker_analyzer.fast_vader
+
+
+def _score_chunk(texts: List[str]) -> Dict[str, np.ndarray]:
     """
-    input_file = "data/tesla_tweets_cleaned.csv"
-    output_file = "data/tesla_sentiment_results.csv"
+    Calcule les scores d'un chunk de textes dans un processus worker.
+    """
+    return _worker_analyzer.score_batch(texts)
+
+
+class StreamingStatistics:
+    """
+    Statistiques de sentiment calculées au fil de l'eau, chunk par chunk.
     
-    # Vérifier que le fichier d'entrée existe
-    if not os.path.exists(input_file):
-        print(f"❌ Fichier introuvable : {input_file}")
-        print("   Veuillez d'abord exécuter preprocess_tesla.py")
-        return
+    Produit le même dictionnaire que TeslaSentimentAnalyzer.get_statistics
+    sans conserver les tweets en mémoire (seuls les N plus négatifs sont gardés).
+    """
     
-    # Charger les données nettoyées
-    print(f"📂 Chargement des données depuis {input_file}...")
-    df_cleaned = pd.read_csv(input_file)
-    print(f"   {len(df_cleaned)} tweets chargés")
+    def __init__(self, top_n: int = 5):
+        self.top_n = top_n
+        self.total = 0
+        self.counts = {'positive': 0, 'negative': 0, 'neutral': 0}
+        self.polarity_sum = 0.0
+        self.polarity_sum_sq = 0.0
+        self.subjectivity_sum = 0.0
+        self.top_negative = None
     
-    # Initialiser l'analyseur
-    analyzer = TeslaSentimentAnalyzer()
+    def update(self, df: pd.DataFrame):
+        """
+        Ajoute un chunk de tweets analysés aux statistiques.
+        """
+        if len(df) == 0:
+            return
+        
+        self.total += len(df)
+        for sentiment, count in df['sentiment'].value_counts().items():
+            self.counts[sentiment] = self.counts.get(sentiment, 0) + int(count)
+        
+        polarity = df['polarity'].to_numpy(dtype=float)
+        self.polarity_sum += float(polarity.sum())
+        self.polarity_sum_sq += float((polarity ** 2).sum())
+        self.subjectivity_sum += float(df['textblob_subjectivity'].sum())
+        
+        # Conserver uniquement les N tweets les plus négatifs vus jusqu'ici
+        candidates = df.nsmallest(self.top_n, 'polarity')
+        if self.top_negative is not None:
+            candidates = pd.concat([self.top_negative, candidates])
+        self.top_negative = candidates.nsmallest(self.top_n, 'polarity')
     
-    # Analyser le sentiment
-    df_analyzed = analyzer.analyze_dataframe(df_cleaned)
+    def get_statistics(self) -> Dict:
+        """
+        Retourne les statistiques (mêmes clés que get_statistics).
+        """
+        total = self.total
+        mean = self.polarity_sum / total if total else float('nan')
+        if total > 1:
+            variance = (self.polarity_sum_sq - total * mean ** 2) / (total - 1)
+            std = float(np.sqrt(max(variance, 0.0)))
+        else:
+            std = float('nan')
+        
+        return {
+            'total_tweets': total,
+            'positive_count': self.counts['positive'],
+            'negative_count': self.counts['negative'],
+            'neutral_count': self.counts['neutral'],
+            'positive_percent': (self.counts['positive'] / total) * 100 if total else 0.0,
+            'negative_percent': (self.counts['negative'] / total) * 100 if total else 0.0,
+            'neutral_percent': (self.counts['neutral'] / total) * 100 if total else 0.0,
+            'mean_polarity': mean,
+            'std_polarity': std,
+            'mean_subjectivity': self.subjectivity_sum / total if total else float('nan')
+        }
+
+
+def analyze_streaming(
+    analyzer: TeslaSentimentAnalyzer,
+    input_file: str,
+    output_file: str,
+    chunk_size: int = 100_000,
+    n_jobs: int = 1,
+    results_store: Optional[ResultsStore] = None,
+    partitions: Optional[PartitionedResults] = None
+) -> StreamingStatistics:
+    """
+    Analyse un fichier CSV en streaming, chunk par chunk.
     
-    # Obtenir les statistiques
-    stats = analyzer.get_statistics(df_analyzed)
+    La mémoire reste bornée par la taille d'un chunk : chaque chunk est lu,
+    analysé puis ajouté au fichier de sortie. Une exécution interrompue reprend
+    après le dernier chunk écrit.
+    
+    Args:
+        analyzer: Analyseur à utiliser
+        input_file: Fichier CSV des tweets nettoyés
+        output_file: Fichier CSV de sortie
+        chunk_size: Nombre de tweets lus par chunk
+        n_jobs: Nombre de processus par chunk (1 = séquentiel, -1 = tous les cœurs)
+        results_store: Base des résultats alimentée chunk par chunk (optionnelle)
+        partitions: Partitions par jour alimentées chunk par chunk (optionnelles)
+        
+    Returns:
+        Statistiques des tweets analysés lors de cette exécution
+    """
+    print(f"🌊 Mode streaming : chunks de {chunk_size} tweets")
+    
+    chunks = stream_transform(
+        input_file,
+        output_file,
+        lambda chunk: analyzer.analyze_dataframe(chunk, n_jobs=n_jobs, verbose=False),
+        chunk_size=chunk_size
+    )
+    
+    statistics = StreamingStatistics(top_n=5)
+    for chunk in chunks:
+        if results_store is not None:
+            results_store.write(chunk)
+        if partitions is not None:
+            partitions.append(chunk)
+        statistics.update(chunk)
+        print(f"   ✅ {statistics.total} tweets analysés...")
     
+    return statistics
+
+
+def print_report(analyzer: TeslaSentimentAnalyzer, stats: Dict, top_negative: pd.DataFrame):
+    """
+    Affiche les statistiques de sentiment et les tweets les plus négatifs.
+    """
     print("\n📈 Statistiques de sentiment :")
     print(f"   Total tweets : {stats['total_tweets']}")
     print(f"   Positifs : {stats['positive_count']} ({stats['positive_percent']:.1f}%)")
@@ -267,11 +877,7 @@ def main():
     print(f"   Neutres : {stats['neutral_count']} ({stats['neutral_percent']:.1f}%)")
     print(f"   Polarité moyenne : {stats['mean_polarity']:.3f}")
     
-    # Identifier les 5 tweets les plus négatifs
-    print("\n🔍 Identification des 5 tweets les plus négatifs...")
-    top_negative = analyzer.get_top_negative_tweets(df_analyzed, n=5)
-    
-    print("\n📋 Top 5 tweets les plus négatifs :")
+    print(f"\n📋 Top {len(top_negative)} tweets les plus négatifs :")
     for idx, row in top_negative.iterrows():
         print(f"\n   Tweet #{idx}:")
         print(f"   Polarité: {row['polarity']:.3f}")
@@ -282,11 +888,89 @@ def main():
         sarcasm_indicators = analyzer.detect_sarcasm_indicators(row['text'])
         if sarcasm_indicators:
             print(f"   ⚠️  Indicateurs de sarcasme détectés: {', '.join(sarcasm_indicators)}")
+
+
+def main(
+    input_file: str = "data/tesla_tweets_cleaned.csv",
+    output_file: str = "data/tesla_sentiment_results.csv"
+):
+    """
+    Fonction principale pour exécuter l'analyse de sentiment.
+    
+    Définir STREAM_CHUNK_SIZE (ex. 100000) active le mode streaming, à
+    mémoire constante quelle que soit la taille du fichier.
+    TESLA_STORAGE_FORMAT=parquet lit et écrit des fichiers Parquet (hors
+    mode streaming, qui ajoute des chunks à un CSV).
+    Les résultats sont aussi enregistrés dans la base interrogée par les
+    dashboards (RESULTS_DB_PATH, vide pour la désactiver) et dans les
+    partitions par jour (RESULTS_PARTITION_DIR, vide pour les désactiver).
+    """
+    stream_chunk_size = int(os.getenv('STREAM_CHUNK_SIZE', '0'))
+    if stream_chunk_size <= 0:
+        input_file, output_file = data_path(input_file), data_path(output_file)
+    
+    # Vérifier que le fichier d'entrée existe
+    if not os.path.exists(input_file):
+        print(f"❌ Fichier introuvable : {input_file}")
+        print("   Veuillez d'abord exécuter preprocess_tesla.py")
+        return
+    
+    # Initialiser l'analyseur (cache de scores optionnel)
+    analyzer = TeslaSentimentAnalyzer(
+        cache_path=os.getenv('SCORE_CACHE_PATH'),
+        vader_engine=os.getenv('VADER_ENGINE', 'nltk')
+    )
+    n_jobs = int(os.getenv('N_JOBS', '1'))
+    results_db_path = get_results_db_path()
+    results_partition_dir = get_results_partition_dir()
+    
+    # Mode streaming (fichiers volumineux)
+    if stream_chunk_size > 0:
+        results_store = ResultsStore(results_db_path) if results_db_path else None
+        partitions = PartitionedResults(results_partition_dir) if results_partition_dir else None
+        statistics = analyze_streaming(
+            analyzer, input_file, output_file, stream_chunk_size, n_jobs, results_store, partitions
+        )
+        if statistics.total > 0:
+            top_negative = analyzer.get_top_negative_tweets(statistics.top_negative, n=5)
+            print_report(analyzer, statistics.get_statistics(), top_negative)
+        print(f"\n💾 Résultats sauvegardés dans {output_file}")
+        if results_store is not None:
+            results_store.close()
+            print(f"🗄️  Base des résultats : {results_db_path}")
+        if partitions is not None:
+            print(f"🗂️  Partitions par jour : {results_partition_dir}")
+        return
+    
+    # Charger les données nettoyées
+    print(f"📂 Chargement des données depuis {input_file}...")
+    df_cleaned = read_table(input_file)
+    print(f"   {len(df_cleaned)} tweets chargés")
+    
+    # Analyser le sentiment
+    df_analyzed = analyzer.analyze_dataframe(df_cleaned, n_jobs=n_jobs)
+    
+    # Obtenir les statistiques
+    stats = analyzer.get_statistics(df_analyzed)
+    
+    # Identifier les 5 tweets les plus négatifs
+    print("\n🔍 Identification des 5 tweets les plus négatifs...")
+    top_negative = analyzer.get_top_negative_tweets(df_analyzed, n=5)
+    
+    print_report(analyzer, stats, top_negative)
     
     # Sauvegarder les résultats
-    os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
-    df_analyzed.to_csv(output_file, index=False, encoding='utf-8')
+    write_table(df_analyzed, output_file)
     print(f"\n💾 Résultats sauvegardés dans {output_file}")
+    
+    # Alimenter la base interrogée par les dashboards
+    if results_db_path:
+        with ResultsStore(results_db_path) as results_store:
+            results_store.write(df_analyzed)
+        print(f"🗄️  Base des résultats : {results_db_path}")
+    if results_partition_dir:
+        written = PartitionedResults(results_partition_dir).append(df_analyzed)
+        print(f"🗂️  Partitions par jour : {written} nouveaux tweets dans {results_partition_dir}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,1032 @@
+"""
+Benchmarks de performance du pipeline Tesla Sentiment Analysis
+
+Ce script mesure les temps d'exécution des différentes étapes du pipeline
+sur des volumes synthétiques (construits à partir des tweets de test).
+
+Usage :
+    python src/benchmark_tesla.py cleaning
+    python src/benchmark_tesla.py tokenizers
+    python src/benchmark_tesla.py scaling
+    BENCH_STREAM_MB=2048 python src/benchmark_tesla.py streaming
+    python src/benchmark_tesla.py imports
+    python src/benchmark_tesla.py cache
+    python src/benchmark_tesla.py vader
+    python src/benchmark_tesla.py collector
+    python src/benchmark_tesla.py usernames
+    python src/benchmark_tesla.py id_index
+    python src/benchmark_tesla.py replay
+    python src/benchmark_tesla.py pipeline
+    python src/benchmark_tesla.py storage
+    python src/benchmark_tesla.py results_store
+    python src/benchmark_tesla.py partitions
+    python src/benchmark_tesla.py dataset_cache
+    python src/benchmark_tesla.py filters
+    python src/benchmark_tesla.py wordcloud
+"""
+
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from analyze_tesla_sentiment import TeslaSentimentAnalyzer
+from collect_tesla_tweets import TeslaTweetCollector
+from generate_test_data import TEST_TWEETS
+from run_pipeline import TeslaPipeline
+from preprocess_tesla import (
+    TeslaTextPreprocessor, TOKENIZER_BACKENDS, URL_PATTERN, MENTION_PATTERN,
+    NON_ALPHA_RUN_PATTERN, WHITESPACE_PATTERN
+)
+from dataset_cache import DatasetCache
+from nltk_resources import ensure_nltk_resource
+from partitioned_results import PartitionedResults
+from results_index import IndexedResults
+from results_store import ResultsStore
+from tesla_storage import SegmentStore, read_table, write_table
+from token_counts import merge_plurals
+from twitter_api_stub import TwitterAPIStub
+from twitter_sources import ReplayTwitterSource, generate_replay_pages
+from wordcloud_render import MAX_WORDS, render_wordcloud
+
+
+def make_raw_tweets(num_tweets: int, seed: int = 42) -> pd.Series:
+    """
+    Génère une série de tweets bruts synthétiques.
+
+    La moitié des tweets reprend un modèle de TEST_TWEETS à l'identique
+    (copier-coller, spam), l'autre moitié y ajoute une mention, un lien
+    et un hashtag uniques pour que le texte brut soit distinct.
+
+    Args:
+        num_tweets: Nombre de tweets à générer
+        seed: Graine du générateur aléatoire
+
+    Returns:
+        Série de textes bruts
+    """
+    rng = random.Random(seed)
+    base_texts = [text for text, _ in TEST_TWEETS]
+
+    texts = []
+    for i in range(num_tweets):
+        text = rng.choice(base_texts)
+        if i % 2:
+            text = f"@user{rng.randint(0, 10**6)} {text} https://t.co/{i:x} #EV{i % 97}"
+        texts.append(text)
+
+    return pd.Series(texts, name='text')
+
+
+def _timeit(func: Callable, *args, **kwargs) -> Tuple[object, float]:
+    """Exécute func et retourne (résultat, durée en secondes)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# Corpus de parité du nettoyage : valeurs manquantes, textes vides, liens,
+# mentions, hashtags, chiffres, ponctuation, contractions et emojis
+CLEANING_PARITY_TEXTS = [
+    np.nan,
+    None,
+    '',
+    '   ',
+    '!!! ... ???',
+    '2024 2025 1000',
+    'https://t.co/abc123',
+    'Tesla news http://example.com/model-3?ref=x and https://t.co/XyZ',
+    '@elonmusk',
+    '@elonmusk @Tesla Thanks for the update!',
+    'email me at someone@example.com',
+    '#Tesla',
+    '#Tesla #ModelY #EV2024 is the #1 car',
+    "I can't wait, I'm so excited! Don't you think it's great?",
+    'I cannot wait, gonna buy one. Wanna see the Cybertruck, gotta go',
+    'Lemme know, gimme a ride',
+    'Model 3 price cut by $5,000!!! 🚗⚡ #Tesla @Tesla https://t.co/x',
+    'Café déjà vu — naïve résumé',
+    'TESLA\tstock\nis   UP  10%',
+    'a b c an to of in my',
+]
+
+
+def benchmark_cleaning(sizes=(10_000, 100_000, 1_000_000)):
+    """
+    Compare clean_tweet (ligne par ligne) et clean_series (batch).
+
+    Vérifie d'abord que clean_series donne exactement le résultat de
+    clean_tweet sur un corpus fixe, puis sur chaque volume mesuré (échec
+    au premier texte différent).
+    """
+    preprocessor = TeslaTextPreprocessor(language='english', lemmatize=False)
+
+    corpus = pd.Series(CLEANING_PARITY_TEXTS, dtype=object)
+    expected = corpus.apply(preprocessor.clean_tweet)
+    result = preprocessor.clean_series(corpus)
+    for text, row, batch in zip(CLEANING_PARITY_TEXTS, expected, result):
+        if row != batch:
+            print(f"❌ {text!r} -> {batch!r} (attendu : {row!r})")
+    assert expected.tolist() == result.tolist(), "clean_series diffère de clean_tweet sur le corpus de parité"
+    print(f"✅ Parité du nettoyage : {len(corpus)} textes identiques\n")
+
+    print(f"{'Lignes':>10} | {'clean_tweet':>12} | {'clean_series':>12} | {'Gain':>6} | Identique")
+    print("-" * 62)
+    for size in sizes:
+        texts = make_raw_tweets(size)
+
+        expected, row_time = _timeit(texts.apply, preprocessor.clean_tweet)
+        result, batch_time = _timeit(preprocessor.clean_series, texts)
+
+        identical = expected.tolist() == result.tolist()
+        print(f"{size:>10} | {row_time:>11.2f}s | {batch_time:>11.2f}s | "
+              f"{row_time / batch_time:>5.1f}x | {'✅' if identical else '❌'}")
+        assert identical, f"clean_series diffère de clean_tweet ({size} lignes)"
+
+
+# Corpus de parité : texte nettoyé ([a-z ]) sans contraction, identique
+# pour tous les backends à str.split (toutes les lettres, espaces multiples,
+# en début et en fin de texte, faux amis des contractions)
+PARITY_TEXTS = [
+    '',
+    ' ',
+    'a b c d e f g h i j k l m n o p q r s t u v w x y z',
+    'abcdefghijklmnopqrstuvwxyz',
+    'the quick brown fox jumps over the lazy dog',
+    '  tesla   model y  is   great  ',
+    'cannon gonad wanted gotham lemma gimmick canned not gimmes gonnas',
+    'can not gon na got ta wan na lem me gim me',
+]
+
+# Contractions découpées par word_tokenize : texte -> tokens attendus
+PARITY_CONTRACTIONS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+    'i cannot wait gonna buy one': ['i', 'can', 'not', 'wait', 'gon', 'na', 'buy', 'one'],
+    'wanna see the cybertruck gotta go': ['wan', 'na', 'see', 'the', 'cybertruck', 'got', 'ta', 'go'],
+}
+
+
+@lru_cache(maxsize=1)
+def _punkt_available() -> bool:
+    """
+    Indique si le modèle Punkt (backend 'nltk') est disponible.
+    """
+    try:
+        ensure_nltk_resource('tokenizers/punkt', 'punkt')
+        return True
+    except LookupError:
+        return False
+
+
+def check_tokenizer_parity() -> int:
+    """
+    Vérifie la parité des backends de tokenisation sur un corpus fixe.
+
+    - Texte sans contraction : chaque backend donne les tokens de str.split.
+    - Contractions : 'regex' (et 'nltk') donnent les tokens de word_tokenize ;
+      'split' ne les découpe pas (str.split).
+    Le backend 'nltk' n'est comparé que si Punkt est disponible.
+
+    Returns:
+        Nombre de différences (0 = parité)
+    """
+    backends = [backend for backend in TOKENIZER_BACKENDS if backend != 'nltk' or _punkt_available()]
+    if 'nltk' not in backends:
+        print("⚠️  Modèle Punkt indisponible : backend 'nltk' non comparé")
+
+    cases = [(text, text.split(), text.split(), text.split()) for text in PARITY_TEXTS]
+    cases += [(text, expected, expected, text.split()) for text, expected in PARITY_CONTRACTIONS.items()]
+
+    mismatches = 0
+    for backend in backends:
+        tokenize = TeslaTextPreprocessor(tokenizer=backend)._tokenize
+        for text, nltk_tokens, regex_tokens, split_tokens in cases:
+            expected = {'nltk': nltk_tokens, 'regex': regex_tokens, 'split': split_tokens}[backend]
+            tokens = tokenize(text)
+            if tokens != expected:
+                mismatches += 1
+                print(f"❌ {backend} : {text!r} -> {tokens} (attendu : {expected})")
+    print(f"{'✅' if mismatches == 0 else '❌'} Parité des tokenizers ({', '.join(backends)}) : "
+          f"{len(cases)} textes, {mismatches} différences")
+    return mismatches
+
+
+def benchmark_tokenizers(size: int = 100_000):
+    """
+    Compare les backends de tokenisation sur du texte déjà normalisé ([a-z ]).
+    
+    Vérifie d'abord la parité des backends sur un corpus fixe (échec si un
+    token diffère), puis mesure le débit de chaque backend.
+    """
+    mismatches = check_tokenizer_parity()
+    assert mismatches == 0, f"Parité des tokenizers rompue : {mismatches} différences"
+    
+    texts = make_raw_tweets(size).tolist()
+    # Quelques contractions découpées par word_tokenize
+    texts += ["I cannot wait, gonna buy one", "wanna see the Cybertruck, gotta go"] * (size // 100)
+    
+    # Texte tel qu'il arrive au tokenizer dans clean_tweet (étapes 1 à 7)
+    normalized = []
+    for text in texts:
+        text = MENTION_PATTERN.sub('', URL_PATTERN.sub('', text))
+        text = NON_ALPHA_RUN_PATTERN.sub('', text).lower()
+        normalized.append(WHITESPACE_PATTERN.sub(' ', text))
+    
+    backends = [backend for backend in TOKENIZER_BACKENDS if backend != 'nltk' or _punkt_available()]
+    reference = 'nltk' if 'nltk' in backends else 'regex'
+    results = {}
+    print(f"\n{'Backend':>8} | {'Durée':>8} | {'Textes/s':>12} | Parité avec '{reference}'")
+    print("-" * 60)
+    for backend in backends:
+        tokenize = TeslaTextPreprocessor(tokenizer=backend)._tokenize
+        results[backend], elapsed = _timeit(lambda: [tokenize(text) for text in normalized])
+        
+        mismatches = sum(a != b for a, b in zip(results[backend], results[reference]))
+        parity = '✅' if mismatches == 0 else f"❌ {mismatches} textes différents"
+        print(f"{backend:>8} | {elapsed:>7.2f}s | {len(normalized) / elapsed:>12,.0f} | {parity}")
+
+
+def benchmark_scaling(size: int = 200_000, max_workers: int = None):
+    """
+    Mesure le passage à l'échelle de preprocess_dataframe et analyze_dataframe
+    de 1 à N processus (puissances de 2 jusqu'au nombre de cœurs).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != max_workers:
+        workers.append(max_workers)
+    
+    df_raw = pd.DataFrame({'text': make_raw_tweets(size)})
+    preprocessor = TeslaTextPreprocessor(language='english', lemmatize=False)
+    analyzer = TeslaSentimentAnalyzer()
+    df_cleaned = preprocessor.preprocess_dataframe(df_raw)
+    
+    timings = []
+    for n_jobs in workers:
+        _, clean_time = _timeit(preprocessor.preprocess_dataframe, df_raw, n_jobs=n_jobs)
+        _, score_time = _timeit(analyzer.analyze_dataframe, df_cleaned, n_jobs=n_jobs)
+        timings.append((n_jobs, clean_time, score_time))
+    
+    print(f"\n{size} tweets")
+    print(f"{'Processus':>9} | {'Nettoyage':>10} | {'Gain':>6} | {'Scoring':>9} | {'Gain':>6}")
+    print("-" * 52)
+    for n_jobs, clean_time, score_time in timings:
+        print(f"{n_jobs:>9} | {clean_time:>9.2f}s | {timings[0][1] / clean_time:>5.1f}x | "
+              f"{score_time:>8.2f}s | {timings[0][2] / score_time:>5.1f}x")
+
+
+def write_raw_csv(output_file: str, size_mb: float, batch_size: int = 100_000) -> int:
+    """
+    Écrit un fichier CSV de tweets bruts synthétiques d'environ size_mb Mo.
+    
+    Returns:
+        Nombre de tweets écrits
+    """
+    target_bytes = size_mb * 1024 * 1024
+    written = 0
+    batch = 0
+    
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        while f.tell() < target_bytes:
+            texts = make_raw_tweets(batch_size, seed=batch)
+            df = pd.DataFrame({
+                'id': range(written, written + batch_size),
+                'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(range(batch_size), unit='s'),
+                'text': texts,
+                'user': 'tesla_fan_2024',
+                'likes': 0,
+                'retweets': 0,
+                'replies': 0,
+                'quotes': 0
+            })
+            df.to_csv(f, index=False, header=(written == 0))
+            written += batch_size
+            batch += 1
+    
+    return written
+
+
+def _peak_rss_mb(module: str, input_file: str, output_file: str, stream_chunk_size: int) -> str:
+    """
+    Exécute module.main dans un sous-processus et retourne son pic de mémoire (RSS).
+    """
+    code = (
+        "import resource, sys\n"
+        f"sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r})\n"
+        f"import {module}\n"
+        f"{module}.main({input_file!r}, {output_file!r})\n"
+        "print('PEAK_RSS_KB', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    )
+    env = dict(os.environ, STREAM_CHUNK_SIZE=str(stream_chunk_size))
+    
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    
+    for line in result.stdout.splitlines():
+        if line.startswith('PEAK_RSS_KB'):
+            return f"{int(line.split()[1]) / 1024:>8.0f} Mo en {elapsed:.0f}s"
+    return f"échec (code {result.returncode})"
+
+
+def benchmark_streaming(size_mb: float = None, analyze_mb: float = None, chunk_size: int = 100_000):
+    """
+    Compare le pic de mémoire (RSS) des CLIs en mode batch et en mode streaming.
+    
+    Le nettoyage est mesuré sur un fichier de size_mb Mo (BENCH_STREAM_MB,
+    défaut 2048) ; l'analyse, bien plus lente, sur les analyze_mb premiers Mo
+    (BENCH_STREAM_ANALYZE_MB, défaut 64).
+    """
+    size_mb = size_mb or float(os.getenv('BENCH_STREAM_MB', '2048'))
+    analyze_mb = analyze_mb or float(os.getenv('BENCH_STREAM_ANALYZE_MB', '64'))
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        raw_file = os.path.join(tmp_dir, 'raw.csv')
+        small_raw_file = os.path.join(tmp_dir, 'raw_small.csv')
+        cleaned_file = os.path.join(tmp_dir, 'cleaned.csv')
+        
+        print(f"📝 Génération de {size_mb:.0f} Mo de tweets bruts...")
+        num_tweets = write_raw_csv(raw_file, size_mb)
+        write_raw_csv(small_raw_file, analyze_mb)
+        
+        print(f"\n{'Étape':>12} | {'Entrée':>8} | {'Batch':>20} | {'Streaming':>20}")
+        print("-" * 70)
+        
+        batch = _peak_rss_mb('preprocess_tesla', raw_file, cleaned_file, 0)
+        stream = _peak_rss_mb('preprocess_tesla', raw_file, cleaned_file, chunk_size)
+        print(f"{'Nettoyage':>12} | {size_mb:>5.0f} Mo | {batch:>20} | {stream:>20}")
+        
+        # Analyse sur un sous-ensemble nettoyé
+        _peak_rss_mb('preprocess_tesla', small_raw_file, cleaned_file, chunk_size)
+        results_file = os.path.join(tmp_dir, 'results.csv')
+        batch = _peak_rss_mb('analyze_tesla_sentiment', cleaned_file, results_file, 0)
+        stream = _peak_rss_mb('analyze_tesla_sentiment', cleaned_file, results_file, chunk_size)
+        print(f"{'Analyse':>12} | {analyze_mb:>5.0f} Mo | {batch:>20} | {stream:>20}")
+        
+        print(f"\n({num_tweets} tweets bruts, chunks de {chunk_size} tweets)")
+
+
+def benchmark_imports():
+    """
+    Mesure le temps d'import de chaque module de src/ avec python -X importtime.
+    
+    Chaque module est importé dans un processus neuf ; le tableau indique le
+    temps cumulé, la dépendance la plus coûteuse et si NLTK / TextBlob ont été
+    chargés dès l'import.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    modules = sorted(
+        name[:-3] for name in os.listdir(src_dir)
+        if name.endswith('.py') and name not in ('__init__.py', 'benchmark_tesla.py')
+    )
+    
+    print(f"{'Module':>26} | {'Import':>9} | {'NLTK':>4} | {'TextBlob':>8} | Dépendance la plus lourde")
+    print("-" * 90)
+    for module in modules:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=src_dir, capture_output=True, text=True
+        )
+        
+        # Lignes "import time: self [us] | cumulative | imported package"
+        timings = []
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            timings.append((int(cumulative), name.rstrip()))
+        
+        if result.returncode != 0 or not timings:
+            print(f"{module:>26} | {'échec':>9} |")
+            continue
+        
+        # Le module apparaît au niveau 0 ; ses imports directs au niveau 1, juste avant lui
+        position = max(i for i, (_, name) in enumerate(timings) if name.strip() == module)
+        total = timings[position][0]
+        direct = []
+        for cumulative, name in reversed(timings[:position]):
+            depth = (len(name) - len(name.lstrip())) // 2
+            if depth == 0:
+                break
+            if depth == 1:
+                direct.append((cumulative, name.strip()))
+        heaviest = max(direct, default=(0, '-'))
+        loaded = {name.strip().split('.')[0] for _, name in timings}
+        
+        print(f"{module:>26} | {total / 1000:>7.0f}ms | {'oui' if 'nltk' in loaded else 'non':>4} | "
+              f"{'oui' if 'textblob' in loaded else 'non':>8} | {heaviest[1]} ({heaviest[0] / 1000:.0f}ms)")
+
+
+def make_cleaned_texts(num_texts: int, seed: int = 0) -> pd.Series:
+    """
+    Génère des textes nettoyés majoritairement distincts (mots des tweets de test).
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted({word for text, _ in TEST_TWEETS for word in text.lower().split() if word.isalpha()})
+    return pd.Series([
+        ' '.join(rng.choices(vocabulary, k=rng.randint(5, 15))) for _ in range(num_texts)
+    ])
+
+
+def benchmark_cache(size: int = 50_000, new_fraction: float = 0.1):
+    """
+    Mesure l'effet du cache de scores : exécution à froid, répétée puis
+    incrémentale (une fraction de textes nouveaux).
+
+    Chaque exécution doit donner exactement les scores calculés sans cache.
+    """
+    texts = make_cleaned_texts(size)
+    new_count = int(size * new_fraction)
+    incremental = pd.concat([texts.iloc[new_count:], make_cleaned_texts(new_count, seed=1)],
+                            ignore_index=True)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        analyzer = TeslaSentimentAnalyzer(cache_path=os.path.join(tmp_dir, 'scores.db'))
+        reference, no_cache_time = _timeit(TeslaSentimentAnalyzer().score_texts, texts)
+        incremental_reference = TeslaSentimentAnalyzer().score_texts(incremental)
+        
+        print(f"{'Exécution':>12} | {'Durée':>8} | {'Gain':>6} | {'Hits':>8} | {'Misses':>8} | Identique")
+        print("-" * 68)
+        print(f"{'sans cache':>12} | {no_cache_time:>7.2f}s | {1.0:>5.1f}x | {'-':>8} | {'-':>8} |")
+        runs = (('à froid', texts, reference), ('répétée', texts, reference),
+                ('incrémentale', incremental, incremental_reference))
+        for label, batch, expected in runs:
+            hits, misses = analyzer.cache.hits, analyzer.cache.misses
+            result, elapsed = _timeit(analyzer.score_texts, batch)
+            identical = result.equals(expected)
+            print(f"{label:>12} | {elapsed:>7.2f}s | {no_cache_time / elapsed:>5.1f}x | "
+                  f"{analyzer.cache.hits - hits:>8} | {analyzer.cache.misses - misses:>8} | "
+                  f"{'✅' if identical else '❌'}")
+            assert identical, f"Scores en cache différents des scores calculés (exécution {label})"
+        analyzer.cache.close()
+
+
+# Mots qui déclenchent les règles de VADER (boosters, négations, idiomes, "but"...)
+VADER_RULE_WORDS = [
+    'not', 'never', 'no', 'without', 'nope', 'isnt', 'dont', 'so', 'this', 'least', 'at',
+    'very', 'extremely', 'more', 'barely', 'kinda', 'kind', 'sort', 'of', 'just', 'enough',
+    'but', 'the', 'shit', 'bomb', 'bad', 'ass', 'yeah', 'right', 'cut', 'mustard', 'kiss',
+    'death', 'hand', 'to', 'mouth', 'good', 'great', 'love', 'best', 'happy', 'hate',
+    'terrible', 'worst', 'sad', 'tesla', 'car', 'a', 'i'
+]
+
+# Écart maximal toléré entre le moteur rapide et VADER sur du texte nettoyé
+VADER_TOLERANCE = 1e-9
+
+
+def benchmark_vader(size: int = 100_000):
+    """
+    Compare le moteur VADER compilé ('fast') à SentimentIntensityAnalyzer.
+    
+    Le corpus de parité mélange des tweets nettoyés et des combinaisons
+    aléatoires de mots déclenchant les règles de VADER.
+    """
+    rng = random.Random(0)
+    rule_texts = [' '.join(rng.choices(VADER_RULE_WORDS, k=rng.randint(0, 20))) for _ in range(size // 2)]
+    texts = make_cleaned_texts(size - len(rule_texts)).tolist() + rule_texts
+    
+    analyzer = TeslaSentimentAnalyzer(vader_engine='fast')
+    polarity_scores = analyzer.vader_analyzer.polarity_scores
+    _, compile_time = _timeit(lambda: analyzer.fast_vader)
+    
+    reference, stock_time = _timeit(lambda: [polarity_scores(text) for text in texts])
+    result, fast_time = _timeit(analyzer.fast_vader.score, texts)
+    
+    print(f"{len(texts)} textes (compilation du lexique : {compile_time:.2f}s)")
+    print(f"{'Moteur':>6} | {'Durée':>8} | {'Textes/s':>12} | {'Gain':>6}")
+    print("-" * 44)
+    print(f"{'nltk':>6} | {stock_time:>7.2f}s | {len(texts) / stock_time:>12,.0f} | {1.0:>5.1f}x")
+    print(f"{'fast':>6} | {fast_time:>7.2f}s | {len(texts) / fast_time:>12,.0f} | {stock_time / fast_time:>5.1f}x")
+    
+    print(f"\nParité (tolérance {VADER_TOLERANCE:g}) :")
+    out_of_tolerance = []
+    for key in ('compound', 'pos', 'neu', 'neg'):
+        expected = np.array([scores[key] for scores in reference])
+        difference = np.abs(expected - result[key])
+        within = difference.max() <= VADER_TOLERANCE
+        if not within:
+            out_of_tolerance.append(key)
+        print(f"   {key:>8} : écart max {difference.max():.2e}, "
+              f"{int((difference > VADER_TOLERANCE).sum())} textes hors tolérance {'✅' if within else '❌'}")
+    assert not out_of_tolerance, f"Moteur rapide hors tolérance : {', '.join(out_of_tolerance)}"
+
+
+def benchmark_collector(max_tweets: int = 5_000, latency: float = 0.1, windows=(1, 2, 4, 8)):
+    """
+    Compare la collecte séquentielle (1 fenêtre) et concurrente (N fenêtres)
+    contre le serveur local imitant search/recent (latence simulée).
+    """
+    with TwitterAPIStub(num_tweets=max_tweets * 2, latency=latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"{max_tweets} tweets, latence simulée {latency * 1000:.0f} ms/requête\n")
+        
+        timings = []
+        for num_windows in windows:
+            collector = TeslaTweetCollector(
+                bearer_token='stub', api_base_url=stub.base_url,
+                user_cache_path=os.path.join(tmp_dir, f'users_{num_windows}.json')
+            )
+            requests_before = stub.request_count
+            output_file = os.path.join(tmp_dir, f'tweets_{num_windows}.csv')
+            df, elapsed = _timeit(
+                collector.collect_tweets_concurrent, max_tweets, output_file,
+                num_windows=num_windows, max_concurrency=num_windows
+            )
+            timings.append((num_windows, len(df), elapsed, stub.request_count - requests_before))
+    
+    print(f"\n{'Fenêtres':>8} | {'Tweets':>7} | {'Durée':>8} | {'Tweets/s':>9} | {'Requêtes':>8} | {'Gain':>6}")
+    print("-" * 62)
+    for num_windows, count, elapsed, num_requests in timings:
+        print(f"{num_windows:>8} | {count:>7} | {elapsed:>7.2f}s | {count / elapsed:>9,.0f} | "
+              f"{num_requests:>8} | {timings[0][2] / elapsed:>5.1f}x")
+
+
+def benchmark_usernames(num_tweets: int = 20_000, num_users: int = 2_000, latency: float = 0.05):
+    """
+    Mesure la recherche des usernames absents de includes.users : par lots de
+    100 ids (séquentielle puis parallèle), puis avec le cache persistant.
+    """
+    with TwitterAPIStub(num_tweets=10, num_users=num_users, latency=latency) as stub, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        rng = np.random.default_rng(42)
+        user_ids = np.array(list(stub.users))[rng.integers(0, num_users, num_tweets)]
+        print(f"{num_tweets} tweets, {num_users} auteurs, latence simulée {latency * 1000:.0f} ms/requête\n")
+        
+        runs = [
+            ('Lots de 100, séquentiel', 'cold_1.json', 1),
+            ('Lots de 100, 4 threads', 'cold_4.json', 4),
+            ('Cache persistant', 'cold_4.json', 4),
+        ]
+        print(f"{'Recherche':<24} | {'Durée':>8} | {'Requêtes':>8} | {'Inconnus':>8}")
+        print("-" * 58)
+        for label, cache_file, workers in runs:
+            collector = TeslaTweetCollector(
+                bearer_token='stub', api_base_url=stub.base_url,
+                user_cache_path=os.path.join(tmp_dir, cache_file), lookup_workers=workers
+            )
+            df = pd.DataFrame({'id': np.arange(num_tweets), 'user_id': user_ids, 'user': None})
+            lookups_before = stub.user_lookup_count
+            df, elapsed = _timeit(collector._add_usernames, df)
+            unknown = int((df['user'] == 'unknown').sum())
+            print(f"{label:<24} | {elapsed:>7.3f}s | {stub.user_lookup_count - lookups_before:>8} | {unknown:>8}")
+
+
+def benchmark_id_index(sizes=(1_000_000, 5_000_000), num_queries: int = 100):
+    """
+    Compare la reprise de la collecte : set de chaînes relu depuis le CSV
+    (load_keys) et index persistant des ids (TweetIdIndex).
+    """
+    rng = np.random.default_rng(42)
+    print(f"{'Tweets':>10} | {'Méthode':<14} | {'Ouverture':>10} | {'Recherche':>10} | {'Mémoire':>9}")
+    print("-" * 66)
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = os.path.join(tmp_dir, 'tweets.csv')
+            ids = np.unique(rng.integers(1_700_000_000_000_000_000, 1_900_000_000_000_000_000, size))
+            pd.DataFrame({'id': ids, 'text': 'Tesla'}).to_csv(output_file, index=False)
+            queries = rng.choice(ids, num_queries).tolist()
+            
+            store = SegmentStore(output_file)
+            keys, load_time = _timeit(store.load_keys)
+            _, lookup_time = _timeit(lambda: [str(tweet_id) in keys for tweet_id in queries])
+            memory = sys.getsizeof(keys) + sum(sys.getsizeof(key) for key in keys)
+            print(f"{len(ids):>10,} | {'set (CSV)':<14} | {load_time:>9.3f}s | "
+                  f"{lookup_time * 1000:>8.3f}ms | {memory / 1e6:>7.0f}MB")
+            del keys
+            
+            SegmentStore(output_file, index_keys=True)  # construction initiale de l'index
+            store, open_time = _timeit(SegmentStore, output_file, index_keys=True)
+            found, lookup_time = _timeit(store.index.contains, queries)
+            assert found.all()
+            print(f"{len(ids):>10,} | {'TweetIdIndex':<14} | {open_time:>9.3f}s | "
+                  f"{lookup_time * 1000:>8.3f}ms | {len(store.index) * 8 / 1e6:>5.0f}MB*")
+    print("\n* fichier projeté en mémoire (memory-map), chargé à la demande")
+
+
+def benchmark_replay(
+    max_tweets: int = 10_000,
+    scenarios=((0.0, 0.0), (0.02, 0.0), (0.02, 0.1), (0.02, 0.3)),
+    retry_after: float = 0.2
+):
+    """
+    Mesure la boucle de collecte séquentielle (collect_tweets) sur des pages
+    rejouées depuis le disque, avec latence et 429 simulés.
+    
+    Args:
+        max_tweets: Nombre de tweets à collecter
+        scenarios: Couples (latence en secondes, probabilité d'un 429)
+        retry_after: Délai annoncé par les réponses 429 (secondes)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pages_dir = os.path.join(tmp_dir, 'pages')
+        num_pages = generate_replay_pages(pages_dir, num_tweets=max_tweets)
+        print(f"{num_pages} pages rejouées ({max_tweets} tweets), 429 : reprise après {retry_after}s\n")
+        
+        results = []
+        for i, (latency, throttle_rate) in enumerate(scenarios):
+            source = ReplayTwitterSource(
+                pages_dir, latency=latency, throttle_rate=throttle_rate, retry_after=retry_after
+            )
+            collector = TeslaTweetCollector(
+                source=source, user_cache_path=os.path.join(tmp_dir, f'users_{i}.json')
+            )
+            df, elapsed = _timeit(
+                collector.collect_tweets, max_tweets, os.path.join(tmp_dir, f'tweets_{i}.csv')
+            )
+            results.append((latency, throttle_rate, len(df), elapsed, source.request_count, source.throttled_count))
+    
+    print(f"\n{'Latence':>8} | {'429':>5} | {'Tweets':>7} | {'Durée':>8} | {'Tweets/s':>9} | "
+          f"{'Requêtes':>8} | {'Réessais':>8}")
+    print("-" * 73)
+    for latency, throttle_rate, count, elapsed, num_requests, retries in results:
+        print(f"{latency * 1000:>6.0f}ms | {throttle_rate:>5.0%} | {count:>7} | {elapsed:>7.2f}s | "
+              f"{count / elapsed:>9,.0f} | {num_requests:>8} | {retries:>8}")
+
+
+def benchmark_pipeline(max_tweets: int = 10_000, latency: float = 0.05, batch_size: int = 500):
+    """
+    Compare l'enchaînement des trois étapes (fichiers complets) et le
+    pipeline en flux (files bornées, micro-lots) sur des pages rejouées :
+    durée totale et délai entre la collecte d'un tweet et son résultat.
+
+    Le pipeline tourne avec le cache de scores (SCORE_CACHE_PATH), ouvert
+    dans le thread principal et interrogé par le thread d'analyse.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pages_dir = os.path.join(tmp_dir, 'pages')
+        generate_replay_pages(pages_dir, num_tweets=max_tweets)
+        preprocessor = TeslaTextPreprocessor(lemmatize=False)
+        analyzer = TeslaSentimentAnalyzer()
+        print(f"{max_tweets} tweets rejoués, latence simulée {latency * 1000:.0f} ms/requête\n")
+        
+        def make_collector(name: str) -> TeslaTweetCollector:
+            return TeslaTweetCollector(
+                source=ReplayTwitterSource(pages_dir, latency=latency),
+                user_cache_path=os.path.join(tmp_dir, f'users_{name}.json')
+            )
+        
+        # Étapes successives : un tweet n'a de résultat qu'à la fin de l'analyse
+        def run_batch():
+            fetched_at = []
+            df = make_collector('batch').collect_tweets(
+                max_tweets, os.path.join(tmp_dir, 'batch_raw.csv'),
+                on_page=lambda tweets: fetched_at.extend([time.time()] * len(tweets))
+            )
+            df = preprocessor.preprocess_dataframe(df, verbose=False)
+            df = analyzer.analyze_dataframe(df, verbose=False)
+            df.to_csv(os.path.join(tmp_dir, 'batch_results.csv'), index=False)
+            return time.time() - np.array(fetched_at)
+        
+        batch_latencies, batch_time = _timeit(run_batch)
+        
+        cached_analyzer = TeslaSentimentAnalyzer(cache_path=os.path.join(tmp_dir, 'scores.sqlite'))
+        pipeline = TeslaPipeline(
+            make_collector('pipeline'), preprocessor, cached_analyzer,
+            output_file=os.path.join(tmp_dir, 'pipeline_results.csv'),
+            batch_size=batch_size, report_interval=0
+        )
+        metrics, pipeline_time = _timeit(pipeline.run, max_tweets, os.path.join(tmp_dir, 'pipeline_raw.csv'))
+        cache_stats = cached_analyzer.cache.stats()
+        cached_analyzer.cache.close()
+    
+    written = metrics['écriture']
+    assert written['tweets'] == metrics['collecte']['tweets'], "Tweets collectés non analysés par le pipeline"
+    assert cache_stats['hits'] + cache_stats['misses'] > 0, "Cache de scores non interrogé par le pipeline"
+    print(f"\n{'Mode':<22} | {'Durée':>8} | {'Latence p50':>11} | {'Latence p95':>11}")
+    print("-" * 62)
+    print(f"{'Étapes successives':<22} | {batch_time:>7.2f}s | {np.percentile(batch_latencies, 50):>10.2f}s | "
+          f"{np.percentile(batch_latencies, 95):>10.2f}s")
+    print(f"{'Pipeline en flux':<22} | {pipeline_time:>7.2f}s | {written['latency_p50']:>10.2f}s | "
+          f"{written['latency_p95']:>10.2f}s")
+
+
+def make_analyzed_results(size: int, days: int = 90, seed: int = 42) -> pd.DataFrame:
+    """
+    Génère des résultats d'analyse synthétiques (colonnes des dashboards),
+    répartis sur les derniers jours.
+    """
+    rng = np.random.default_rng(seed)
+    texts = make_raw_tweets(size, seed)
+    polarity = rng.uniform(-1, 1, size).round(4)
+    return pd.DataFrame({
+        'id': np.arange(1_800_000_000_000_000_000, 1_800_000_000_000_000_000 + size),
+        'date': pd.Timestamp('2026-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, days * 86400, size), unit='s'),
+        'text': texts,
+        'user': [f"user{i % 5000}" for i in range(size)],
+        'likes': rng.integers(0, 1000, size),
+        'retweets': rng.integers(0, 200, size),
+        'text_cleaned': texts.str.lower(),
+        'polarity': polarity,
+        'vader_compound': polarity,
+        'vader_neg': np.clip(-polarity, 0, 1),
+        'sentiment': np.where(polarity > 0.05, 'positive', np.where(polarity < -0.05, 'negative', 'neutral')),
+        'mentioned_models': [['model 3'] if i % 3 == 0 else [] for i in range(size)],
+    })
+
+
+def benchmark_storage(sizes=(100_000, 1_000_000), columns=('date', 'sentiment', 'polarity')):
+    """
+    Compare les résultats d'analyse stockés en CSV et en Parquet : taille,
+    chargement complet et chargement des seules colonnes du dashboard.
+    """
+    print(f"{'Tweets':>10} | {'Format':<8} | {'Taille':>9} | {'Écriture':>9} | {'Lecture':>9} | {'Projection':>10}")
+    print("-" * 72)
+    for size in sizes:
+        df = make_analyzed_results(size)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for extension in ('csv', 'parquet'):
+                path = os.path.join(tmp_dir, f"results.{extension}")
+                _, write_time = _timeit(write_table, df, path)
+                loaded, read_time = _timeit(read_table, path)
+                assert len(loaded) == size and loaded['mentioned_models'].iloc[0] == ['model 3']
+                _, projected_time = _timeit(read_table, path, list(columns))
+                print(f"{size:>10,} | {extension:<8} | {os.path.getsize(path) / 1e6:>7.1f}MB | "
+                      f"{write_time:>8.2f}s | {read_time:>8.2f}s | {projected_time:>9.3f}s")
+    print(f"\nProjection : {', '.join(columns)}")
+
+
+def _same_aggregates(rollup, raw) -> bool:
+    """
+    Compare les agrégats lus dans les cumuls à ceux calculés sur les tweets :
+    comptes identiques, sommes des polarités (et des carrés) égales à
+    l'arrondi flottant près. Les histogrammes par jour doivent être identiques.
+    """
+    if not isinstance(raw, dict):
+        return rollup == raw
+    if rollup.keys() != raw.keys():
+        return False
+    for key, expected in raw.items():
+        group = rollup[key]
+        if group['count'] != expected['count'] or group['polarity_count'] != expected['polarity_count']:
+            return False
+        for column in ('polarity_sum', 'polarity_sumsq'):
+            if not math.isclose(group[column], expected[column], rel_tol=1e-9, abs_tol=1e-9):
+                return False
+    return True
+
+
+def benchmark_results_store(sizes=(100_000, 1_000_000, 3_000_000), window_days: int = 7):
+    """
+    Compare les requêtes des dashboards (statistiques, histogramme par jour,
+    tweets les plus négatifs) : Parquet relu et filtré avec pandas, requêtes
+    indexées sur les tweets de la base des résultats, puis cumuls par heure.
+    """
+    start_date, end_date = '2026-03-01', pd.Timestamp('2026-03-01') + pd.Timedelta(days=window_days - 1)
+    print(f"{'Tweets':>10} | {'Requête':<22} | {'pandas':>9} | {'SQLite':>9} | {'Cumuls':>9}")
+    print("-" * 72)
+    for size in sizes:
+        df = make_analyzed_results(size)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_path = os.path.join(tmp_dir, 'results.parquet')
+            write_table(df, parquet_path)
+            store = ResultsStore(os.path.join(tmp_dir, 'results.db'))
+            _, write_time = _timeit(store.write, df)
+            del df
+
+            def pandas_stats(start=None, end=None):
+                data = read_table(parquet_path, ['date', 'sentiment', 'polarity'])
+                if start:
+                    data = data[data['date'].dt.date >= pd.to_datetime(start).date()]
+                if end:
+                    data = data[data['date'].dt.date <= pd.to_datetime(end).date()]
+                return data['sentiment'].value_counts(), data['polarity'].mean()
+
+            def pandas_temporal():
+                data = read_table(parquet_path, ['date'])
+                return data.groupby(data['date'].dt.date).size()
+
+            def pandas_top_negative(n=5):
+                data = read_table(parquet_path, ['id', 'date', 'text', 'user', 'likes', 'retweets',
+                                                 'sentiment', 'polarity'])
+                return data[data['sentiment'] == 'negative'].sort_values('polarity').head(n)
+
+            queries = [
+                ('stats (tout)', pandas_stats, lambda: store.sentiment_counts()),
+                (f'stats ({window_days} jours)', lambda: pandas_stats(start_date, end_date),
+                 lambda: store.sentiment_counts(None, start_date, str(end_date.date()))),
+                ('histogramme par jour', pandas_temporal, lambda: store.daily_counts()),
+                ('top 5 négatifs', pandas_top_negative, lambda: store.top_negative(5)),
+            ]
+            for name, pandas_query, store_query in queries:
+                _, pandas_time = _timeit(pandas_query)
+                store.use_rollups = False
+                raw, store_time = _timeit(store_query)
+                store.use_rollups = True
+                rollup, rollup_time = _timeit(store_query)
+                if name.startswith('top'):
+                    rollup_column = f"{'-':>9}"
+                else:
+                    assert _same_aggregates(rollup, raw), f"Cumuls différents des tweets : {name}"
+                    rollup_column = f"{rollup_time:>8.4f}s"
+                print(f"{size:>10,} | {name:<22} | {pandas_time:>8.3f}s | {store_time:>8.4f}s | {rollup_column}")
+            rollup_rows = store.connection.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+            print(f"{size:>10,} | {'(écriture de la base)':<22} | {'':>9} | {write_time:>8.1f}s | "
+                  f"{rollup_rows:>6} lignes")
+            store.close()
+
+
+def benchmark_partitions(sizes=(1_000_000, 3_000_000), days: int = 90, window_days: int = 7):
+    """
+    Compare la lecture d'une période : fichier Parquet complet filtré jour par
+    jour, puis partitions par jour (lecture à froid, puis avec le cache des
+    fichiers déjà lus).
+    """
+    start_date = '2026-03-01'
+    end_date = str((pd.Timestamp(start_date) + pd.Timedelta(days=window_days - 1)).date())
+    columns = ['date', 'sentiment', 'polarity']
+    print(f"{'Tweets':>10} | {'Lecture':<28} | {'Temps':>8} | {'Lignes':>9}")
+    print("-" * 64)
+    for size in sizes:
+        df = make_analyzed_results(size, days=days)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_path = os.path.join(tmp_dir, 'results.parquet')
+            write_table(df, parquet_path)
+            dataset = PartitionedResults(os.path.join(tmp_dir, 'results'), storage_format='parquet')
+            _, write_time = _timeit(dataset.append, df)
+            del df
+
+            def read_file():
+                data = read_table(parquet_path, columns)
+                data = data[data['date'].dt.date >= pd.to_datetime(start_date).date()]
+                return data[data['date'].dt.date <= pd.to_datetime(end_date).date()]
+
+            full, full_time = _timeit(read_file)
+            cold, cold_time = _timeit(dataset.read, start_date, end_date, columns)
+            warm, warm_time = _timeit(dataset.read, start_date, end_date, columns)
+            assert len(cold) == len(warm) == len(full)
+            for name, elapsed in [('fichier complet + filtre', full_time),
+                                  (f'partitions ({window_days} j, à froid)', cold_time),
+                                  (f'partitions ({window_days} j, cache)', warm_time)]:
+                print(f"{size:>10,} | {name:<28} | {elapsed:>7.3f}s | {len(full):>9,}")
+            print(f"{size:>10,} | {'(écriture de ' + str(days) + ' partitions)':<28} | {write_time:>7.1f}s |")
+
+
+def benchmark_dataset_cache(sizes=(100_000, 500_000), requests_per_page: int = 5):
+    """
+    Compare le chargement des données d'une page du dashboard (un chargement
+    par endpoint) : fichier CSV relu à chaque requête, puis cache en mémoire
+    (un seul chargement, puis vérification de la signature du fichier).
+    """
+    print(f"{'Tweets':>10} | {'Chargement':<26} | {'Temps':>9}")
+    print("-" * 52)
+    for size in sizes:
+        df = make_analyzed_results(size)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'results.csv')
+            write_table(df, path)
+            del df
+            cache = DatasetCache(read_table)
+
+            def load_page(load):
+                return [load(path) for _ in range(requests_per_page)]
+
+            _, uncached_time = _timeit(load_page, read_table)
+            _, cold_time = _timeit(load_page, cache.get)
+            _, warm_time = _timeit(load_page, cache.get)
+            for name, elapsed in [('sans cache', uncached_time),
+                                  ('cache (première page)', cold_time),
+                                  ('cache (pages suivantes)', warm_time)]:
+                print(f"{size:>10,} | {name:<26} | {elapsed:>8.4f}s")
+            stats = cache.stats()
+            print(f"{size:>10,} | {'(taux de succès)':<26} | {stats['hit_rate']:>8.0%}")
+    print(f"\n{requests_per_page} chargements par page (un par endpoint)")
+
+
+def benchmark_filters(sizes=(1_000_000, 3_000_000), window_days: int = 7):
+    """
+    Compare les filtres des endpoints (période, sentiment) sur le jeu en
+    mémoire : comparaison des dates de chaque ligne, puis index trié par
+    date (recherche dichotomique et masques de sentiment en cache).
+    """
+    start_date = '2026-03-01'
+    end_date = str((pd.Timestamp(start_date) + pd.Timedelta(days=window_days - 1)).date())
+    columns = ['id', 'date', 'sentiment', 'polarity']
+    print(f"{'Tweets':>10} | {'Filtre':<26} | {'Lignes':>9} | {'Comparaison':>11} | {'Index':>9}")
+    print("-" * 78)
+    for size in sizes:
+        df = make_analyzed_results(size)
+        indexed, index_time = _timeit(IndexedResults, df)
+
+        def compare(sentiment=None, start=None, end=None):
+            data = df
+            if start:
+                data = data[data['date'].dt.date >= pd.to_datetime(start).date()]
+            if end:
+                data = data[data['date'].dt.date <= pd.to_datetime(end).date()]
+            if sentiment:
+                data = data[data['sentiment'] == sentiment]
+            return data[columns]
+
+        filters = [
+            (f'{window_days} jours', (None, start_date, end_date)),
+            (f'{window_days} jours + négatifs', ('negative', start_date, end_date)),
+            ('négatifs (tout)', ('negative', None, None)),
+        ]
+        for name, args in filters:
+            expected, compare_time = _timeit(compare, *args)
+            indexed.select(*args, columns)
+            selected, select_time = _timeit(indexed.select, *args, columns)
+            assert selected['id'].sort_values().tolist() == expected['id'].sort_values().tolist(), f"Sélection différente : {name}"
+            print(f"{size:>10,} | {name:<26} | {len(selected):>9,} | {compare_time:>10.3f}s | {select_time:>8.4f}s")
+        print(f"{size:>10,} | {'(tri et index)':<26} | {'':>9} | {'':>11} | {index_time:>8.3f}s")
+
+
+def benchmark_wordcloud(sizes=(100_000, 1_000_000), window_days: int = 7):
+    """
+    Compare la construction du WordCloud des tweets négatifs : texte complet
+    redécoupé par WordCloud.generate, puis fréquences de mots de la base des
+    résultats (tenues à jour à l'écriture) rendues par generate_from_frequencies.
+    """
+    from wordcloud import WordCloud
+
+    start_date = '2026-03-01'
+    end_date = str((pd.Timestamp(start_date) + pd.Timedelta(days=window_days - 1)).date())
+    print(f"{'Tweets':>10} | {'Période':<10} | {'Texte complet':>13} | {'Fréquences':>10} | {'PNG':>8} | {'WebP':>8}")
+    print("-" * 76)
+    for size in sizes:
+        df = make_analyzed_results(size)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ResultsStore(os.path.join(tmp_dir, 'results.db'))
+            _, write_time = _timeit(store.write, df)
+
+            for label, start, end in [('tout', None, None), (f'{window_days} jours', start_date, end_date)]:
+                negative = df[df['sentiment'] == 'negative']
+                if start:
+                    negative = negative[(negative['date'].dt.date >= pd.to_datetime(start).date())
+                                        & (negative['date'].dt.date <= pd.to_datetime(end).date())]
+
+                def from_text():
+                    text = ' '.join(negative['text_cleaned'].dropna())
+                    return WordCloud(width=800, height=400, max_words=MAX_WORDS, collocations=False,
+                                     random_state=0).generate(text).to_image()
+
+                def from_frequencies():
+                    frequencies = merge_plurals(store.token_frequencies(start, end))
+                    top = dict(sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))[:MAX_WORDS])
+                    return top, render_wordcloud(top, 'png')
+
+                _, text_time = _timeit(from_text)
+                (top, png), frequencies_time = _timeit(from_frequencies)
+                webp = render_wordcloud(top, 'webp')
+                print(f"{size:>10,} | {label:<10} | {text_time:>12.2f}s | {frequencies_time:>9.2f}s | "
+                      f"{len(png) / 1e3:>6.0f}kB | {len(webp) / 1e3:>6.0f}kB")
+            print(f"{size:>10,} | {'(écriture)':<10} | {'':>13} | {write_time:>9.1f}s |")
+            store.close()
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'cleaning': benchmark_cleaning,
+    'tokenizers': benchmark_tokenizers,
+    'scaling': benchmark_scaling,
+    'streaming': benchmark_streaming,
+    'imports': benchmark_imports,
+    'cache': benchmark_cache,
+    'vader': benchmark_vader,
+    'collector': benchmark_collector,
+    'usernames': benchmark_usernames,
+    'id_index': benchmark_id_index,
+    'replay': benchmark_replay,
+    'pipeline': benchmark_pipeline,
+    'storage': benchmark_storage,
+    'results_store': benchmark_results_store,
+    'partitions': benchmark_partitions,
+    'dataset_cache': benchmark_dataset_cache,
+    'filters': benchmark_filters,
+    'wordcloud': benchmark_wordcloud,
+}
+
+
+def main():
+    """
+    Fonction principale : exécute le benchmark demandé (ou tous).
+    """
+    names = sys.argv[1:] or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Benchmark inconnu : {name} (disponibles : {', '.join(BENCHMARKS)})")
+            return
+
+    for name in names:
+        print(f"\n⏱️  Benchmark : {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,16 +16,200 @@ if sys.version_info >= (3, 13):
     sys.modules["imghdr"] = imghdr
     spec.loader.exec_module(imghdr)
 
+import asyncio
 import tweepy
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .tesla_storage import CollectionCursor, SegmentStore, UsernameCache, data_path
+    from .tweet_id_index import TweetIdIndex
+    from .twitter_sources import DEFAULT_API_BASE_URL, HTTPTwitterSource, ReplayTwitterSource, TwitterSource
+except ImportError:
+    from tesla_storage import CollectionCursor, SegmentStore, UsernameCache, data_path
+    from tweet_id_index import TweetIdIndex
+    from twitter_sources import DEFAULT_API_BASE_URL, HTTPTwitterSource, ReplayTwitterSource, TwitterSource
 
 # Charger les variables d'environnement
 load_dotenv()
 
+# Nombre maximal d'ids par requête GET /2/users
+USER_LOOKUP_BATCH_SIZE = 100
+
+# Colonnes du fichier de tweets bruts
+TWEET_COLUMNS = ['id', 'date', 'text', 'user', 'likes', 'retweets', 'replies', 'quotes']
+
+
+def make_time_windows(
+    num_windows: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Tuple[str, str]]:
+    """
+    Découpe la période de recherche en fenêtres de temps disjointes.
+    
+    Par défaut, la période couvre les 7 derniers jours (limite de
+    search_recent_tweets). Les bornes sont arrondies à la seconde : chaque
+    fenêtre se termine exactement là où commence la suivante.
+    
+    Args:
+        num_windows: Nombre de fenêtres
+        start: Début de la période (UTC)
+        end: Fin de la période (UTC)
+        
+    Returns:
+        Liste de (start_time, end_time) au format ISO 8601 de l'API
+    """
+    if num_windows < 1:
+        raise ValueError(f"num_windows doit être positif (reçu : {num_windows})")
+    
+    # L'API exige une fin au moins 10 secondes avant l'instant présent
+    end = end or datetime.now(timezone.utc) - timedelta(seconds=30)
+    start = start or end - timedelta(days=7) + timedelta(minutes=1)
+    step = (end - start) / num_windows
+    
+    bounds = [(start + i * step).strftime('%Y-%m-%dT%H:%M:%SZ') for i in range(num_windows)]
+    bounds.append(end.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class RateLimitScheduler:
+    """
+    Planifie les requêtes avec un token bucket calé sur les en-têtes de rate limit.
+    
+    Le bucket contient au plus x-rate-limit-limit jetons et se remplit au
+    rythme de limit / window. Tant que la fenêtre courante de l'API n'est pas
+    réinitialisée (x-rate-limit-reset), il ne peut pas dépasser le nombre de
+    requêtes restantes annoncé (x-rate-limit-remaining) ; à la
+    réinitialisation, il est de nouveau plein. Les requêtes attendent donc
+    leur jeton au lieu de recevoir un 429.
+    Sans en-têtes connus, les requêtes ne sont pas limitées.
+    """
+    
+    def __init__(self, window: float = 900.0, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            window: Durée d'une fenêtre de rate limit de l'API (secondes)
+            clock: Horloge (secondes depuis l'epoch, comme x-rate-limit-reset)
+        """
+        self.window = window
+        self.clock = clock
+        self.capacity = None
+        self.tokens = 0.0
+        self.remaining = None
+        self.reset_at = 0.0
+        self.resume_at = 0.0
+        self._updated = clock()
+    
+    def _refill(self, now: float):
+        if self.capacity is None:
+            return
+        if self.remaining is not None and now >= self.reset_at:
+            # Nouvelle fenêtre côté API : le quota complet est de nouveau disponible
+            self.tokens = float(self.capacity)
+            self.remaining = None
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / self.window)
+        self._updated = now
+        if self.remaining is not None:
+            self.tokens = min(self.tokens, self.remaining)
+    
+    def reserve(self) -> float:
+        """
+        Réserve un jeton pour la prochaine requête.
+        
+        Returns:
+            0 si la requête peut partir immédiatement (jeton consommé), sinon
+            le délai d'attente en secondes avant de réessayer
+        """
+        now = self.clock()
+        if now < self.resume_at:
+            return self.resume_at - now
+        if self.capacity is None:
+            return 0.0
+        
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            if self.remaining is not None:
+                self.remaining -= 1
+            return 0.0
+        if self.remaining is not None and self.remaining < 1:
+            return self.reset_at - now
+        return (1 - self.tokens) * self.window / self.capacity
+    
+    def update(self, headers):
+        """
+        Recale le bucket sur les en-têtes x-rate-limit-* d'une réponse.
+        """
+        try:
+            limit = int(headers['x-rate-limit-limit'])
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset_at = float(headers['x-rate-limit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        now = self.clock()
+        if self.capacity is None or reset_at > self.reset_at:
+            # Première réponse ou nouvelle fenêtre côté API : le quota annoncé fait foi
+            self.tokens = float(remaining)
+            self._updated = now
+        self.capacity = max(limit, 1)
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self._refill(now)
+    
+    def throttle(self, headers, default_delay: float = 60.0):
+        """
+        Suspend les requêtes après un statut 429, jusqu'à la réinitialisation.
+        """
+        reset = headers.get('x-rate-limit-reset')
+        resume_at = float(reset) if reset is not None else self.clock() + default_delay
+        self.resume_at = max(self.resume_at, resume_at)
+        self.tokens = 0.0
+        self.remaining = 0
+
+
+class RateLimitBudget:
+    """
+    Budget de requêtes partagé par les tâches de collecte asynchrones.
+    
+    Limite le nombre de requêtes simultanées et fait attendre chaque requête
+    jusqu'à ce que le RateLimitScheduler commun lui attribue un jeton.
+    """
+    
+    def __init__(self, max_concurrency: int = 4, scheduler: Optional[RateLimitScheduler] = None):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.requests = 0
+        self.throttled = 0
+    
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        while (delay := self.scheduler.reserve()) > 0:
+            await asyncio.sleep(delay)
+        self.requests += 1
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+    
+    def update(self, headers):
+        """
+        Met à jour le budget à partir des en-têtes x-rate-limit-* d'une réponse.
+        """
+        self.scheduler.update(headers)
+    
+    def throttle(self, headers, default_delay: float = 60.0):
+        """
+        Suspend les requêtes après un statut 429.
+        """
+        self.throttled += 1
+        self.scheduler.throttle(headers, default_delay)
+
 
 class TeslaTweetCollector:
     """
@@ -35,16 +219,33 @@ class TeslaTweetCollector:
     des données en CSV.
     """
     
-    def __init__(self, bearer_token: Optional[str] = None):
+    def __init__(
+        self,
+        bearer_token: Optional[str] = None,
+        api_base_url: Optional[str] = None,
+        user_cache_path: Optional[str] = None,
+        user_cache_ttl: Optional[float] = None,
+        lookup_workers: int = 4,
+        source: Optional[TwitterSource] = None
+    ):
         """
         Initialise le collecteur avec les credentials Twitter.
         
         Args:
             bearer_token: Token Bearer pour l'API v2 (ou depuis .env)
+            api_base_url: URL de l'API utilisée par la collecte
+                (ou TWITTER_API_BASE_URL, défaut : API Twitter)
+            user_cache_path: Cache persistant des usernames
+                (ou USER_CACHE_PATH, défaut : data/cache/twitter_users.json)
+            user_cache_ttl: Durée de validité d'un username en cache, en secondes
+                (ou USER_CACHE_TTL_DAYS, défaut : 7 jours)
+            lookup_workers: Nombre de requêtes GET /2/users simultanées
+            source: Source des tweets (défaut : API Twitter en HTTP, voir
+                twitter_sources.py ; le bearer token est alors facultatif)
         """
         self.bearer_token = bearer_token or os.getenv('TWITTER_BEARER_TOKEN')
         
-        if not self.bearer_token:
+        if not self.bearer_token and source is None:
             raise ValueError(
                 "Bearer token manquant. Définissez TWITTER_BEARER_TOKEN dans .env"
             )
@@ -58,43 +259,135 @@ class TeslaTweetCollector:
         # Requête de recherche pour Tesla
         # Recherche : Tesla, TSLA, @Tesla, Elon Musk (exclut les retweets)
         self.query = "(Tesla OR TSLA OR @Tesla OR \"Elon Musk\") -is:retweet lang:en"
+        
+        # Source des pages de résultats (accès HTTP direct à l'API par défaut)
+        self.api_base_url = (
+            api_base_url or os.getenv('TWITTER_API_BASE_URL') or DEFAULT_API_BASE_URL
+        ).rstrip('/')
+        self.source = source or HTTPTwitterSource(self.bearer_token, self.api_base_url)
+        
+        # Usernames déjà connus (expansion includes.users ou requêtes précédentes)
+        if user_cache_ttl is None:
+            user_cache_ttl = float(os.getenv('USER_CACHE_TTL_DAYS', '7')) * 24 * 3600
+        self.user_cache = UsernameCache(
+            user_cache_path or os.getenv('USER_CACHE_PATH', 'data/cache/twitter_users.json'),
+            ttl=user_cache_ttl
+        )
+        self.lookup_workers = max(1, lookup_workers)
+        self.lookup_requests = 0
     
-    def _save_incremental(self, tweets_data: List[Dict], output_file: str, existing_ids: set):
+    def _save_incremental(self, tweets_data: List[Dict], store: SegmentStore):
         """
         Sauvegarde incrémentale des tweets pour éviter la perte de données.
+        
+        Les tweets sont ajoutés au segment courant (append + fsync), sans
+        relire ni réécrire les tweets déjà sauvegardés.
         """
         if not tweets_data:
             return
         
-        df_new = pd.DataFrame(tweets_data)
+        store.append(tweets_data)
+    
+    def _fetch_users(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Recherche les usernames d'au plus 100 ids auprès de la source (bloquant).
+        
+        Returns:
+            Dictionnaire user_id -> username (les comptes introuvables,
+            suspendus ou supprimés sont absents)
+        """
+        page = self.source.lookup_users(user_ids)
+        return {user['id']: user['username'] for user in page.get('data', [])}
+    
+    def _lookup_usernames(self, user_ids: List[str]) -> Dict[str, str]:
+        """
+        Recherche les usernames par lots de 100 ids, en parallèle.
+        
+        Un lot en échec est ignoré (ses auteurs restent inconnus) sans
+        interrompre les autres.
+        """
+        batches = [
+            user_ids[i:i + USER_LOOKUP_BATCH_SIZE]
+            for i in range(0, len(user_ids), USER_LOOKUP_BATCH_SIZE)
+        ]
         
-        # Charger les données existantes ou créer un nouveau DataFrame
-        if os.path.exists(output_file):
+        def fetch(batch: List[str]) -> Dict[str, str]:
             try:
-                df_existing = pd.read_csv(output_file)
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                # Supprimer les doublons basés sur l'ID
-                df_combined = df_combined.drop_duplicates(subset=['id'], keep='last')
-            except:
-                df_combined = df_new
-        else:
-            df_combined = df_new
+                return self._fetch_users(batch)
+            except Exception as e:
+                print(f"⚠️  Impossible de récupérer {len(batch)} usernames : {e}")
+                return {}
+        
+        usernames = {}
+        with ThreadPoolExecutor(max_workers=min(self.lookup_workers, len(batches))) as executor:
+            for found in executor.map(fetch, batches):
+                usernames.update(found)
+        self.lookup_requests += len(batches)
+        return usernames
+    
+    def _add_usernames(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajoute la colonne 'user' aux tweets qui n'ont pas encore de username.
         
-        # Sauvegarder
-        os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
-        df_combined.to_csv(output_file, index=False, encoding='utf-8')
+        Les usernames viennent en priorité de l'expansion includes.users des
+        pages de résultats, puis du cache persistant ; seuls les auteurs
+        restants font l'objet de requêtes GET /2/users (100 ids par requête).
+        """
+        if len(df) == 0 or 'user_id' not in df.columns:
+            return df
         
+        if 'user' not in df.columns:
+            df['user'] = None
+        
+        missing = df['user'].isna() & df['user_id'].notna()
+        if missing.any():
+            user_ids = df.loc[missing, 'user_id'].astype(str).unique().tolist()
+            usernames = self.user_cache.get_many(user_ids)
+            
+            to_fetch = [user_id for user_id in user_ids if user_id not in usernames]
+            if to_fetch:
+                print(f"👤 Recherche de {len(to_fetch)} usernames "
+                      f"({len(usernames)} trouvés dans le cache)...")
+                fetched = self._lookup_usernames(to_fetch)
+                self.user_cache.update(fetched)
+                usernames.update(fetched)
+            
+            df.loc[missing, 'user'] = df.loc[missing, 'user_id'].astype(str).map(usernames).fillna('unknown')
+        
+        self.user_cache.save()
+        return df
+    
+    def _finalize_tweets(self, df: pd.DataFrame, max_tweets: int) -> pd.DataFrame:
+        """
+        Prépare le fichier final : usernames, ordre des colonnes, limite max_tweets.
+        """
+        df = self._add_usernames(df)
+        
+        # Réorganiser les colonnes pour la sortie
+        df = df[[col for col in TWEET_COLUMNS if col in df.columns]]
+        
+        # Limiter à max_tweets si on en a plus
+        if len(df) > max_tweets:
+            print(f"⚠️  {len(df)} tweets collectés, limitation à {max_tweets} tweets")
+            df = df.head(max_tweets)
+        
+        return df
+    
     def collect_tweets(
         self, 
         max_tweets: int = 500,
-        output_file: str = "data/tesla_tweets_raw.csv"
+        output_file: str = "data/tesla_tweets_raw.csv",
+        on_page: Optional[Callable[[List[Dict]], None]] = None
     ) -> pd.DataFrame:
         """
         Collecte les tweets récents sur Tesla.
         
         Args:
             max_tweets: Nombre maximum de tweets à collecter (défaut: 500)
-            output_file: Chemin du fichier CSV de sortie
+            output_file: Chemin du fichier de sortie (CSV, ou Parquet si
+                l'extension est .parquet)
+            on_page: Fonction appelée avec les nouveaux tweets de chaque page,
+                une fois la page sauvegardée (voir run_pipeline.py)
             
         Returns:
             DataFrame pandas contenant les tweets collectés
@@ -103,83 +396,77 @@ class TeslaTweetCollector:
         print(f"⏳ Note: Avec l'API Essential, cela peut prendre plusieurs cycles de rate limit (15 min chacun)")
         print(f"   Le script attendra automatiquement et continuera jusqu'à atteindre {max_tweets} tweets.\n")
         
-        tweets_data = []
-        tweet_count = 0
+        # Reprise : IDs déjà collectés (index persistant, sans relire le CSV)
+        store = SegmentStore(output_file, index_keys=True)
+        existing_ids = store.index
+        tweet_count = len(existing_ids)
+        if tweet_count:
+            print(f"📂 {tweet_count} tweets déjà collectés, reprise de la collecte...")
         
-        # Charger les tweets existants si le fichier existe déjà
-        if os.path.exists(output_file):
-            try:
-                existing_df = pd.read_csv(output_file)
-                tweet_count = len(existing_df)
-                print(f"📂 {tweet_count} tweets déjà collectés, reprise de la collecte...")
-                # Charger les IDs existants pour éviter les doublons
-                existing_ids = set(existing_df['id'].astype(str))
-            except:
-                existing_ids = set()
+        # Curseur de pagination : reprise à la page suivante, ou seulement les
+        # tweets plus récents que ceux déjà collectés
+        cursor = CollectionCursor(output_file, self.query)
+        if cursor.load() and cursor.next_token:
+            print("♻️  Reprise de la pagination interrompue")
         else:
-            existing_ids = set()
+            cursor.since_id = cursor.newest_id
+            cursor.until_id = None
+            cursor.oldest_id = None
+        
+        scheduler = RateLimitScheduler()
+        params = self._search_params()
         
         try:
-            # Utiliser search_recent_tweets pour l'API v2 (gratuite Essential)
-            # max_results par requête limité à 100 (maximum autorisé)
-            for tweet in tweepy.Paginator(
-                self.client.search_recent_tweets,
-                query=self.query,
-                tweet_fields=['created_at', 'public_metrics', 'author_id', 'text'],
-                user_fields=['username', 'name'],
-                expansions=['author_id'],
-                max_results=100,  # Maximum par requête
-                limit=((max_tweets // 100) + 1)  # Nombre de pages nécessaires
-            ).flatten(limit=max_tweets):
+            while tweet_count < max_tweets:
+                params.pop('next_token', None)
+                for field in ('next_token', 'since_id', 'until_id'):
+                    if getattr(cursor, field):
+                        params[field] = getattr(cursor, field)
                 
-                # Éviter les doublons
-                tweet_id_str = str(tweet.id)
-                if tweet_id_str in existing_ids:
+                # Attendre le jeton du token bucket (pas de 429 gaspillé)
+                delay = scheduler.reserve()
+                if delay > 0:
+                    if delay > 1:
+                        print(f"⏳ Rate limit : prochaine requête dans {delay:.0f}s...")
+                    time.sleep(delay)
                     continue
                 
-                # Extraire les métriques publiques
-                metrics = tweet.public_metrics
+                try:
+                    page, headers = self._fetch_search_page(params)
+                except tweepy.TooManyRequests as e:
+                    print("⏳ Trop de requêtes : attente de la réinitialisation du rate limit...")
+                    scheduler.throttle(e.response.headers)
+                    continue
+                except tweepy.BadRequest:
+                    if not cursor.next_token:
+                        raise
+                    # next_token expiré : reprendre sous le plus ancien tweet collecté
+                    print("⚠️  Curseur de pagination expiré, reprise par until_id")
+                    cursor.next_token = None
+                    cursor.until_id = cursor.oldest_id
+                    continue
+                scheduler.update(headers)
                 
-                # Créer un dictionnaire avec les données du tweet
-                tweet_dict = {
-                    'id': tweet.id,
-                    'date': tweet.created_at,
-                    'text': tweet.text,
-                    'user_id': tweet.author_id,
-                    'likes': metrics.get('like_count', 0),
-                    'retweets': metrics.get('retweet_count', 0),
-                    'replies': metrics.get('reply_count', 0),
-                    'quotes': metrics.get('quote_count', 0)
-                }
+                # Sauvegarder la page (fsync) avant d'avancer le curseur
+                tweets = self._tweets_from_page(page, existing_ids)
+                self._save_incremental(tweets, store)
+                tweet_count += len(tweets)
                 
-                tweets_data.append(tweet_dict)
-                existing_ids.add(tweet_id_str)
-                tweet_count += 1
+                cursor.observe(tweets)
+                cursor.next_token = page.get('meta', {}).get('next_token')
+                cursor.save()
                 
-                # Sauvegarder périodiquement (tous les 10 tweets)
-                if len(tweets_data) >= 10:
-                    self._save_incremental(tweets_data, output_file, existing_ids)
-                    tweets_data = []  # Réinitialiser après sauvegarde
+                if on_page is not None and tweets:
+                    on_page(tweets)
                 
-                # Afficher la progression tous les 10 tweets
-                if tweet_count % 10 == 0:
-                    print(f"   ✅ {tweet_count}/{max_tweets} tweets collectés ({tweet_count*100//max_tweets}%)...")
+                print(f"   ✅ {min(tweet_count, max_tweets)}/{max_tweets} tweets collectés "
+                      f"({min(tweet_count, max_tweets) * 100 // max_tweets}%)...")
                 
-                # Arrêter si on a atteint le maximum
-                if tweet_count >= max_tweets:
+                if not cursor.next_token:
                     break
             
-            # Sauvegarder les tweets restants
-            if tweets_data:
-                self._save_incremental(tweets_data, output_file, existing_ids)
-            
             print(f"✅ Collecte terminée : {tweet_count} tweets collectés")
             
-        except tweepy.TooManyRequests:
-            print("❌ Erreur : Trop de requêtes. Attente automatique...")
-            time.sleep(60)
-            return self.collect_tweets(max_tweets, output_file)
-            
         except tweepy.Unauthorized:
             raise ValueError("❌ Erreur d'authentification. Vérifiez votre bearer token.")
             
@@ -190,45 +477,239 @@ class TeslaTweetCollector:
             print(f"❌ Erreur lors de la collecte : {e}")
             raise
         
-        # Créer le DataFrame
-        df = pd.DataFrame(tweets_data)
+        # Compacter les segments (dédoublonnage par ID) dans le fichier final
+        df = store.compact(
+            lambda df: self._finalize_tweets(df, max_tweets),
+            dtype={'id': str, 'user_id': str}
+        )
+        print(f"💾 {len(df)} tweets uniques sauvegardés dans {output_file} (limite: {max_tweets})")
+        
+        return df
+    
+    def _search_params(self, **extra) -> Dict:
+        """
+        Paramètres de la requête search/recent (100 tweets par page, auteurs inclus).
+        """
+        params = {
+            'query': self.query,
+            'max_results': 100,  # Maximum par requête
+            'tweet.fields': 'created_at,public_metrics,author_id,text',
+            'user.fields': 'username,name',
+            'expansions': 'author_id'
+        }
+        params.update(extra)
+        return params
+    
+    def _fetch_search_page(self, params: Dict) -> Tuple[Dict, Dict]:
+        """
+        Demande une page de résultats search/recent à la source (bloquant).
+        
+        Les erreurs sont signalées par des exceptions tweepy, comme avec
+        tweepy.Client.
         
-        # Récupérer les usernames (nécessite une requête supplémentaire)
-        if len(df) > 0 and 'user_id' in df.columns:
+        Returns:
+            (réponse JSON, en-têtes HTTP)
+        """
+        return self.source.search_recent(params)
+    
+    def _tweets_from_page(self, page: Dict, existing_ids: TweetIdIndex) -> List[Dict]:
+        """
+        Convertit une page de résultats JSON en tweets (sans doublons).
+        
+        Les ids de la page sont testés en un seul lot dans l'index ; les
+        tweets retenus y sont ajoutés lors de leur sauvegarde.
+        
+        Les usernames sont lus dans l'expansion includes.users de la page
+        (et conservés dans le cache des usernames).
+        """
+        users = {user['id']: user['username'] for user in page.get('includes', {}).get('users', [])}
+        self.user_cache.update(users)
+        
+        data = page.get('data', [])
+        already_collected = existing_ids.contains([int(tweet['id']) for tweet in data])
+        
+        tweets = []
+        page_ids = set()
+        for tweet, collected in zip(data, already_collected):
+            if collected or tweet['id'] in page_ids:
+                continue
+            page_ids.add(tweet['id'])
+            
+            metrics = tweet.get('public_metrics', {})
+            tweets.append({
+                'id': int(tweet['id']),
+                'date': datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00')),
+                'text': tweet['text'],
+                'user_id': tweet.get('author_id'),
+                'user': users.get(tweet.get('author_id')),
+                'likes': metrics.get('like_count', 0),
+                'retweets': metrics.get('retweet_count', 0),
+                'replies': metrics.get('reply_count', 0),
+                'quotes': metrics.get('quote_count', 0)
+            })
+        return tweets
+    
+    async def _collect_window(
+        self,
+        window: Dict,
+        budget: RateLimitBudget,
+        state: Dict,
+        store: SegmentStore,
+        cursor: CollectionCursor,
+        max_tweets: int
+    ):
+        """
+        Collecte une fenêtre de temps page par page, sous le budget partagé.
+        
+        L'état de la fenêtre (next_token, plus ancien id collecté, terminée)
+        est enregistré dans le curseur après chaque page sauvegardée. Un
+        next_token expiré est abandonné : la fenêtre reprend sous son plus
+        ancien tweet collecté (until_id), ou depuis sa fin si elle n'en a
+        encore aucun.
+        """
+        params = self._search_params(start_time=window['start_time'], end_time=window['end_time'])
+        
+        while not window['done'] and state['count'] < max_tweets:
+            params.pop('next_token', None)
+            params.pop('until_id', None)
+            # Fenêtres d'un curseur antérieur : pas de until_id enregistré
+            for field in ('next_token', 'until_id'):
+                if window.get(field):
+                    params[field] = window[field]
             try:
-                user_ids = df['user_id'].unique().tolist()
-                users = self.client.get_users(ids=user_ids, user_fields=['username', 'name'])
-                
-                # Créer un mapping user_id -> username
-                if users.data:
-                    user_map = {user.id: user.username for user in users.data}
-                    df['user'] = df['user_id'].map(user_map).fillna('unknown')
-                else:
-                    df['user'] = 'unknown'
+                async with budget:
+                    page, headers = await asyncio.to_thread(self._fetch_search_page, params)
+            except tweepy.TooManyRequests as e:
+                print("⏳ Rate limit atteint, toutes les fenêtres attendent sa réinitialisation...")
+                budget.throttle(e.response.headers)
+                continue
+            except tweepy.BadRequest:
+                if not window['next_token']:
+                    raise
+                # next_token expiré : reprendre la fenêtre sous son plus ancien tweet collecté
+                print("⚠️  Curseur de pagination expiré, reprise de la fenêtre par until_id")
+                async with state['lock']:
+                    window['next_token'] = None
+                    window['until_id'] = window.get('oldest_id')
+                    cursor.save()
+                continue
+            budget.update(headers)
+            
+            tweets = self._tweets_from_page(page, state['ids'])
+            async with state['lock']:
+                # Sauvegarder la page (fsync) avant d'avancer le curseur
+                await asyncio.to_thread(self._save_incremental, tweets, store)
+                state['count'] += len(tweets)
                 
-            except Exception as e:
-                print(f"⚠️  Impossible de récupérer les usernames : {e}")
-                df['user'] = 'unknown'
+                cursor.observe(tweets)
+                # Tweets de la page déjà collectés compris : tous sont dans le fichier
+                page_ids = [int(tweet['id']) for tweet in page.get('data', [])]
+                if window.get('oldest_id'):
+                    page_ids.append(int(window['oldest_id']))
+                if page_ids:
+                    window['oldest_id'] = str(min(page_ids))
+                window['next_token'] = page.get('meta', {}).get('next_token')
+                window['done'] = not window['next_token']
+                cursor.save()
+            
+            if tweets:
+                print(f"   ✅ {min(state['count'], max_tweets)}/{max_tweets} tweets collectés...")
+    
+    async def collect_tweets_async(
+        self,
+        max_tweets: int = 500,
+        output_file: str = "data/tesla_tweets_raw.csv",
+        num_windows: int = 4,
+        max_concurrency: int = 4
+    ) -> pd.DataFrame:
+        """
+        Collecte les tweets en parallèle sur des fenêtres de temps disjointes.
         
-        # Réorganiser les colonnes pour la sortie
-        columns_order = ['id', 'date', 'text', 'user', 'likes', 'retweets', 'replies', 'quotes']
-        df = df[[col for col in columns_order if col in df.columns]]
+        Chaque fenêtre est paginée par sa propre tâche asyncio ; les requêtes
+        HTTP (bloquantes) s'exécutent dans des threads, sous un budget de rate
+        limit commun. Les tweets sont fusionnés et triés par id (du plus récent
+        au plus ancien, comme la collecte séquentielle).
         
-        # S'assurer qu'on a exactement max_tweets (500) et supprimer les doublons par ID
-        df = df.drop_duplicates(subset=['id'], keep='first')
+        Args:
+            max_tweets: Nombre maximum de tweets à collecter
+            output_file: Chemin du fichier de sortie (CSV ou Parquet)
+            num_windows: Nombre de fenêtres de temps
+            max_concurrency: Nombre maximum de requêtes simultanées
+            
+        Returns:
+            DataFrame pandas contenant les tweets collectés
+        """
+        print(f"🔍 Collecte concurrente de {max_tweets} tweets sur Tesla "
+              f"({num_windows} fenêtres, {max_concurrency} requêtes simultanées)...")
         
-        # Limiter à max_tweets si on en a plus
-        if len(df) > max_tweets:
-            print(f"⚠️  {len(df)} tweets collectés, limitation à {max_tweets} tweets")
-            df = df.head(max_tweets)
+        store = SegmentStore(output_file, index_keys=True)
+        existing_ids = store.index
+        if len(existing_ids):
+            print(f"📂 {len(existing_ids)} tweets déjà collectés, reprise de la collecte...")
+        
+        # Reprendre les fenêtres inachevées, ou ne couvrir que la période
+        # postérieure au tweet le plus récent déjà collecté
+        cursor = CollectionCursor(output_file, self.query)
+        cursor.load()
+        if any(not window['done'] for window in cursor.windows.values()):
+            print("♻️  Reprise des fenêtres de temps interrompues")
+        else:
+            end = datetime.now(timezone.utc) - timedelta(seconds=30)
+            start = end - timedelta(days=7) + timedelta(minutes=1)
+            if cursor.newest_time:
+                start = max(start, datetime.fromisoformat(cursor.newest_time))
+            windows = make_time_windows(num_windows, start, end) if start < end else []
+            cursor.windows = {
+                f"{start_time}|{end_time}": {
+                    'start_time': start_time, 'end_time': end_time, 'next_token': None,
+                    'until_id': None, 'oldest_id': None, 'done': False
+                }
+                for start_time, end_time in windows
+            }
+        
+        state = {'ids': existing_ids, 'count': len(existing_ids), 'lock': asyncio.Lock()}
+        budget = RateLimitBudget(max_concurrency)
+        
+        try:
+            await asyncio.gather(*(
+                self._collect_window(window, budget, state, store, cursor, max_tweets)
+                for window in cursor.windows.values() if not window['done']
+            ))
+        except tweepy.Unauthorized:
+            raise ValueError("❌ Erreur d'authentification. Vérifiez votre bearer token.")
+        except tweepy.BadRequest as e:
+            raise ValueError(f"❌ Requête invalide : {e}")
+        
+        if all(window['done'] for window in cursor.windows.values()):
+            cursor.windows = {}
+        cursor.save()
         
-        # Sauvegarder en CSV
-        os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
-        df.to_csv(output_file, index=False, encoding='utf-8')
+        print(f"✅ Collecte terminée : {budget.requests} requêtes, {budget.throttled} rate limits")
+        
+        def merge(df: pd.DataFrame) -> pd.DataFrame:
+            if len(df) > 0:
+                df = df.sort_values('id', key=lambda ids: ids.astype('int64'), ascending=False)
+            return self._finalize_tweets(df, max_tweets)
+        
+        df = store.compact(merge, dtype={'id': str, 'user_id': str})
         print(f"💾 {len(df)} tweets uniques sauvegardés dans {output_file} (limite: {max_tweets})")
         
         return df
     
+    def collect_tweets_concurrent(
+        self,
+        max_tweets: int = 500,
+        output_file: str = "data/tesla_tweets_raw.csv",
+        num_windows: int = 4,
+        max_concurrency: int = 4
+    ) -> pd.DataFrame:
+        """
+        Version synchrone de collect_tweets_async.
+        """
+        return asyncio.run(
+            self.collect_tweets_async(max_tweets, output_file, num_windows, max_concurrency)
+        )
+    
     def test_connection(self) -> bool:
         """
         Teste la connexion à l'API Twitter.
@@ -260,23 +741,59 @@ class TeslaTweetCollector:
             return False
 
 
+def create_collector() -> Optional[TeslaTweetCollector]:
+    """
+    Crée le collecteur configuré par l'environnement et teste la connexion.
+    
+    TWITTER_REPLAY_DIR (et REPLAY_LATENCY) rejoue des pages enregistrées au
+    lieu d'interroger l'API.
+    
+    Returns:
+        Le collecteur, ou None si la connexion à l'API Twitter échoue
+    """
+    replay_dir = os.getenv('TWITTER_REPLAY_DIR')
+    if replay_dir:
+        return TeslaTweetCollector(source=ReplayTwitterSource(
+            replay_dir, latency=float(os.getenv('REPLAY_LATENCY', '0'))
+        ))
+    
+    collector = TeslaTweetCollector()
+    
+    # Tester la connexion (le test passe par tweepy, donc par l'API Twitter)
+    if collector.api_base_url == DEFAULT_API_BASE_URL and not collector.test_connection():
+        print("❌ Impossible de se connecter à l'API Twitter")
+        return None
+    return collector
+
+
 def main():
     """
     Fonction principale pour exécuter la collecte.
     """
     try:
         # Initialiser le collecteur
-        collector = TeslaTweetCollector()
-        
-        # Tester la connexion
-        if not collector.test_connection():
-            print("❌ Impossible de se connecter à l'API Twitter")
+        collector = create_collector()
+        if collector is None:
             return
         
         # Collecter 500 tweets (ou moins pour un test rapide)
         # Pour un test rapide, utilisez max_tweets=100
         max_tweets = int(os.getenv('MAX_TWEETS', '500'))
-        df_tweets = collector.collect_tweets(max_tweets=max_tweets)
+        
+        # Fichier de sortie en CSV ou en Parquet (TESLA_STORAGE_FORMAT)
+        output_file = data_path("data/tesla_tweets_raw.csv")
+        
+        # COLLECT_WINDOWS > 1 : collecte concurrente par fenêtres de temps
+        num_windows = int(os.getenv('COLLECT_WINDOWS', '1'))
+        if num_windows > 1:
+            df_tweets = collector.collect_tweets_concurrent(
+                max_tweets=max_tweets,
+                output_file=output_file,
+                num_windows=num_windows,
+                max_concurrency=int(os.getenv('COLLECT_CONCURRENCY', str(num_windows)))
+            )
+        else:
+            df_tweets = collector.collect_tweets(max_tweets=max_tweets, output_file=output_file)
         
         # Afficher un aperçu
         print("\n📊 Aperçu des données collectées :")
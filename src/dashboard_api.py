@@ -3,30 +3,68 @@ API FastAPI pour le dashboard d'analyse de sentiment Tesla
 Backend moderne avec endpoints RESTful
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 import os
 import sys
-from typing import Optional, List, Dict
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 import json
-from wordcloud import WordCloud
-import base64
-from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Backend non-interactif pour le serveur
-import matplotlib.pyplot as plt
+import hashlib
+import threading
+from collections import OrderedDict
 
 # Ajouter le répertoire parent au path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+try:
+    from .dataset_cache import DatasetCache, file_signature
+    from .partitioned_results import PartitionedResults, get_results_partition_dir
+    from .results_index import IndexedResults
+    from .results_store import ResultsStore, get_results_db_path
+    from .tesla_storage import find_data_file, read_table
+    from .token_counts import count_tokens, merge_plurals
+    from .wordcloud_render import IMAGE_FORMATS, MAX_WORDS, render_wordcloud
+    from .worker_pools import PoolSaturatedError, pool_from_env
+except ImportError:
+    from dataset_cache import DatasetCache, file_signature
+    from partitioned_results import PartitionedResults, get_results_partition_dir
+    from results_index import IndexedResults
+    from results_store import ResultsStore, get_results_db_path
+    from tesla_storage import find_data_file, read_table
+    from token_counts import count_tokens, merge_plurals
+    from wordcloud_render import IMAGE_FORMATS, MAX_WORDS, render_wordcloud
+    from worker_pools import PoolSaturatedError, pool_from_env
+
+# Colonnes lues par les endpoints agrégés (polarité et ses colonnes de repli)
+STATS_COLUMNS = ['date', 'sentiment', 'polarity', 'sentiment_score', 'vader_compound']
+# Colonnes affichées pour les tweets les plus négatifs
+TWEET_COLUMNS = STATS_COLUMNS + ['id', 'text', 'text_cleaned', 'user', 'likes', 'retweets']
+
+# Les calculs bloquants (pandas, SQLite, rendu d'images) sont exécutés hors de
+# la boucle asyncio : les rendus dans leur propre pool, pour que les requêtes
+# courtes ne les attendent jamais
+query_pool = pool_from_env('query', 'DASHBOARD_QUERY', default_workers=4)
+render_pool = pool_from_env('render', 'DASHBOARD_RENDER', default_workers=1, default_kind='process')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Arrête les workers des pools à l'arrêt du serveur."""
+    yield
+    query_pool.shutdown()
+    render_pool.shutdown()
+
+
 app = FastAPI(
     title="Tesla Sentiment Analysis",
     description="API pour le dashboard d'analyse de sentiment Tesla",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware pour permettre les requêtes depuis le frontend
@@ -45,29 +83,71 @@ os.makedirs(static_dir, exist_ok=True)
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 
-def load_data():
-    """Charge les données d'analyse de sentiment."""
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    possible_files = [
-        os.path.join(project_root, "data", "tesla_sentiment_results.csv"),
-        os.path.join(project_root, "data", "tesla_sentiment_analysis.csv")
-    ]
-    
-    data_file = None
-    for file_path in possible_files:
-        if os.path.exists(file_path):
-            data_file = file_path
-            break
-    
-    if data_file is None:
-        raise FileNotFoundError(f"Aucun fichier de données trouvé. Cherché : {possible_files}")
-    
-    df = pd.read_csv(data_file)
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """Refuse la requête (503) quand la file d'attente d'un pool est pleine."""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+
+# Fichiers de résultats recherchés (variante Parquet de préférence)
+RESULT_FILES = [
+    os.path.join(project_root, "data", "tesla_sentiment_results.csv"),
+    os.path.join(project_root, "data", "tesla_sentiment_analysis.csv")
+]
+
+
+def open_results_store() -> Optional[ResultsStore]:
+    """
+    Ouvre la base des résultats (requêtes indexées), ou retourne None si
+    elle est absente ou plus ancienne que le fichier de résultats.
+    """
+    path = get_results_db_path()
+    if path is None:
+        return None
+    if not os.path.isabs(path):
+        path = os.path.join(project_root, path)
+    if not os.path.exists(path):
+        return None
     
-    # Convertir la colonne date en datetime
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
+    # En mode WAL, les dernières écritures peuvent n'être que dans le fichier -wal
+    db_mtime = max(os.path.getmtime(p) for p in (path, path + '-wal') if os.path.exists(p))
+    data_file = find_data_file(RESULT_FILES)
+    if data_file is not None and os.path.getmtime(data_file) > db_mtime:
+        return None
+    return ResultsStore(path, readonly=True)
+
+
+# Partitions par jour ouvertes (le cache de fichiers est conservé d'une requête à l'autre)
+_partitions: Optional[PartitionedResults] = None
+
+
+def open_results_partitions() -> Optional[PartitionedResults]:
+    """
+    Retourne les partitions par jour des résultats, ou None si elles sont
+    absentes ou plus anciennes que le fichier de résultats.
+    """
+    global _partitions
+    root = get_results_partition_dir()
+    if root is None:
+        return None
+    if not os.path.isabs(root):
+        root = os.path.join(project_root, root)
+    if _partitions is None or _partitions.root != root:
+        _partitions = PartitionedResults(root)
+    if not _partitions.partitions():
+        return None
     
+    data_file = find_data_file(RESULT_FILES)
+    if data_file is not None and os.path.getmtime(data_file) > _partitions.last_modified():
+        return None
+    return _partitions
+
+
+def prepare_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajoute les colonnes attendues par les endpoints (polarity, text_cleaned)
+    si le fichier de résultats ne les contient pas.
+    """
     # Adapter les colonnes si nécessaire
     if 'polarity' not in df.columns:
         if 'sentiment_score' in df.columns:
@@ -95,6 +175,51 @@ def load_data():
     return df
 
 
+# Fichier de résultats complet, chargé une fois (trié par date) et partagé entre les requêtes
+_dataset_cache = DatasetCache(lambda path: IndexedResults(prepare_dataset(read_table(path))))
+
+
+def load_data(
+    columns: Optional[List[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    sentiment: Optional[str] = None
+):
+    """
+    Charge les données d'analyse de sentiment des jours [start_date, end_date],
+    éventuellement restreintes à un sentiment.
+    
+    Seules les partitions des jours demandés sont lues ; à défaut de
+    partitions, le fichier de résultats (Parquet de préférence, sinon CSV)
+    est pris dans le cache en mémoire (relu uniquement s'il a changé), trié
+    par date : la période est résolue par recherche dichotomique et les
+    masques de sentiment sont réutilisés d'une requête à l'autre.
+    
+    Args:
+        columns: Colonnes à lire (None = toutes)
+        start_date: Premier jour inclus (None = pas de borne)
+        end_date: Dernier jour inclus (None = pas de borne)
+        sentiment: Sentiment retenu (None ou 'all' = tous)
+    
+    Returns:
+        DataFrame propre à la requête (il peut être modifié sans toucher au cache)
+    """
+    partitions = open_results_partitions()
+    if partitions is not None:
+        # Colonnes typées (date, sentiment) ; text_cleaned peut être recréée depuis text
+        if columns is not None and 'text_cleaned' in columns and 'text' not in columns:
+            columns = columns + ['text']
+        df = prepare_dataset(partitions.read(start_date, end_date, columns))
+        if sentiment and sentiment != 'all':
+            df = df[df['sentiment'] == sentiment]
+        return df
+    
+    data_file = find_data_file(RESULT_FILES)
+    if data_file is None:
+        raise FileNotFoundError(f"Aucun fichier de données trouvé. Cherché : {RESULT_FILES}")
+    return _dataset_cache.get(data_file).select(sentiment, start_date, end_date, columns)
+
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root():
     """Sert la page HTML du dashboard."""
@@ -116,6 +241,82 @@ async def read_root():
     """
 
 
+def _stats_payload(counts: Dict[str, int], mean_polarity: float) -> Dict:
+    """Met en forme les statistiques agrégées (nombres et pourcentages par sentiment)."""
+    total = sum(counts.values())
+    payload = {"total": total}
+    for label in ('positive', 'negative', 'neutral'):
+        count = counts.get(label, 0)
+        payload[label] = {
+            "count": count,
+            "percentage": (count / total * 100) if total > 0 else 0
+        }
+    payload["mean_polarity"] = mean_polarity
+    return payload
+
+
+def _distribution_payload(counts: Dict[str, int]) -> Dict[str, int]:
+    """Met en forme la distribution des sentiments."""
+    return {label: counts.get(label, 0) for label in ('positive', 'negative', 'neutral')}
+
+
+def _store_counts(groups: Dict[str, Dict]) -> Tuple[Dict[str, int], float]:
+    """Nombre de tweets par sentiment et polarité moyenne des cumuls de la base."""
+    counts = {label: group['count'] for label, group in groups.items()}
+    polarity_count = sum(group['polarity_count'] for group in groups.values())
+    mean_polarity = (
+        sum(group['polarity_sum'] for group in groups.values()) / polarity_count
+        if polarity_count else 0.0
+    )
+    return counts, mean_polarity
+
+
+def _frame_counts(df: pd.DataFrame) -> Tuple[Dict[str, int], float]:
+    """Nombre de tweets par sentiment et polarité moyenne d'un DataFrame filtré."""
+    # Les tweets sans sentiment comptent dans le total
+    counts = {label: int(count) for label, count in df['sentiment'].value_counts(dropna=False).items()}
+    mean_polarity = float(df['polarity'].mean()) if len(df) > 0 else 0.0
+    return counts, mean_polarity
+
+
+def _frame_temporal(df: pd.DataFrame) -> List[Dict]:
+    """Nombre de tweets par jour d'un DataFrame filtré."""
+    # Regroupement sur le jour tronqué ; seules les clés des groupes sont formatées
+    temporal = df.groupby(df['date'].dt.floor('D')).size()
+    return [
+        {'date_only': day.strftime('%Y-%m-%d'), 'count': int(count)}
+        for day, count in temporal.items()
+    ]
+
+
+def _frame_top_negative(df: pd.DataFrame, n: int) -> List[Dict]:
+    """N tweets négatifs de plus faible polarité d'un DataFrame filtré."""
+    negative_df = df[df['sentiment'] == 'negative']
+    if len(negative_df) == 0:
+        return []
+    
+    # Tri stable : à polarité égale, les tweets restent dans l'ordre des dates
+    negative_df = negative_df.sort_values('polarity', ascending=True, kind='stable').head(n)
+    negative_df['date'] = negative_df['date'].astype(str)
+    return negative_df.to_dict(orient='records')
+
+
+def _get_data(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Retourne les données filtrées (exécuté dans query_pool)."""
+    try:
+        df = load_data(start_date=start_date, end_date=end_date, sentiment=sentiment)
+        
+        # Convertir en format JSON (sérialisé ici, hors de la boucle asyncio)
+        df['date'] = df['date'].astype(str)
+        return JSONResponse(df.to_dict(orient='records'))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/data")
 async def get_data(
     sentiment: Optional[str] = None,
@@ -123,21 +324,24 @@ async def get_data(
     end_date: Optional[str] = None
 ):
     """Retourne les données filtrées."""
+    return await query_pool.run(_get_data, sentiment, start_date, end_date)
+
+
+def _get_stats(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Retourne les statistiques agrégées (exécuté dans query_pool)."""
     try:
-        df = load_data()
-        
-        # Appliquer les filtres
-        if sentiment and sentiment != 'all':
-            df = df[df['sentiment'] == sentiment]
-        
-        if start_date:
-            df = df[df['date'].dt.date >= pd.to_datetime(start_date).date()]
-        if end_date:
-            df = df[df['date'].dt.date <= pd.to_datetime(end_date).date()]
+        store = open_results_store()
+        if store is not None:
+            with store:
+                counts, mean_polarity = _store_counts(store.sentiment_counts(sentiment, start_date, end_date))
+        else:
+            counts, mean_polarity = _frame_counts(load_data(STATS_COLUMNS, start_date, end_date, sentiment))
         
-        # Convertir en format JSON
-        df['date'] = df['date'].astype(str)
-        return df.to_dict(orient='records')
+        return _stats_payload(counts, mean_polarity)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -149,39 +353,25 @@ async def get_stats(
     end_date: Optional[str] = None
 ):
     """Retourne les statistiques agrégées."""
+    return await query_pool.run(_get_stats, sentiment, start_date, end_date)
+
+
+def _get_sentiment_distribution(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Retourne la distribution des sentiments pour le graphique (exécuté dans query_pool)."""
     try:
-        df = load_data()
-        
-        # Appliquer les filtres
-        if sentiment and sentiment != 'all':
-            df = df[df['sentiment'] == sentiment]
-        
-        if start_date:
-            df = df[df['date'].dt.date >= pd.to_datetime(start_date).date()]
-        if end_date:
-            df = df[df['date'].dt.date <= pd.to_datetime(end_date).date()]
-        
-        total = len(df)
-        positive_count = len(df[df['sentiment'] == 'positive'])
-        negative_count = len(df[df['sentiment'] == 'negative'])
-        neutral_count = len(df[df['sentiment'] == 'neutral'])
+        store = open_results_store()
+        if store is not None:
+            with store:
+                groups = store.sentiment_counts(sentiment, start_date, end_date)
+            distribution = {label: group['count'] for label, group in groups.items()}
+        else:
+            distribution, _ = _frame_counts(load_data(STATS_COLUMNS, start_date, end_date, sentiment))
         
-        return {
-            "total": total,
-            "positive": {
-                "count": positive_count,
-                "percentage": (positive_count / total * 100) if total > 0 else 0
-            },
-            "negative": {
-                "count": negative_count,
-                "percentage": (negative_count / total * 100) if total > 0 else 0
-            },
-            "neutral": {
-                "count": neutral_count,
-                "percentage": (neutral_count / total * 100) if total > 0 else 0
-            },
-            "mean_polarity": float(df['polarity'].mean()) if total > 0 else 0.0
-        }
+        return _distribution_payload(distribution)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -193,25 +383,22 @@ async def get_sentiment_distribution(
     end_date: Optional[str] = None
 ):
     """Retourne la distribution des sentiments pour le graphique."""
+    return await query_pool.run(_get_sentiment_distribution, sentiment, start_date, end_date)
+
+
+def _get_temporal_data(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+):
+    """Retourne les données temporelles pour l'histogramme (exécuté dans query_pool)."""
     try:
-        df = load_data()
-        
-        # Appliquer les filtres
-        if sentiment and sentiment != 'all':
-            df = df[df['sentiment'] == sentiment]
-        
-        if start_date:
-            df = df[df['date'].dt.date >= pd.to_datetime(start_date).date()]
-        if end_date:
-            df = df[df['date'].dt.date <= pd.to_datetime(end_date).date()]
+        store = open_results_store()
+        if store is not None:
+            with store:
+                return store.daily_counts(sentiment, start_date, end_date)
         
-        distribution = df['sentiment'].value_counts().to_dict()
-        
-        return {
-            "positive": distribution.get('positive', 0),
-            "negative": distribution.get('negative', 0),
-            "neutral": distribution.get('neutral', 0)
-        }
+        return _frame_temporal(load_data(STATS_COLUMNS, start_date, end_date, sentiment))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -223,23 +410,18 @@ async def get_temporal_data(
     end_date: Optional[str] = None
 ):
     """Retourne les données temporelles pour l'histogramme."""
+    return await query_pool.run(_get_temporal_data, sentiment, start_date, end_date)
+
+
+def _get_top_negative(n: int = 5):
+    """Retourne les N tweets les plus négatifs (exécuté dans query_pool)."""
     try:
-        df = load_data()
+        store = open_results_store()
+        if store is not None:
+            with store:
+                return store.top_negative(n)
         
-        # Appliquer les filtres
-        if sentiment and sentiment != 'all':
-            df = df[df['sentiment'] == sentiment]
-        
-        if start_date:
-            df = df[df['date'].dt.date >= pd.to_datetime(start_date).date()]
-        if end_date:
-            df = df[df['date'].dt.date <= pd.to_datetime(end_date).date()]
-        
-        df['date_only'] = df['date'].dt.date
-        temporal = df.groupby('date_only').size().reset_index(name='count')
-        temporal['date_only'] = temporal['date_only'].astype(str)
-        
-        return temporal.to_dict(orient='records')
+        return _frame_top_negative(load_data(TWEET_COLUMNS, sentiment='negative'), n)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -247,64 +429,162 @@ async def get_temporal_data(
 @app.get("/api/top-negative")
 async def get_top_negative(n: int = 5):
     """Retourne les N tweets les plus négatifs."""
+    return await query_pool.run(_get_top_negative, n)
+
+
+def _get_dashboard(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    n: int = 5
+):
+    """Calcule toutes les données de la page en un passage (exécuté dans query_pool)."""
     try:
-        df = load_data()
-        negative_df = df[df['sentiment'] == 'negative'].copy()
-        
-        if len(negative_df) == 0:
-            return []
-        
-        negative_df = negative_df.sort_values('polarity', ascending=True).head(n)
-        negative_df['date'] = negative_df['date'].astype(str)
+        store = open_results_store()
+        if store is not None:
+            with store:
+                counts, mean_polarity = _store_counts(store.sentiment_counts(sentiment, start_date, end_date))
+                temporal = store.daily_counts(sentiment, start_date, end_date)
+                top_negative = (
+                    store.top_negative(n, start_date, end_date)
+                    if sentiment in (None, 'all', 'negative') else []
+                )
+        else:
+            # Une seule sélection, partagée par tous les agrégats
+            df = load_data(TWEET_COLUMNS, start_date, end_date, sentiment)
+            counts, mean_polarity = _frame_counts(df)
+            temporal = _frame_temporal(df)
+            top_negative = _frame_top_negative(df, n)
         
-        return negative_df.to_dict(orient='records')
+        return {
+            "stats": _stats_payload(counts, mean_polarity),
+            "distribution": _distribution_payload(counts),
+            "temporal": temporal,
+            "top_negative": top_negative
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/dashboard")
+async def get_dashboard(
+    sentiment: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    n: int = 5
+):
+    """
+    Retourne en une requête les statistiques, la distribution, l'histogramme
+    temporel et les N tweets les plus négatifs de la période filtrée.
+    """
+    return await query_pool.run(_get_dashboard, sentiment, start_date, end_date, n)
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Retourne les métriques des caches de données et des pools de workers."""
+    return {
+        "dataset": _dataset_cache.stats(),
+        "partitions": _partitions.cache_stats() if _partitions is not None else None,
+        "pools": {pool.name: pool.stats() for pool in (query_pool, render_pool)},
+        "wordcloud_images": len(_wordcloud_cache)
+    }
+
+
+# Images WordCloud déjà rendues : (période, format, version des données) -> image
+_wordcloud_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_wordcloud_cache_lock = threading.Lock()
+WORDCLOUD_CACHE_SIZE = 32
+
+# Durée (secondes) pendant laquelle le navigateur réutilise une image sans revalidation
+WORDCLOUD_MAX_AGE = 60
+
+
+def _data_version() -> str:
+    """
+    Version des données servies (exécuté dans query_pool) : version de la
+    base des résultats, date des partitions ou signature du fichier.
+    """
+    store = open_results_store()
+    if store is not None:
+        with store:
+            if store.use_token_counts:
+                return f"db-{store.data_version()}"
+    partitions = open_results_partitions()
+    if partitions is not None:
+        return f"partitions-{partitions.last_modified()}"
+    data_file = find_data_file(RESULT_FILES)
+    if data_file is None:
+        raise FileNotFoundError(f"Aucun fichier de données trouvé. Cherché : {RESULT_FILES}")
+    _, mtime, size = file_signature(data_file)
+    return f"file-{mtime}-{size}"
+
+
+def _negative_frequencies(start_date: Optional[str], end_date: Optional[str]) -> Dict[str, int]:
+    """
+    Fréquences des mots des tweets négatifs de la période, limitées aux mots
+    affichés (exécuté dans query_pool).
+    """
+    store = open_results_store()
+    frequencies = None
+    if store is not None:
+        with store:
+            if store.use_token_counts:
+                frequencies = store.token_frequencies(start_date, end_date)
+    if frequencies is None:
+        # Sans fréquences en base : comptage sur les textes des tweets négatifs
+        negative_df = load_data(['sentiment', 'text_cleaned'], start_date, end_date, 'negative')
+        text_column = 'text_cleaned' if 'text_cleaned' in negative_df.columns else 'text'
+        if text_column not in negative_df.columns:
+            raise ValueError("Aucune colonne de texte disponible")
+        frequencies = count_tokens(negative_df[text_column])
+    
+    frequencies = merge_plurals(frequencies)
+    if not frequencies:
+        raise ValueError("Aucun tweet négatif disponible")
+    # Seuls les mots affichés sont envoyés au processus de rendu
+    return dict(sorted(frequencies.items(), key=lambda item: (-item[1], item[0]))[:MAX_WORDS])
+
+
 @app.get("/api/wordcloud")
-async def get_wordcloud():
-    """Génère et retourne le WordCloud des tweets négatifs en base64."""
+async def get_wordcloud(
+    request: Request,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    format: str = 'png'
+):
+    """
+    Retourne l'image (PNG ou WebP) du WordCloud des tweets négatifs de la période.
+    
+    L'image est mise en cache par période, format et version des données ;
+    l'ETag permet au navigateur de la revalider sans la retélécharger.
+    """
+    if format not in IMAGE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format inconnu : {format} (disponibles : {', '.join(IMAGE_FORMATS)})")
     try:
-        df = load_data()
-        negative_df = df[df['sentiment'] == 'negative']
-        
-        if 'text_cleaned' in negative_df.columns:
-            text_data = negative_df['text_cleaned'].dropna()
-        elif 'text' in negative_df.columns:
-            text_data = negative_df['text'].dropna()
-        else:
-            raise ValueError("Aucune colonne de texte disponible")
-        
-        if len(text_data) == 0:
-            raise ValueError("Aucun tweet négatif disponible")
-        
-        text = ' '.join(text_data.astype(str))
-        
-        # Générer le WordCloud
-        wordcloud = WordCloud(
-            width=800,
-            height=400,
-            background_color='white',
-            colormap='Reds',
-            max_words=100,
-            relative_scaling=0.5,
-            collocations=False
-        ).generate(text)
-        
-        # Convertir en image base64
-        img_buffer = BytesIO()
-        plt.figure(figsize=(10, 6))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.tight_layout(pad=0)
-        plt.savefig(img_buffer, format='png', bbox_inches='tight', dpi=100)
-        plt.close()
+        version = await query_pool.run(_data_version)
+        key = (start_date or '', end_date or '', format, version)
+        etag = '"' + hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={WORDCLOUD_MAX_AGE}"}
+        if request.headers.get('if-none-match') == etag:
+            return Response(status_code=304, headers=headers)
         
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.read()).decode('utf-8')
+        with _wordcloud_cache_lock:
+            image = _wordcloud_cache.get(key)
+            if image is not None:
+                _wordcloud_cache.move_to_end(key)
+        if image is None:
+            frequencies = await query_pool.run(_negative_frequencies, start_date, end_date)
+            # Générer le WordCloud (rendu dans render_pool, hors de la boucle asyncio)
+            image = await render_pool.run(render_wordcloud, frequencies, format)
+            with _wordcloud_cache_lock:
+                _wordcloud_cache[key] = image
+                while len(_wordcloud_cache) > WORDCLOUD_CACHE_SIZE:
+                    _wordcloud_cache.popitem(last=False)
         
-        return {"image": f"data:image/png;base64,{img_base64}"}
+        return Response(content=image, media_type=IMAGE_FORMATS[format][1], headers=headers)
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,118 @@
+"""
+Cache en mémoire du jeu de résultats pour le dashboard
+
+Le fichier de résultats est lu une seule fois, puis partagé par toutes les
+requêtes. À chaque accès, la signature du fichier (date de modification et
+taille) est comparée à celle du jeu en cache :
+
+- Inchangée : le jeu en cache est retourné, sans relire le fichier.
+- Modifiée : le fichier est relu puis le nouveau jeu remplace l'ancien en
+  une seule affectation. Une requête obtient donc toujours un jeu complet
+  (l'ancien ou le nouveau), jamais un jeu en cours de chargement.
+
+Un seul chargement a lieu à la fois : les requêtes arrivées pendant un
+rechargement l'attendent au lieu de relire elles aussi le fichier.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Signature d'un fichier : (chemin, date de modification en ns, taille)
+FileSignature = Tuple[str, int, int]
+
+
+def file_signature(path: str) -> FileSignature:
+    """
+    Calcule la signature d'un fichier (chemin, date de modification, taille).
+    """
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class DatasetCache:
+    """
+    Jeu de données chargé une fois et rechargé quand son fichier change.
+    """
+
+    def __init__(self, loader: Callable[[str], Any]):
+        """
+        Args:
+            loader: Fonction de chargement d'un fichier (chemin -> jeu de
+                données, DataFrame ou objet de taille len()) ; le jeu retourné
+                ne doit plus être modifié ensuite
+        """
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.last_load_seconds = 0.0
+        self.total_load_seconds = 0.0
+        # (signature, jeu de données) : remplacé d'un bloc, jamais modifié
+        self._entry: Optional[Tuple[FileSignature, Any]] = None
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def get(self, path: str) -> Any:
+        """
+        Retourne le jeu de données du fichier, rechargé s'il a changé.
+
+        Le jeu retourné est partagé entre les requêtes : il ne doit pas être
+        modifié (filtrer ou projeter un DataFrame en crée un nouveau).
+        """
+        signature = file_signature(path)
+        entry = self._entry
+        if entry is not None and entry[0] == signature:
+            with self._stats_lock:
+                self.hits += 1
+            return entry[1]
+
+        with self._load_lock:
+            # Un autre chargement a pu aboutir pendant l'attente du verrou
+            signature = file_signature(path)
+            entry = self._entry
+            if entry is not None and entry[0] == signature:
+                with self._stats_lock:
+                    self.hits += 1
+                return entry[1]
+
+            with self._stats_lock:
+                self.misses += 1
+            start = time.perf_counter()
+            # Signature relevée avant la lecture : un fichier remplacé pendant
+            # le chargement sera relu à la requête suivante
+            df = self.loader(path)
+            elapsed = time.perf_counter() - start
+
+            self._entry = (signature, df)
+            with self._stats_lock:
+                self.loads += 1
+                self.last_load_seconds = elapsed
+                self.total_load_seconds += elapsed
+            return df
+
+    def clear(self):
+        """
+        Vide le cache (le prochain accès relit le fichier).
+        """
+        self._entry = None
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Retourne les compteurs du cache (hits, misses, taux de succès,
+        chargements et leur durée, fichier et nombre de lignes en cache).
+        """
+        entry = self._entry
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'loads': self.loads,
+                'last_load_seconds': self.last_load_seconds,
+                'mean_load_seconds': self.total_load_seconds / self.loads if self.loads else 0.0,
+                'file': entry[0][0] if entry is not None else None,
+                'rows': len(entry[1]) if entry is not None else 0
+            }
@@ -0,0 +1,57 @@
+"""
+Chargement paresseux des ressources NLTK
+
+Les ressources (stopwords, punkt, wordnet, lexique VADER) ne sont recherchées,
+et téléchargées si nécessaire, qu'à leur première utilisation, et non plus à
+l'import des modules. L'import reste ainsi rapide et fonctionne hors ligne.
+
+Définir TESLA_OFFLINE=1 interdit tout téléchargement : une ressource absente
+lève alors immédiatement une LookupError explicite.
+"""
+
+import os
+
+# Ressources déjà vérifiées dans ce processus
+_available = set()
+
+
+def is_offline() -> bool:
+    """
+    Indique si les téléchargements sont désactivés (TESLA_OFFLINE=1).
+    """
+    return os.getenv('TESLA_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def ensure_nltk_resource(resource_path: str, package: str):
+    """
+    Vérifie qu'une ressource NLTK est disponible, en la téléchargeant si besoin.
+
+    Args:
+        resource_path: Chemin de la ressource pour nltk.data.find
+            (ex. 'corpora/stopwords')
+        package: Nom du paquet à télécharger (ex. 'stopwords')
+
+    Raises:
+        LookupError: Si la ressource est absente et ne peut pas être téléchargée
+    """
+    if resource_path in _available:
+        return
+
+    import nltk
+
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        if is_offline():
+            raise LookupError(
+                f"Ressource NLTK '{package}' introuvable et téléchargement désactivé "
+                f"(TESLA_OFFLINE). Installez-la avec : python -m nltk.downloader {package}"
+            ) from None
+
+        if not nltk.download(package, quiet=True):
+            raise LookupError(
+                f"Ressource NLTK '{package}' introuvable et téléchargement impossible "
+                f"(pas de connexion ?). Installez-la avec : python -m nltk.downloader {package}"
+            ) from None
+
+    _available.add(resource_path)
@@ -0,0 +1,327 @@
+"""
+Résultats d'analyse partitionnés par jour
+
+Les tweets analysés sont rangés par jour UTC de publication :
+
+    data/results/
+        date=2026-10-16/part-1760659200123456789.parquet
+        date=2026-10-17/part-1760745600123456789.parquet
+        date=2026-10-17/part-1760749200987654321.parquet
+
+- Un lecteur filtré sur une période n'ouvre que les partitions des jours
+  demandés : le filtre est résolu par le nom des répertoires, sans calculer
+  la date de chaque ligne.
+- Les fichiers ne sont jamais modifiés : une écriture ajoute un nouveau
+  fichier dans les partitions des jours concernés (les tweets récents ne
+  touchent que les derniers jours). Un fichier lu peut donc être gardé en
+  cache sans vérification ; seule la liste des fichiers d'une partition est
+  relue à chaque lecture.
+- Les tweets déjà présents dans une partition (même id) ne sont pas réécrits :
+  relancer l'analyse sur les mêmes tweets ne modifie aucune partition.
+- Une partition qui accumule trop de fichiers (micro-lots de run_pipeline.py)
+  est compactée en un seul fichier.
+
+Le format des fichiers suit TESLA_STORAGE_FORMAT (csv ou parquet).
+
+Usage (partitionner un fichier de résultats existant) :
+    python src/partitioned_results.py data/tesla_sentiment_results.csv
+"""
+
+import glob
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .tesla_storage import get_storage_format, read_table, write_table
+except ImportError:
+    from tesla_storage import get_storage_format, read_table, write_table
+
+# Répertoire des partitions (RESULTS_PARTITION_DIR vide = désactivé)
+DEFAULT_RESULTS_PARTITION_DIR = "data/results"
+
+# Préfixe des répertoires de partition (convention Hive : colonne=valeur)
+PARTITION_PREFIX = "date="
+
+# Partition des tweets sans date valide (lue uniquement sans filtre de période)
+UNKNOWN_PARTITION = "unknown"
+
+
+def get_results_partition_dir() -> Optional[str]:
+    """
+    Retourne le répertoire des partitions (variable RESULTS_PARTITION_DIR),
+    ou None s'il est désactivé (RESULTS_PARTITION_DIR vide).
+    """
+    return os.getenv('RESULTS_PARTITION_DIR', DEFAULT_RESULTS_PARTITION_DIR) or None
+
+
+def _to_day(value: Optional[str]) -> Optional[str]:
+    """
+    Convertit une borne de filtre ('2026-10-17', '2026-10-17T12:00'...) en jour AAAA-MM-JJ.
+    """
+    if not value:
+        return None
+    return pd.to_datetime(value).strftime('%Y-%m-%d')
+
+
+class PartitionedResults:
+    """
+    Jeu de résultats partitionné par jour, avec cache des fichiers lus.
+    """
+
+    def __init__(
+        self,
+        root: str = DEFAULT_RESULTS_PARTITION_DIR,
+        storage_format: Optional[str] = None,
+        max_files_per_partition: int = 16,
+        cache_size: int = 256
+    ):
+        """
+        Args:
+            root: Répertoire racine des partitions
+            storage_format: Format des nouveaux fichiers ('csv' ou 'parquet',
+                TESLA_STORAGE_FORMAT par défaut)
+            max_files_per_partition: Nombre de fichiers au-delà duquel une
+                partition est compactée après une écriture
+            cache_size: Nombre maximal de fichiers (par projection) gardés en cache
+        """
+        if max_files_per_partition < 1:
+            raise ValueError(f"max_files_per_partition doit être positif (reçu : {max_files_per_partition})")
+
+        self.root = root
+        self.storage_format = storage_format or get_storage_format()
+        self.max_files_per_partition = max_files_per_partition
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[Tuple[str, Optional[Tuple[str, ...]]], pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """
+        Indique si des partitions ont déjà été écrites.
+        """
+        return os.path.isdir(self.root)
+
+    def partitions(self) -> Dict[str, str]:
+        """
+        Retourne les partitions existantes : jour -> répertoire.
+        """
+        if not self.exists():
+            return {}
+        return {
+            entry.name[len(PARTITION_PREFIX):]: entry.path
+            for entry in os.scandir(self.root)
+            if entry.is_dir() and entry.name.startswith(PARTITION_PREFIX)
+        }
+
+    @staticmethod
+    def _files(partition_dir: str) -> List[str]:
+        """
+        Fichiers d'une partition, du plus ancien au plus récent (les fichiers
+        temporaires d'une écriture en cours sont ignorés).
+        """
+        return sorted(
+            glob.glob(os.path.join(partition_dir, 'part-*.csv'))
+            + glob.glob(os.path.join(partition_dir, 'part-*.parquet'))
+        )
+
+    def last_modified(self) -> float:
+        """
+        Date de la dernière écriture (chaque appel à append met à jour la
+        date du répertoire racine).
+        """
+        if not self.exists():
+            return 0.0
+        return os.path.getmtime(self.root)
+
+    def _read_file(self, path: str, columns: Optional[Tuple[str, ...]]) -> pd.DataFrame:
+        """
+        Lit un fichier de partition (projection éventuelle), via le cache LRU.
+        """
+        key = (path, columns)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+            self.cache_misses += 1
+
+        df = read_table(path, columns=list(columns) if columns is not None else None)
+        with self._lock:
+            self._cache[key] = df
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return df
+
+    def _evict(self, paths: List[str]):
+        """
+        Retire du cache les fichiers supprimés par une compaction.
+        """
+        removed = set(paths)
+        with self._lock:
+            for key in [key for key in self._cache if key[0] in removed]:
+                del self._cache[key]
+
+    def _read_partition(self, partition_dir: str, columns: Optional[Tuple[str, ...]]) -> List[pd.DataFrame]:
+        """
+        Lit tous les fichiers d'une partition.
+        """
+        # Une compaction concurrente peut supprimer un fichier listé : relister
+        for _ in range(3):
+            try:
+                files = self._files(partition_dir)
+                frames = [self._read_file(path, columns) for path in files]
+                break
+            except FileNotFoundError:
+                continue
+        else:
+            raise RuntimeError(f"Partition modifiée pendant la lecture : {partition_dir}")
+
+        if len(frames) > 1 and all('id' in frame.columns for frame in frames):
+            # Pendant une compaction, le fichier compacté et les anciens coexistent un instant
+            df = pd.concat(frames, ignore_index=True)
+            return [df.drop_duplicates('id', keep='last')]
+        return frames
+
+    def read(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Lit les résultats des jours [start_date, end_date] (bornes incluses).
+
+        Args:
+            start_date: Premier jour (None = depuis le début)
+            end_date: Dernier jour (None = jusqu'au dernier)
+            columns: Colonnes à lire (None = toutes)
+
+        Returns:
+            DataFrame des partitions retenues
+        """
+        start_day, end_day = _to_day(start_date), _to_day(end_date)
+        projection = tuple(columns) if columns is not None else None
+        if projection is not None and 'id' not in projection:
+            projection = projection + ('id',)
+
+        def selected(day: str) -> bool:
+            if day == UNKNOWN_PARTITION:
+                return start_day is None and end_day is None
+            return (start_day is None or day >= start_day) and (end_day is None or day <= end_day)
+
+        partitions = self.partitions()
+        frames = []
+        for day in filter(selected, sorted(partitions)):
+            frames.extend(self._read_partition(partitions[day], projection))
+
+        if not frames:
+            # Aucun jour dans la période : DataFrame vide, avec les colonnes d'un fichier existant
+            sample = next((files[0] for files in map(self._files, partitions.values()) if files), None)
+            if sample is None:
+                return pd.DataFrame(columns=columns or [])
+            frames = [self._read_file(sample, projection).iloc[:0]]
+
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].copy()
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return df
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Ajoute des tweets analysés : un nouveau fichier par jour concerné,
+        sans les tweets déjà présents dans la partition.
+
+        Returns:
+            Nombre de tweets écrits
+        """
+        if len(df) == 0:
+            return 0
+        if 'date' not in df.columns:
+            raise ValueError("La colonne 'date' est requise pour partitionner les résultats")
+
+        # Regroupement sur le jour tronqué ; seules les clés des groupes sont formatées
+        days = pd.to_datetime(df['date'], utc=True, format='ISO8601').dt.floor('D').dt.tz_localize(None)
+
+        written = 0
+        for day, part in df.groupby(days.to_numpy(), sort=True, dropna=False):
+            day = UNKNOWN_PARTITION if pd.isna(day) else pd.Timestamp(day).strftime('%Y-%m-%d')
+            partition_dir = os.path.join(self.root, f"{PARTITION_PREFIX}{day}")
+            files = self._files(partition_dir)
+            if files and 'id' in part.columns:
+                known = pd.concat([self._read_file(path, ('id',)) for path in files])['id']
+                part = part[~part['id'].astype('int64').isin(known.astype('int64'))]
+            if len(part) == 0:
+                continue
+
+            path = os.path.join(partition_dir, f"part-{time.time_ns()}.{self.storage_format}")
+            write_table(part, path)
+            written += len(part)
+
+            if len(files) + 1 > self.max_files_per_partition:
+                self.compact(day)
+
+        # Marquer les partitions à jour, même si tous les tweets étaient déjà présents
+        os.makedirs(self.root, exist_ok=True)
+        os.utime(self.root)
+        return written
+
+    def compact(self, day: str):
+        """
+        Fusionne les fichiers d'une partition en un seul.
+        """
+        partition_dir = os.path.join(self.root, f"{PARTITION_PREFIX}{day}")
+        files = self._files(partition_dir)
+        if len(files) <= 1:
+            return
+
+        df = pd.concat([read_table(path) for path in files], ignore_index=True)
+        if 'id' in df.columns:
+            df = df.drop_duplicates('id', keep='last')
+        write_table(df, os.path.join(partition_dir, f"part-{time.time_ns()}.{self.storage_format}"))
+        for path in files:
+            os.remove(path)
+        self._evict(files)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs du cache de fichiers (hits, misses, taux de succès, taille).
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0,
+            'entries': len(self._cache)
+        }
+
+
+def main():
+    """
+    Partitionne un fichier de résultats existant.
+    """
+    if len(sys.argv) < 2:
+        print("Usage : python src/partitioned_results.py <fichier de résultats> [répertoire]")
+        return
+
+    input_file = sys.argv[1]
+    root = sys.argv[2] if len(sys.argv) > 2 else (get_results_partition_dir() or DEFAULT_RESULTS_PARTITION_DIR)
+    if not os.path.exists(input_file):
+        print(f"❌ Fichier introuvable : {input_file}")
+        return
+
+    print(f"📂 Chargement des résultats depuis {input_file}...")
+    df = read_table(input_file)
+    dataset = PartitionedResults(root)
+    written = dataset.append(df)
+    print(f"💾 {written} tweets ajoutés à {root} ({len(dataset.partitions())} partitions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,29 +11,178 @@ Ce module nettoie les tweets collectés en supprimant :
 """
 
 import pandas as pd
+import numpy as np
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import word_tokenize
-from typing import List, Set
+from typing import Dict, List, Optional, Set
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-# Télécharger les ressources NLTK nécessaires (si pas déjà fait)
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+    from .nltk_resources import ensure_nltk_resource
+    from .tesla_storage import data_path, read_table, stream_transform, write_table
+except ImportError:
+    from nltk_resources import ensure_nltk_resource
+    from tesla_storage import data_path, read_table, stream_transform, write_table
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+# Les ressources NLTK (stopwords, wordnet, punkt) sont chargées à la première
+# utilisation, et non à l'import du module (voir nltk_resources)
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet', quiet=True)
+
+# Expressions régulières précompilées (partagées par le mode ligne et le mode batch)
+URL_PATTERN = re.compile(r'http\S+|www.\S+|https\S+', flags=re.MULTILINE)
+MENTION_PATTERN = re.compile(r'@\w+')
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+DIGITS_PATTERN = re.compile(r'\d+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Mode batch : un seul passage supprime '#', chiffres et ponctuation
+# (les étapes 3 à 5 de clean_tweet sont toutes couvertes par [^a-zA-Z\s])
+NON_ALPHA_RUN_PATTERN = re.compile(r'[^a-zA-Z\s]+')
+
+# Contractions découpées par word_tokenize même sur un texte [a-z ]
+# (cannot -> can not, gonna -> gon na, ...), cf. NLTKWordTokenizer.CONTRACTIONS2
+CONTRACTIONS_PATTERN = re.compile(
+    r'\b(can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na\b))'
+)
+
+# Backends de tokenisation disponibles pour le texte nettoyé ([a-z ] uniquement) :
+# - 'nltk'  : word_tokenize (Punkt + Treebank), nécessite la ressource 'punkt'
+# - 'regex' : découpage des contractions + split, tokens identiques à 'nltk'
+# - 'split' : simple str.split, le plus rapide (ne découpe pas cannot, gonna, ...)
+TOKENIZER_BACKENDS = ('nltk', 'regex', 'split')
+
+# Taxonomie par défaut des entités suivies (catégorie -> mots-clés)
+DEFAULT_TAXONOMY = {
+    'models': ['model 3', 'model y', 'model s', 'model x', 'cybertruck', 
+              'semi', 'roadster'],
+    'company': ['tesla', 'tsla'],
+    'people': ['elon', 'musk', 'elon musk']
+}
+
+# Nom de la colonne booléenne produite par catégorie
+# (les autres catégories produisent 'mentions_<catégorie>')
+FEATURE_COLUMNS = {
+    'models': 'mentions_model',
+    'company': 'mentions_company',
+    'people': 'mentions_elon'
+}
+
+
+def load_taxonomy(taxonomy_file: str) -> Dict[str, List[str]]:
+    """
+    Charge une taxonomie d'entités depuis un fichier JSON.
+    
+    Le fichier associe chaque catégorie à sa liste de mots-clés, par exemple :
+    {"models": ["model 3", "cybertruck"], "competitors": ["rivian", "byd"]}
+    
+    Args:
+        taxonomy_file: Chemin du fichier JSON
+        
+    Returns:
+        Dictionnaire catégorie -> liste de mots-clés
+    """
+    with open(taxonomy_file, 'r', encoding='utf-8') as f:
+        taxonomy = json.load(f)
+    
+    if not isinstance(taxonomy, dict) or not all(
+        isinstance(keywords, list) for keywords in taxonomy.values()
+    ):
+        raise ValueError(
+            f"Taxonomie invalide dans {taxonomy_file} : attendu {{catégorie: [mots-clés]}}"
+        )
+    
+    return taxonomy
+
+
+def _trie_regex(keywords: List[str]) -> str:
+    """
+    Construit une expression régulière en forme de trie pour une liste de mots-clés.
+    
+    Les préfixes communs sont factorisés ('model (?:3|s|x|y)'), ce qui évite au
+    moteur d'essayer chaque mot-clé à chaque position. Les suffixes optionnels
+    étant gourmands, le mot-clé le plus long est retenu à chaque position.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # Marqueur de fin de mot-clé
+    
+    def build(node: dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})" + ('?' if terminal else '')
+    
+    return build(trie)
+
+
+class TaxonomyMatcher:
+    """
+    Détecteur multi-motifs compilé une seule fois pour toute la taxonomie.
+    
+    Tous les mots-clés sont fusionnés dans une seule expression régulière en
+    forme de trie (équivalent d'un automate Aho-Corasick exécuté par le moteur
+    re), si bien qu'un seul passage par texte trouve toutes les entités.
+    La sémantique est celle de la recherche de sous-chaîne (`keyword in text`),
+    y compris pour les mots-clés qui se chevauchent ('elon' / 'elon musk').
+    """
+    
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        """
+        Compile la taxonomie.
+        
+        Args:
+            taxonomy: Dictionnaire catégorie -> liste de mots-clés
+        """
+        self.taxonomy = {
+            category: [keyword.lower() for keyword in keywords if keyword.strip()]
+            for category, keywords in taxonomy.items()
+        }
+        self.categories = list(self.taxonomy)
+        
+        keywords = sorted({kw for kws in self.taxonomy.values() for kw in kws})
+        
+        # Lookahead : une correspondance (la plus longue) par position de départ
+        self.pattern = re.compile(f"(?=({_trie_regex(keywords)}))") if keywords else None
+        
+        # Mots-clés contenus dans chaque mot-clé (ex. 'elon' dans 'elon musk'),
+        # pour retrouver les correspondances masquées par la plus longue
+        self._contained = {
+            keyword: [other for other in keywords if other in keyword]
+            for keyword in keywords
+        }
+        
+        # Index des catégories de chaque mot-clé
+        self._keyword_categories = {keyword: [] for keyword in keywords}
+        for index, category in enumerate(self.categories):
+            for keyword in set(self.taxonomy[category]):
+                self._keyword_categories[keyword].append(index)
+    
+    def find(self, text: str) -> Set[str]:
+        """
+        Retourne l'ensemble des mots-clés présents dans un texte (déjà en minuscules).
+        """
+        found = set()
+        if self.pattern is None:
+            return found
+        
+        for longest in set(self.pattern.findall(text)):
+            found.update(self._contained[longest])
+        
+        return found
+    
+    def find_categories(self, found: Set[str]) -> Set[int]:
+        """
+        Retourne les index des catégories couvertes par un ensemble de mots-clés.
+        """
+        return {index for keyword in found for index in self._keyword_categories[keyword]}
 
 
 class TeslaTextPreprocessor:
@@ -44,40 +193,120 @@ class TeslaTextPreprocessor:
     de sentiment.
     """
     
-    def __init__(self, language: str = 'english', lemmatize: bool = False):
+    def __init__(
+        self,
+        language: str = 'english',
+        lemmatize: bool = False,
+        tokenizer: str = 'regex',
+        taxonomy_file: Optional[str] = None
+    ):
         """
         Initialise le preprocessor.
         
         Args:
             language: Langue pour les stopwords ('english' ou 'french')
             lemmatize: Si True, applique la lemmatisation
+            tokenizer: Backend de tokenisation ('nltk', 'regex' ou 'split')
+            taxonomy_file: Fichier JSON de taxonomie des entités
+                (défaut : DEFAULT_TAXONOMY)
         """
+        if tokenizer not in TOKENIZER_BACKENDS:
+            raise ValueError(
+                f"Tokenizer inconnu : {tokenizer} (disponibles : {', '.join(TOKENIZER_BACKENDS)})"
+            )
+        
         self.language = language
         self.lemmatize = lemmatize
+        self.tokenizer = tokenizer
+        
+        # Options de construction, pour recréer le preprocessor dans les workers
+        self._options = {
+            'language': language,
+            'lemmatize': lemmatize,
+            'tokenizer': tokenizer,
+            'taxonomy_file': taxonomy_file
+        }
         
-        # Charger les stopwords
-        self.stop_words = set(stopwords.words(language))
-        # Ajouter aussi les stopwords français si anglais
-        if language == 'english':
-            try:
-                french_stopwords = set(stopwords.words('french'))
-                self.stop_words = self.stop_words.union(french_stopwords)
-            except:
-                pass
-        
-        # Initialiser le lemmatiseur si nécessaire
-        if lemmatize:
-            self.lemmatizer = WordNetLemmatizer()
-        else:
-            self.lemmatizer = None
+        self._tokenize = {
+            'nltk': self._tokenize_nltk,
+            'regex': self._tokenize_regex,
+            'split': str.split
+        }[tokenizer]
+        
+        # Stopwords et lemmatiseur chargés à la première utilisation
+        self._stop_words = None
+        self._lemmatizer = None
         
         # Mots-clés spécifiques à Tesla pour l'extraction de features
-        self.tesla_keywords = {
-            'models': ['model 3', 'model y', 'model s', 'model x', 'cybertruck', 
-                      'semi', 'roadster'],
-            'company': ['tesla', 'tsla'],
-            'people': ['elon', 'musk', 'elon musk']
-        }
+        self.taxonomy_file = taxonomy_file
+        if taxonomy_file:
+            self.tesla_keywords = load_taxonomy(taxonomy_file)
+        else:
+            self.tesla_keywords = {
+                category: list(keywords) for category, keywords in DEFAULT_TAXONOMY.items()
+            }
+        
+        # Compiler la taxonomie une seule fois
+        self.matcher = TaxonomyMatcher(self.tesla_keywords)
+        self.feature_columns = [
+            FEATURE_COLUMNS.get(category, f'mentions_{category}')
+            for category in self.matcher.categories
+        ]
+    
+    @property
+    def stop_words(self) -> Set[str]:
+        """
+        Stopwords de la langue (chargés à la première utilisation).
+        """
+        if self._stop_words is None:
+            ensure_nltk_resource('corpora/stopwords', 'stopwords')
+            from nltk.corpus import stopwords
+            
+            stop_words = set(stopwords.words(self.language))
+            # Ajouter aussi les stopwords français si anglais
+            if self.language == 'english':
+                try:
+                    french_stopwords = set(stopwords.words('french'))
+                    stop_words = stop_words.union(french_stopwords)
+                except:
+                    pass
+            self._stop_words = stop_words
+        
+        return self._stop_words
+    
+    @stop_words.setter
+    def stop_words(self, value: Set[str]):
+        self._stop_words = set(value)
+    
+    @property
+    def lemmatizer(self):
+        """
+        Lemmatiseur WordNet si la lemmatisation est activée, sinon None.
+        """
+        if self.lemmatize and self._lemmatizer is None:
+            ensure_nltk_resource('corpora/wordnet', 'wordnet')
+            from nltk.stem import WordNetLemmatizer
+            
+            self._lemmatizer = WordNetLemmatizer()
+        
+        return self._lemmatizer
+    
+    @staticmethod
+    def _tokenize_nltk(text: str) -> List[str]:
+        """
+        Tokenise avec word_tokenize (nécessite le modèle Punkt).
+        """
+        ensure_nltk_resource('tokenizers/punkt', 'punkt')
+        from nltk.tokenize import word_tokenize
+        
+        return word_tokenize(text)
+    
+    @staticmethod
+    def _tokenize_regex(text: str) -> List[str]:
+        """
+        Tokenise un texte nettoyé ([a-z ]) comme word_tokenize, sans Punkt.
+        """
+        return CONTRACTIONS_PATTERN.sub(r'\1 ', text).split()
     
     def clean_tweet(self, text: str) -> str:
         """
@@ -96,28 +325,28 @@ class TeslaTextPreprocessor:
         text = str(text)
         
         # 1. Supprimer les liens HTTP/HTTPS
-        text = re.sub(r'http\S+|www.\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = URL_PATTERN.sub('', text)
         
         # 2. Supprimer les mentions @user
-        text = re.sub(r'@\w+', '', text)
+        text = MENTION_PATTERN.sub('', text)
         
         # 3. Supprimer les hashtags (garder le mot sans #)
-        text = re.sub(r'#(\w+)', r'\1', text)
+        text = HASHTAG_PATTERN.sub(r'\1', text)
         
         # 4. Supprimer les caractères spéciaux et ponctuation (garder lettres et espaces)
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = NON_ALPHA_PATTERN.sub('', text)
         
         # 5. Supprimer les chiffres
-        text = re.sub(r'\d+', '', text)
+        text = DIGITS_PATTERN.sub('', text)
         
         # 6. Convertir en minuscules
         text = text.lower()
         
         # 7. Supprimer les espaces multiples
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         # 8. Tokeniser et supprimer les stopwords
-        tokens = word_tokenize(text)
+        tokens = self._tokenize(text)
         tokens = [token for token in tokens if token not in self.stop_words]
         
         # 9. Supprimer les tokens trop courts (moins de 2 caractères)
@@ -125,7 +354,8 @@ class TeslaTextPreprocessor:
         
         # 10. Lemmatisation (optionnelle)
         if self.lemmatize and self.lemmatizer:
-            tokens = [self.lemmatizer.lemmatize(token) for token in tokens]
+            lemmatizer = self.lemmatizer
+            tokens = [lemmatizer.lemmatize(token) for token in tokens]
         
         # Rejoindre les tokens en texte
         cleaned_text = ' '.join(tokens)
@@ -135,6 +365,73 @@ class TeslaTextPreprocessor:
         
         return cleaned_text
     
+    def clean_series(self, texts: pd.Series) -> pd.Series:
+        """
+        Nettoie une colonne complète de tweets en mode batch.
+        
+        Produit exactement le même résultat que clean_tweet appliqué ligne
+        par ligne, mais :
+        - chaque texte distinct n'est nettoyé qu'une seule fois (les tweets
+          dupliqués sont très fréquents)
+        - les expressions régulières précompilées sont appliquées colonne
+          par colonne via l'accesseur .str
+        - les étapes redondantes sont fusionnées en un seul passage
+        
+        Args:
+            texts: Série contenant les textes bruts
+            
+        Returns:
+            Série des textes nettoyés (même index que l'entrée)
+        """
+        # Les valeurs manquantes reçoivent le code -1
+        codes, uniques = pd.factorize(texts)
+        
+        unique_texts = pd.Series(uniques, dtype=object).astype(str)
+        cleaned_uniques = self._clean_unique_texts(unique_texts)
+        
+        # Le dernier élément ('') sert aux valeurs manquantes (code -1)
+        lookup = np.array(cleaned_uniques + [''], dtype=object)
+        return pd.Series(lookup[codes], index=texts.index, dtype=object)
+    
+    def _clean_unique_texts(self, texts: pd.Series) -> List[str]:
+        """
+        Applique les étapes de clean_tweet sur une série de textes distincts.
+        """
+        # 1-2. Liens puis mentions (deux passages distincts pour conserver
+        # l'ordre des substitutions de clean_tweet)
+        texts = texts.str.replace(URL_PATTERN, '', regex=True)
+        texts = texts.str.replace(MENTION_PATTERN, '', regex=True)
+        
+        # 3-5. Hashtags, ponctuation et chiffres en un seul passage
+        texts = texts.str.replace(NON_ALPHA_RUN_PATTERN, '', regex=True)
+        
+        # 6. Minuscules
+        texts = texts.str.lower()
+        
+        # 8. Découpage des contractions comme le fait word_tokenize
+        # (sauf avec le backend 'split' qui ne les découpe pas)
+        if self.tokenizer != 'split':
+            texts = texts.str.replace(CONTRACTIONS_PATTERN, r'\1 ', regex=True)
+        
+        # 7-9. Espaces, stopwords et tokens courts en un seul passage
+        stop_words = self.stop_words
+        token_lists = [
+            [token for token in text.split() if len(token) > 2 and token not in stop_words]
+            for text in texts.tolist()
+        ]
+        
+        # 10. Lemmatisation (optionnelle), mise en cache par token distinct
+        if self.lemmatize and self.lemmatizer:
+            lemmatizer = self.lemmatizer
+            lemmas = {}
+            for tokens in token_lists:
+                for i, token in enumerate(tokens):
+                    if token not in lemmas:
+                        lemmas[token] = lemmatizer.lemmatize(token)
+                    tokens[i] = lemmas[token]
+        
+        return [' '.join(tokens) for tokens in token_lists]
+    
     def extract_tesla_features(self, text: str) -> dict:
         """
         Extrait des features spécifiques à Tesla depuis le texte.
@@ -145,47 +442,108 @@ class TeslaTextPreprocessor:
         Returns:
             Dictionnaire avec les features extraites
         """
+        features = {column: False for column in self.feature_columns}
+        features['mentioned_models'] = []
+        
         if pd.isna(text) or text == '':
-            return {
-                'mentions_model': False,
-                'mentions_company': False,
-                'mentions_elon': False,
-                'mentioned_models': []
-            }
+            return features
+        
+        # Un seul passage du détecteur sur le texte
+        found = self.matcher.find(str(text).lower())
+        if not found:
+            return features
+        
+        for index in self.matcher.find_categories(found):
+            features[self.feature_columns[index]] = True
+        
+        # Modèles mentionnés, dans l'ordre de la taxonomie
+        features['mentioned_models'] = [
+            model for model in self.matcher.taxonomy.get('models', []) if model in found
+        ]
         
-        text_lower = str(text).lower()
+        return features
+    
+    def extract_features_columns(self, texts: pd.Series) -> pd.DataFrame:
+        """
+        Extrait les features Tesla pour une colonne entière.
         
-        features = {
-            'mentions_model': False,
-            'mentions_company': False,
-            'mentions_elon': False,
-            'mentioned_models': []
+        Variante colonne de extract_tesla_features : les colonnes booléennes
+        sont remplies directement (tableaux NumPy) sans construire de liste de
+        dictionnaires, et chaque texte distinct n'est analysé qu'une fois.
+        
+        Args:
+            texts: Série contenant les textes (originaux ou nettoyés)
+            
+        Returns:
+            DataFrame (même index que l'entrée) avec une colonne booléenne par
+            catégorie et la colonne 'mentioned_models'
+        """
+        codes, uniques = pd.factorize(texts)
+        unique_texts = pd.Series(uniques, dtype=object).astype(str).str.lower().tolist()
+        
+        # Une ligne supplémentaire (vide) pour les valeurs manquantes (code -1)
+        flags = np.zeros((len(self.feature_columns), len(unique_texts) + 1), dtype=bool)
+        models = self.matcher.taxonomy.get('models', [])
+        unique_models = [[] for _ in range(len(unique_texts) + 1)]
+        
+        for i, text in enumerate(unique_texts):
+            found = self.matcher.find(text)
+            if not found:
+                continue
+            for index in self.matcher.find_categories(found):
+                flags[index, i] = True
+            unique_models[i] = [model for model in models if model in found]
+        
+        columns = {
+            column: flags[index][codes]
+            for index, column in enumerate(self.feature_columns)
         }
+        columns['mentioned_models'] = [list(unique_models[code]) for code in codes]
         
-        # Vérifier la mention de modèles
-        for model in self.tesla_keywords['models']:
-            if model in text_lower:
-                features['mentions_model'] = True
-                features['mentioned_models'].append(model)
+        return pd.DataFrame(columns, index=texts.index)
+    
+    def process_texts(self, texts: pd.Series, vectorized: bool = True) -> pd.DataFrame:
+        """
+        Nettoie une série de textes et extrait les features Tesla.
         
-        # Vérifier la mention de la compagnie
-        for keyword in self.tesla_keywords['company']:
-            if keyword in text_lower:
-                features['mentions_company'] = True
-                break
+        Args:
+            texts: Série contenant les textes bruts
+            vectorized: Si True, traite la colonne entière en mode batch
+                (clean_series, extract_features_columns), sinon ligne par
+                ligne (clean_tweet, extract_tesla_features)
+            
+        Returns:
+            DataFrame (même index que l'entrée) avec 'text_cleaned' et les features
+        """
+        processed = pd.DataFrame(index=texts.index)
         
-        # Vérifier la mention d'Elon Musk
-        for keyword in self.tesla_keywords['people']:
-            if keyword in text_lower:
-                features['mentions_elon'] = True
-                break
+        # Nettoyer les tweets
+        if vectorized:
+            processed['text_cleaned'] = self.clean_series(texts)
+        else:
+            processed['text_cleaned'] = texts.apply(self.clean_tweet)
         
-        return features
+        # Extraire les features Tesla
+        if vectorized:
+            features = self.extract_features_columns(texts)
+            for column in features.columns:
+                processed[column] = features[column]
+        else:
+            features_list = texts.apply(self.extract_tesla_features)
+            
+            for column in self.feature_columns + ['mentioned_models']:
+                processed[column] = [f[column] for f in features_list]
+        
+        return processed
     
     def preprocess_dataframe(
         self, 
         df: pd.DataFrame,
-        text_column: str = 'text'
+        text_column: str = 'text',
+        vectorized: bool = True,
+        n_jobs: int = 1,
+        chunk_size: Optional[int] = None,
+        verbose: bool = True
     ) -> pd.DataFrame:
         """
         Prétraite un DataFrame complet de tweets.
@@ -193,47 +551,174 @@ class TeslaTextPreprocessor:
         Args:
             df: DataFrame avec les tweets bruts
             text_column: Nom de la colonne contenant le texte
+            vectorized: Si True, traite la colonne entière en mode batch
+                (clean_series, extract_features_columns), sinon ligne par
+                ligne (clean_tweet, extract_tesla_features)
+            n_jobs: Nombre de processus (1 = séquentiel, -1 = tous les cœurs)
+            chunk_size: Nombre de tweets par chunk en mode parallèle
+                (défaut : 4 chunks par processus)
+            verbose: Si False, n'affiche pas la progression
             
         Returns:
             DataFrame avec les colonnes nettoyées
         """
-        print(f"🧹 Nettoyage de {len(df)} tweets...")
+        if verbose:
+            print(f"🧹 Nettoyage de {len(df)} tweets...")
         
         # Créer une copie pour ne pas modifier l'original
         df_cleaned = df.copy()
         
-        # Nettoyer les tweets
-        df_cleaned['text_cleaned'] = df_cleaned[text_column].apply(self.clean_tweet)
+        # Nettoyer les tweets et extraire les features Tesla
+        if verbose:
+            print("🔍 Nettoyage du texte et extraction des features Tesla...")
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
         
-        # Extraire les features Tesla
-        print("🔍 Extraction des features Tesla...")
-        features_list = df_cleaned[text_column].apply(self.extract_tesla_features)
+        if n_jobs > 1 and len(df_cleaned) > 0:
+            processed = self._process_parallel(
+                df_cleaned[text_column], vectorized, n_jobs, chunk_size, verbose
+            )
+        else:
+            processed = self.process_texts(df_cleaned[text_column], vectorized)
         
-        # Ajouter les features au DataFrame
-        df_cleaned['mentions_model'] = [f['mentions_model'] for f in features_list]
-        df_cleaned['mentions_company'] = [f['mentions_company'] for f in features_list]
-        df_cleaned['mentions_elon'] = [f['mentions_elon'] for f in features_list]
-        df_cleaned['mentioned_models'] = [f['mentioned_models'] for f in features_list]
+        for column in processed.columns:
+            df_cleaned[column] = processed[column]
         
         # Supprimer les tweets vides après nettoyage
         initial_count = len(df_cleaned)
         df_cleaned = df_cleaned[df_cleaned['text_cleaned'].str.len() > 0]
         removed_count = initial_count - len(df_cleaned)
         
-        if removed_count > 0:
-            print(f"⚠️  {removed_count} tweets vides supprimés après nettoyage")
-        
-        print(f"✅ Nettoyage terminé : {len(df_cleaned)} tweets valides")
+        if verbose:
+            if removed_count > 0:
+                print(f"⚠️  {removed_count} tweets vides supprimés après nettoyage")
+            
+            print(f"✅ Nettoyage terminé : {len(df_cleaned)} tweets valides")
         
         return df_cleaned
+    
+    def _process_parallel(
+        self,
+        texts: pd.Series,
+        vectorized: bool,
+        n_jobs: int,
+        chunk_size: Optional[int],
+        verbose: bool = True
+    ) -> pd.DataFrame:
+        """
+        Traite une série de textes par chunks dans un pool de processus.
+        
+        Chaque worker construit son preprocessor une seule fois (stopwords,
+        taxonomie compilée) ; les résultats sont réassemblés dans l'ordre
+        d'origine des lignes.
+        """
+        if not chunk_size:
+            chunk_size = max(1, -(-len(texts) // (n_jobs * 4)))
+        
+        chunks = [texts.iloc[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        if verbose:
+            print(f"   ⚡ {len(chunks)} chunks répartis sur {n_jobs} processus")
+        
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(self._options,)
+        ) as executor:
+            results = list(executor.map(_process_chunk, [(chunk, vectorized) for chunk in chunks]))
+        
+        return pd.concat(results)
+
+
+# Preprocessor propre à chaque processus worker (créé une seule fois par worker)
+_worker_preprocessor = None
+
+
+def _init_worker(options: dict):
+    """
+    Initialise le preprocessor d'un processus worker.
+    """
+    global _worker_preprocessor
+    _worker_preprocessor = TeslaTextPreprocessor(**options)
+    # Charger les stopwords une fois pour toutes dans ce worker
+    _worker_preprocessor.stop_words
+
+
+def _process_chunk(args) -> pd.DataFrame:
+    """
+    Traite un chunk de textes dans un processus worker.
+    """
+    texts, vectorized = args
+    return _worker_preprocessor.process_texts(texts, vectorized)
 
 
-def main():
+def preprocess_streaming(
+    preprocessor: TeslaTextPreprocessor,
+    input_file: str,
+    output_file: str,
+    chunk_size: int = 100_000,
+    n_jobs: int = 1
+) -> int:
+    """
+    Prétraite un fichier CSV en streaming, chunk par chunk.
+    
+    La mémoire reste bornée par la taille d'un chunk : chaque chunk est lu,
+    nettoyé puis ajouté au fichier de sortie. Une exécution interrompue reprend
+    après le dernier chunk écrit.
+    
+    Args:
+        preprocessor: Preprocessor à utiliser
+        input_file: Fichier CSV des tweets bruts
+        output_file: Fichier CSV de sortie
+        chunk_size: Nombre de tweets lus par chunk
+        n_jobs: Nombre de processus par chunk (1 = séquentiel, -1 = tous les cœurs)
+        
+    Returns:
+        Nombre de tweets valides écrits lors de cette exécution
+    """
+    print(f"🌊 Mode streaming : chunks de {chunk_size} tweets")
+    
+    chunks = stream_transform(
+        input_file,
+        output_file,
+        lambda chunk: preprocessor.preprocess_dataframe(chunk, n_jobs=n_jobs, verbose=False),
+        chunk_size=chunk_size
+    )
+    
+    # Statistiques calculées au fil de l'eau
+    total = mentions_model = mentions_elon = total_length = 0
+    for chunk in chunks:
+        total += len(chunk)
+        mentions_model += int(chunk['mentions_model'].sum())
+        mentions_elon += int(chunk['mentions_elon'].sum())
+        total_length += int(chunk['text_cleaned'].str.len().sum())
+        print(f"   ✅ {total} tweets valides écrits...")
+    
+    print(f"💾 Données nettoyées sauvegardées dans {output_file}")
+    
+    print(f"\n📈 Statistiques de nettoyage :")
+    print(f"   Tweets mentionnant un modèle : {mentions_model}")
+    print(f"   Tweets mentionnant Elon : {mentions_elon}")
+    if total > 0:
+        print(f"   Longueur moyenne du texte nettoyé : {total_length / total:.1f} caractères")
+    
+    return total
+
+
+def main(
+    input_file: str = "data/tesla_tweets_raw.csv",
+    output_file: str = "data/tesla_tweets_cleaned.csv"
+):
     """
     Fonction principale pour exécuter le prétraitement.
+    
+    Définir STREAM_CHUNK_SIZE (ex. 100000) active le mode streaming, à
+    mémoire constante quelle que soit la taille du fichier.
+    TESLA_STORAGE_FORMAT=parquet lit et écrit des fichiers Parquet (hors
+    mode streaming, qui ajoute des chunks à un CSV).
     """
-    input_file = "data/tesla_tweets_raw.csv"
-    output_file = "data/tesla_tweets_cleaned.csv"
+    stream_chunk_size = int(os.getenv('STREAM_CHUNK_SIZE', '0'))
+    if stream_chunk_size <= 0:
+        input_file, output_file = data_path(input_file), data_path(output_file)
     
     # Vérifier que le fichier d'entrée existe
     if not os.path.exists(input_file):
@@ -241,20 +726,29 @@ def main():
         print("   Veuillez d'abord exécuter collect_tesla_tweets.py")
         return
     
+    # Initialiser le preprocessor (taxonomie personnalisée optionnelle)
+    preprocessor = TeslaTextPreprocessor(
+        language='english',
+        lemmatize=False,
+        taxonomy_file=os.getenv('TESLA_TAXONOMY_FILE')
+    )
+    n_jobs = int(os.getenv('N_JOBS', '1'))
+    
+    # Mode streaming (fichiers volumineux)
+    if stream_chunk_size > 0:
+        preprocess_streaming(preprocessor, input_file, output_file, stream_chunk_size, n_jobs)
+        return
+    
     # Charger les données brutes
     print(f"📂 Chargement des données depuis {input_file}...")
-    df_raw = pd.read_csv(input_file)
+    df_raw = read_table(input_file)
     print(f"   {len(df_raw)} tweets chargés")
     
-    # Initialiser le preprocessor
-    preprocessor = TeslaTextPreprocessor(language='english', lemmatize=False)
-    
     # Nettoyer les données
-    df_cleaned = preprocessor.preprocess_dataframe(df_raw)
+    df_cleaned = preprocessor.preprocess_dataframe(df_raw, n_jobs=n_jobs)
     
     # Sauvegarder
-    os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
-    df_cleaned.to_csv(output_file, index=False, encoding='utf-8')
+    write_table(df_cleaned, output_file)
     print(f"💾 Données nettoyées sauvegardées dans {output_file}")
     
     # Afficher un aperçu
@@ -0,0 +1,119 @@
+"""
+Index temporel des résultats pour les filtres du dashboard
+
+Le jeu de résultats est trié une fois par date de publication (tweets sans
+date à la fin). Un filtre de période devient alors une tranche de lignes,
+trouvée par recherche dichotomique (searchsorted) sur les bornes des jours,
+au lieu d'une comparaison ligne à ligne des dates.
+
+Les masques de sentiment (positive, negative, neutral) sont calculés à la
+première demande puis réutilisés : un filtre combiné ne compare plus que
+les lignes de la tranche.
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _day_start(value: str, tz) -> pd.Timestamp:
+    """
+    Début (minuit) du jour d'une borne de filtre ('2026-10-17', '2026-10-17T12:00'...),
+    dans le fuseau des dates du jeu.
+    """
+    return pd.Timestamp(pd.to_datetime(value).date(), tz=tz)
+
+
+class IndexedResults:
+    """
+    Résultats triés par date, filtrables par période et par sentiment.
+
+    Le DataFrame trié est partagé : les sélections retournent des copies.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: Résultats d'analyse (colonne 'date' typée, voir read_table)
+        """
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+            raise ValueError("La colonne 'date' doit être typée (datetime) pour être indexée")
+
+        if 'date' in df.columns:
+            df = df.sort_values('date', kind='stable', na_position='last', ignore_index=True)
+            self._dates = df['date'].array
+            # Les dates valides occupent les premières lignes, les NaT la fin
+            self._dated_rows = int(df['date'].notna().sum())
+        else:
+            self._dates = None
+            self._dated_rows = 0
+        self.df = df
+        self._masks: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def day_slice(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> slice:
+        """
+        Lignes des jours [start_date, end_date] (bornes incluses).
+
+        Sans borne, toutes les lignes ; avec une borne, les tweets sans date
+        sont exclus.
+        """
+        if not start_date and not end_date:
+            return slice(0, len(self.df))
+        if self._dates is None:
+            raise ValueError("Filtre de période impossible : colonne 'date' absente")
+
+        dates = self._dates[:self._dated_rows]
+        tz = getattr(self.df['date'].dtype, 'tz', None)
+        start = 0
+        end = self._dated_rows
+        if start_date:
+            start = int(dates.searchsorted(_day_start(start_date, tz), side='left'))
+        if end_date:
+            next_day = _day_start(end_date, tz) + pd.Timedelta(days=1)
+            end = int(dates.searchsorted(next_day, side='left'))
+        return slice(start, max(start, end))
+
+    def sentiment_mask(self, sentiment: str) -> np.ndarray:
+        """
+        Masque des lignes d'un sentiment (calculé une fois puis réutilisé).
+        """
+        mask = self._masks.get(sentiment)
+        if mask is None:
+            mask = (self.df['sentiment'] == sentiment).to_numpy(dtype=bool, na_value=False)
+            with self._lock:
+                self._masks[sentiment] = mask
+        return mask
+
+    def select(
+        self,
+        sentiment: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Sélectionne les résultats d'une période et d'un sentiment.
+
+        Args:
+            sentiment: Sentiment retenu (None ou 'all' = tous)
+            start_date: Premier jour inclus (None = pas de borne)
+            end_date: Dernier jour inclus (None = pas de borne)
+            columns: Colonnes retournées (None = toutes ; colonnes absentes ignorées)
+
+        Returns:
+            Copie des lignes retenues, triées par date
+        """
+        rows = self.day_slice(start_date, end_date)
+        if sentiment and sentiment != 'all':
+            rows = np.flatnonzero(self.sentiment_mask(sentiment)[rows]) + rows.start
+
+        if columns is None:
+            return self.df.iloc[rows].copy(deep=False)
+        positions = [self.df.columns.get_loc(column) for column in columns if column in self.df.columns]
+        return self.df.iloc[rows, positions]
@@ -0,0 +1,603 @@
+"""
+Base embarquée des résultats d'analyse (SQLite indexé)
+
+Les dashboards relisaient le fichier de résultats complet à chaque requête :
+chaque filtre était un parcours intégral. Cette base conserve les colonnes
+utiles aux dashboards, avec des index couvrants :
+- (date, sentiment, polarity) : filtres de période sur les tweets ;
+- (sentiment, polarity, date) : filtre de sentiment seul et tweets les plus
+  négatifs (LIMIT n sur l'index).
+
+Les agrégats des dashboards (comptages, polarité moyenne, histogramme par
+jour) sont lus dans une table de cumuls par heure, sentiment et mentions
+(modèle, Elon) : nombre de tweets, somme et somme des carrés des polarités.
+Les cumuls sont mis à jour dans la même transaction que les tweets ; une
+période de quelques mois tient en quelques milliers de lignes, quelle que
+soit la taille de l'historique. Les polarités (score compound VADER, arrondi
+à 4 décimales) y sont sommées en entiers (polarité x 10 000) : les sommes
+sont exactes et le remplacement d'un tweet déjà stocké n'accumule aucune
+erreur d'arrondi.
+
+Les mots des tweets négatifs (WordCloud) sont comptés par jour dans une
+table de fréquences, elle aussi mise à jour à chaque écriture : un WordCloud
+se construit à partir de quelques milliers de comptes, sans relire les
+textes. Un numéro de version, incrémenté à chaque écriture, permet aux
+dashboards de garder en cache ce qu'ils en dérivent.
+
+Les dates sont stockées en secondes UTC depuis l'epoch, les heures et jours
+UTC s'obtiennent donc par division entière. L'analyse écrit dans la base
+après le fichier de résultats (upsert sur l'id du tweet : une analyse
+relancée ou reprise remplace les lignes existantes).
+"""
+
+import os
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .token_counts import tokenize
+except ImportError:
+    from token_counts import tokenize
+
+# Base utilisée par l'analyse et les dashboards (RESULTS_DB_PATH vide = désactivée)
+DEFAULT_RESULTS_DB_PATH = "data/tesla_sentiment_results.db"
+
+# Colonnes stockées (type SQLite de chaque colonne)
+RESULT_COLUMNS = {
+    'id': 'INTEGER PRIMARY KEY',
+    'date': 'INTEGER',
+    'sentiment': 'TEXT',
+    'polarity': 'REAL',
+    'vader_compound': 'REAL',
+    'vader_neg': 'REAL',
+    'text': 'TEXT',
+    'text_cleaned': 'TEXT',
+    'user': 'TEXT',
+    'likes': 'INTEGER',
+    'retweets': 'INTEGER',
+    'mentions_model': 'INTEGER',
+    'mentions_elon': 'INTEGER'
+}
+
+# Colonnes renvoyées pour les tweets les plus négatifs
+TWEET_COLUMNS = ['id', 'date', 'text', 'text_cleaned', 'user', 'likes', 'retweets',
+                 'sentiment', 'polarity', 'vader_compound']
+
+# Facteur des polarités stockées en entiers dans les cumuls (4 décimales)
+POLARITY_SCALE = 10_000
+
+# Heure des cumuls des tweets sans date (hors de toute période filtrée)
+NO_DATE_HOUR = -(2 ** 40)
+
+# Jour des fréquences de mots des tweets sans date (hors de toute période filtrée)
+NO_DATE_DAY = -(2 ** 40)
+
+# Sentiment des tweets dont les mots sont comptés (WordCloud des tweets négatifs)
+TOKEN_SENTIMENT = 'negative'
+
+# Nombre de lignes par transaction d'écriture
+_WRITE_BATCH_SIZE = 50_000
+
+# Nombre maximal de paramètres par requête SQLite
+_PARAMS_BATCH_SIZE = 500
+
+_SECONDS_PER_HOUR = 3600
+_HOURS_PER_DAY = 24
+_SECONDS_PER_DAY = _SECONDS_PER_HOUR * _HOURS_PER_DAY
+
+# Colonnes des tweets utilisées par les cumuls
+_ROLLUP_SOURCE_COLUMNS = ['date', 'sentiment', 'polarity', 'mentions_model', 'mentions_elon']
+
+# Colonnes des tweets utilisées par les fréquences de mots
+_TOKEN_SOURCE_COLUMNS = ['date', 'sentiment', 'text_cleaned', 'text']
+
+
+def get_results_db_path() -> Optional[str]:
+    """
+    Retourne le chemin de la base des résultats (variable RESULTS_DB_PATH),
+    ou None si elle est désactivée (RESULTS_DB_PATH vide).
+    """
+    return os.getenv('RESULTS_DB_PATH', DEFAULT_RESULTS_DB_PATH) or None
+
+
+def _day_bounds(start_date: Optional[str], end_date: Optional[str]):
+    """
+    Convertit un filtre de jours (inclusifs) en bornes [début, fin[ en secondes UTC.
+    """
+    start = end = None
+    if start_date:
+        start = int(pd.Timestamp(pd.to_datetime(start_date).date(), tz='UTC').timestamp())
+    if end_date:
+        end = int(pd.Timestamp(pd.to_datetime(end_date).date(), tz='UTC').timestamp()) + _SECONDS_PER_DAY
+    return start, end
+
+
+def _format_date(seconds) -> Optional[str]:
+    """
+    Formate une date stockée comme les dashboards (str d'un Timestamp UTC).
+    """
+    if seconds is None:
+        return None
+    return str(pd.Timestamp(int(seconds), unit='s', tz='UTC'))
+
+
+def _fixed_polarity(polarity: float) -> int:
+    """
+    Polarité en entier (x POLARITY_SCALE), arrondie comme ROUND de SQLite.
+    """
+    scaled = polarity * POLARITY_SCALE
+    return int(scaled + 0.5) if scaled >= 0 else int(scaled - 0.5)
+
+
+def _accumulate(rows: Iterable[tuple], sign: int, totals: Dict[tuple, List[int]]):
+    """
+    Ajoute (sign = 1) ou retire (sign = -1) des tweets aux cumuls.
+
+    Args:
+        rows: Tuples (date, sentiment, polarity, mentions_model, mentions_elon)
+        sign: Sens de la mise à jour
+        totals: Cumuls (heure, sentiment, modèle, elon) -> [n, n polarité, somme, somme des carrés]
+    """
+    for date, sentiment, polarity, mentions_model, mentions_elon in rows:
+        key = (
+            date // _SECONDS_PER_HOUR if date is not None else NO_DATE_HOUR,
+            sentiment or '',
+            int(bool(mentions_model)),
+            int(bool(mentions_elon))
+        )
+        entry = totals.get(key)
+        if entry is None:
+            entry = totals[key] = [0, 0, 0, 0]
+        entry[0] += sign
+        if polarity is not None and polarity == polarity:
+            fixed = _fixed_polarity(polarity)
+            entry[1] += sign
+            entry[2] += sign * fixed
+            entry[3] += sign * fixed * fixed
+
+
+def _accumulate_tokens(rows: Iterable[tuple], sign: int, deltas: Counter):
+    """
+    Ajoute (sign=1) ou retire (sign=-1) les mots de tweets aux fréquences par jour.
+
+    Args:
+        rows: Tuples (date, sentiment, text_cleaned, text)
+        sign: Sens de la mise à jour
+        deltas: Fréquences (jour, mot) -> variation
+    """
+    for date, sentiment, text_cleaned, text in rows:
+        if sentiment != TOKEN_SENTIMENT:
+            continue
+        content = text_cleaned if text_cleaned is not None else text
+        if content is None:
+            continue
+        day = date // _SECONDS_PER_DAY if date is not None else NO_DATE_DAY
+        for word in tokenize(str(content)):
+            deltas[(day, word)] += sign
+
+
+class ResultsStore:
+    """
+    Résultats d'analyse dans SQLite, interrogés par requêtes indexées.
+
+    La connexion peut être partagée entre threads (accès sérialisés).
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULTS_DB_PATH, readonly: bool = False):
+        """
+        Ouvre (ou crée) la base.
+
+        Args:
+            path: Chemin du fichier SQLite
+            readonly: Ouverture en lecture seule (la base doit exister)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        if readonly:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Base de résultats introuvable : {path}")
+            self.connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            # Base créée avant les cumuls : agrégats calculés sur les tweets
+            self.use_rollups = self._has_table('rollups')
+            self.use_token_counts = self._has_table('token_counts')
+            return
+
+        os.makedirs(os.path.dirname(path) if os.path.dirname(path) else '.', exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # Cache de pages de 128 Mo : les index sur date et polarité sont mis à jour en ordre aléatoire
+        self.connection.execute("PRAGMA cache_size=-131072")
+
+        columns = ', '.join(f'"{column}" {column_type}' for column, column_type in RESULT_COLUMNS.items())
+        self.connection.execute(f"CREATE TABLE IF NOT EXISTS results ({columns})")
+        # Base créée par une version précédente : ajouter les colonnes manquantes
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(results)")}
+        for column, column_type in RESULT_COLUMNS.items():
+            if column not in existing:
+                self.connection.execute(f'ALTER TABLE results ADD COLUMN "{column}" {column_type}')
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_date ON results (date, sentiment, polarity)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_sentiment ON results (sentiment, polarity, date)"
+        )
+
+        rollups_exist = self._has_table('rollups')
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS rollups ("
+            "hour INTEGER NOT NULL, sentiment TEXT NOT NULL, "
+            "mentions_model INTEGER NOT NULL, mentions_elon INTEGER NOT NULL, "
+            "count INTEGER NOT NULL, polarity_count INTEGER NOT NULL, "
+            "polarity_sum INTEGER NOT NULL, polarity_sumsq INTEGER NOT NULL, "
+            "PRIMARY KEY (hour, sentiment, mentions_model, mentions_elon))"
+        )
+        token_counts_exist = self._has_table('token_counts')
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS token_counts ("
+            "day INTEGER NOT NULL, token TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (day, token)) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+        self.use_rollups = True
+        self.use_token_counts = True
+        if not rollups_exist:
+            self.rebuild_rollups()
+        if not token_counts_exist:
+            self.rebuild_token_counts()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _has_table(self, name: str) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone() is not None
+
+    def write(self, df: pd.DataFrame) -> int:
+        """
+        Enregistre des tweets analysés (upsert sur l'id) et met à jour les
+        cumuls, les fréquences de mots et la version des données.
+
+        Args:
+            df: DataFrame de l'analyse (colonnes absentes stockées à NULL)
+
+        Returns:
+            Nombre de lignes écrites
+        """
+        if 'id' not in df.columns and len(df) > 0:
+            raise ValueError("La colonne 'id' est requise pour la base de résultats")
+
+        placeholders = ', '.join('?' * len(RESULT_COLUMNS))
+        names = ', '.join(f'"{column}"' for column in RESULT_COLUMNS)
+        source = [list(RESULT_COLUMNS).index(column) for column in _ROLLUP_SOURCE_COLUMNS]
+        token_source = [list(RESULT_COLUMNS).index(column) for column in _TOKEN_SOURCE_COLUMNS]
+        rollup_width = len(_ROLLUP_SOURCE_COLUMNS)
+        with self._lock:
+            # Lignes converties lot par lot (mémoire bornée), une transaction par lot
+            for i in range(0, len(df), _WRITE_BATCH_SIZE):
+                rows = self._rows(df.iloc[i:i + _WRITE_BATCH_SIZE])
+                # Un id répété dans le lot : seule sa dernière version est conservée
+                rows = list({row[0]: row for row in rows}.values())
+
+                # Cumuls et mots : retirer les versions remplacées, ajouter les nouvelles
+                stored = self._stored_sources([row[0] for row in rows])
+                totals = {}
+                _accumulate((row[:rollup_width] for row in stored), -1, totals)
+                _accumulate(([row[j] for j in source] for row in rows), 1, totals)
+                tokens = Counter()
+                _accumulate_tokens(((row[0], row[1]) + row[rollup_width:] for row in stored), -1, tokens)
+                _accumulate_tokens(([row[j] for j in token_source] for row in rows), 1, tokens)
+
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO results ({names}) VALUES ({placeholders})",
+                    rows
+                )
+                self._update_rollups(totals)
+                self._update_token_counts(tokens)
+                self._bump_version()
+                self.connection.commit()
+        return len(df)
+
+    @staticmethod
+    def _rows(df: pd.DataFrame) -> List[tuple]:
+        """
+        Convertit un lot de tweets en lignes SQLite (dates en secondes UTC).
+        """
+        values = {}
+        for column in RESULT_COLUMNS:
+            if column not in df.columns:
+                values[column] = [None] * len(df)
+            elif column == 'id':
+                values[column] = df['id'].astype('int64').tolist()
+            elif column == 'date':
+                dates = pd.to_datetime(df['date'], utc=True, format='ISO8601').astype('datetime64[s, UTC]')
+                seconds = dates.astype('int64').astype(object)
+                seconds[dates.isna().to_numpy()] = None
+                values[column] = seconds.tolist()
+            else:
+                series = df[column].astype(object)
+                values[column] = series.where(series.notna(), None).tolist()
+        return list(zip(*values.values()))
+
+    def _stored_sources(self, ids: List[int]) -> List[tuple]:
+        """
+        Colonnes des cumuls, puis textes (text_cleaned, text), des tweets
+        déjà stockés parmi ids.
+        """
+        names = ', '.join(f'"{column}"' for column in _ROLLUP_SOURCE_COLUMNS + ['text_cleaned', 'text'])
+        rows = []
+        for i in range(0, len(ids), _PARAMS_BATCH_SIZE):
+            batch = ids[i:i + _PARAMS_BATCH_SIZE]
+            rows += self.connection.execute(
+                f"SELECT {names} FROM results WHERE id IN ({', '.join('?' * len(batch))})", batch
+            ).fetchall()
+        return rows
+
+    def _update_rollups(self, totals: Dict[tuple, List[int]]):
+        """
+        Applique des variations aux cumuls (dans la transaction en cours).
+        """
+        self.connection.executemany(
+            "INSERT INTO rollups (hour, sentiment, mentions_model, mentions_elon, "
+            "count, polarity_count, polarity_sum, polarity_sumsq) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (hour, sentiment, mentions_model, mentions_elon) DO UPDATE SET "
+            "count = count + excluded.count, "
+            "polarity_count = polarity_count + excluded.polarity_count, "
+            "polarity_sum = polarity_sum + excluded.polarity_sum, "
+            "polarity_sumsq = polarity_sumsq + excluded.polarity_sumsq",
+            [key + tuple(entry) for key, entry in totals.items() if any(entry)]
+        )
+        self.connection.execute("DELETE FROM rollups WHERE count = 0")
+
+    def _update_token_counts(self, deltas: Counter):
+        """
+        Applique des variations aux fréquences de mots (dans la transaction en cours).
+        """
+        self.connection.executemany(
+            "INSERT INTO token_counts (day, token, count) VALUES (?, ?, ?) "
+            "ON CONFLICT (day, token) DO UPDATE SET count = count + excluded.count",
+            [key + (delta,) for key, delta in deltas.items() if delta]
+        )
+        # Seuls les mots dont le compte a baissé peuvent tomber à zéro
+        self.connection.executemany(
+            "DELETE FROM token_counts WHERE day = ? AND token = ? AND count <= 0",
+            [key for key, delta in deltas.items() if delta < 0]
+        )
+
+    def _bump_version(self):
+        """
+        Incrémente la version des données (dans la transaction en cours).
+        """
+        self.connection.execute(
+            "INSERT INTO metadata (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def data_version(self) -> int:
+        """
+        Retourne la version des données, incrémentée à chaque écriture
+        (0 pour une base créée par une version antérieure).
+        """
+        if not self._has_table('metadata'):
+            return 0
+        row = self._query("SELECT value FROM metadata WHERE key = 'version'")
+        return row[0][0] if row else 0
+
+    def rebuild_token_counts(self):
+        """
+        Recalcule les fréquences de mots à partir des tweets stockés.
+        """
+        names = ', '.join(f'"{column}"' for column in _TOKEN_SOURCE_COLUMNS)
+        with self._lock:
+            self.connection.execute("DELETE FROM token_counts")
+            cursor = self.connection.execute(
+                f"SELECT {names} FROM results WHERE sentiment = ?", (TOKEN_SENTIMENT,)
+            )
+            tokens = Counter()
+            while True:
+                rows = cursor.fetchmany(_WRITE_BATCH_SIZE)
+                if not rows:
+                    break
+                _accumulate_tokens(rows, 1, tokens)
+            self._update_token_counts(tokens)
+            self._bump_version()
+            self.connection.commit()
+
+    def rebuild_rollups(self):
+        """
+        Recalcule les cumuls à partir des tweets stockés.
+        """
+        fixed = f"CAST(ROUND(polarity * {POLARITY_SCALE}) AS INTEGER)"
+        with self._lock:
+            self.connection.execute("DELETE FROM rollups")
+            self.connection.execute(
+                f"INSERT INTO rollups SELECT "
+                f"COALESCE(date / {_SECONDS_PER_HOUR}, {NO_DATE_HOUR}), COALESCE(sentiment, ''), "
+                f"COALESCE(mentions_model, 0) != 0, COALESCE(mentions_elon, 0) != 0, "
+                f"COUNT(*), COUNT(polarity), COALESCE(SUM({fixed}), 0), COALESCE(SUM({fixed} * {fixed}), 0) "
+                f"FROM results GROUP BY 1, 2, 3, 4"
+            )
+            self.connection.commit()
+
+    def _where(
+        self,
+        sentiment: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        mentions_model: Optional[bool] = None,
+        mentions_elon: Optional[bool] = None
+    ) -> Tuple[str, list]:
+        """
+        Construit la clause WHERE des filtres des dashboards, sur les cumuls
+        (heures) ou sur les tweets (secondes).
+        """
+        clauses, params = [], []
+        if sentiment and sentiment != 'all':
+            clauses.append("sentiment = ?")
+            params.append(sentiment)
+        for column, flag in (('mentions_model', mentions_model), ('mentions_elon', mentions_elon)):
+            if flag is not None:
+                clauses.append(f"COALESCE({column}, 0) = ?" if not self.use_rollups else f"{column} = ?")
+                params.append(int(flag))
+
+        start, end = _day_bounds(start_date, end_date)
+        time_column, unit = ('hour', _SECONDS_PER_HOUR) if self.use_rollups else ('date', 1)
+        if self.use_rollups and (start is not None or end is not None):
+            # Comme pour les tweets (date NULL), les tweets sans date sont hors période
+            clauses.append(f"hour != {NO_DATE_HOUR}")
+        if start is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(start // unit)
+        if end is not None:
+            clauses.append(f"{time_column} < ?")
+            params.append(end // unit)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def sentiment_counts(
+        self,
+        sentiment: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        mentions_model: Optional[bool] = None,
+        mentions_elon: Optional[bool] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Compte les tweets et somme leurs polarités par sentiment.
+
+        Args:
+            sentiment: Sentiment retenu (None ou 'all' = tous)
+            start_date: Premier jour inclus
+            end_date: Dernier jour inclus
+            mentions_model: Tweets mentionnant (True) ou non (False) un modèle
+            mentions_elon: Tweets mentionnant (True) ou non (False) Elon Musk
+
+        Returns:
+            Dictionnaire sentiment -> {'count', 'polarity_count', 'polarity_sum', 'polarity_sumsq'}
+        """
+        where, params = self._where(sentiment, start_date, end_date, mentions_model, mentions_elon)
+        if self.use_rollups:
+            rows = self._query(
+                f"SELECT sentiment, SUM(count), SUM(polarity_count), SUM(polarity_sum), SUM(polarity_sumsq) "
+                f"FROM rollups{where} GROUP BY sentiment",
+                params
+            )
+            return {
+                row[0]: {
+                    'count': row[1],
+                    'polarity_count': row[2],
+                    'polarity_sum': row[3] / POLARITY_SCALE,
+                    'polarity_sumsq': row[4] / POLARITY_SCALE ** 2
+                }
+                for row in rows
+            }
+
+        rows = self._query(
+            f"SELECT sentiment, COUNT(*), COUNT(polarity), TOTAL(polarity), TOTAL(polarity * polarity) "
+            f"FROM results{where} GROUP BY sentiment",
+            params
+        )
+        return {
+            row[0]: {'count': row[1], 'polarity_count': row[2], 'polarity_sum': row[3], 'polarity_sumsq': row[4]}
+            for row in rows
+        }
+
+    def daily_counts(
+        self,
+        sentiment: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        mentions_model: Optional[bool] = None,
+        mentions_elon: Optional[bool] = None
+    ) -> List[Dict]:
+        """
+        Compte les tweets par jour UTC (filtres de sentiment_counts).
+
+        Returns:
+            Liste de {'date_only': 'AAAA-MM-JJ', 'count'} triée par jour
+        """
+        where, params = self._where(sentiment, start_date, end_date, mentions_model, mentions_elon)
+        if self.use_rollups:
+            where = (where + " AND" if where else " WHERE") + f" hour != {NO_DATE_HOUR}"
+            sql = f"SELECT hour / {_HOURS_PER_DAY} AS day, SUM(count) FROM rollups{where} GROUP BY day ORDER BY day"
+        else:
+            sql = f"SELECT date / {_SECONDS_PER_DAY} AS day, COUNT(*) FROM results{where} GROUP BY day ORDER BY day"
+        rows = [row for row in self._query(sql, params) if row[0] is not None]
+
+        days = pd.to_datetime(np.array([row[0] for row in rows], dtype=np.int64), unit='D')
+        return [
+            {'date_only': day.strftime('%Y-%m-%d'), 'count': row[1]}
+            for day, row in zip(days, rows)
+        ]
+
+    def token_frequencies(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, int]:
+        """
+        Retourne les fréquences des mots des tweets négatifs publiés entre
+        start_date et end_date (jours inclus, None = pas de borne).
+        """
+        clauses, params = [], []
+        start, end = _day_bounds(start_date, end_date)
+        if start is not None or end is not None:
+            clauses.append(f"day != {NO_DATE_DAY}")
+        if start is not None:
+            clauses.append("day >= ?")
+            params.append(start // _SECONDS_PER_DAY)
+        if end is not None:
+            clauses.append("day < ?")
+            params.append(end // _SECONDS_PER_DAY)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return dict(self._query(f"SELECT token, SUM(count) FROM token_counts{where} GROUP BY token", params))
+
+    def top_negative(
+        self,
+        n: int = 5,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Retourne les n tweets négatifs de plus faible polarité, publiés entre
+        start_date et end_date (jours inclus, None = pas de borne).
+        """
+        clauses, params = ["sentiment = 'negative'"], []
+        start, end = _day_bounds(start_date, end_date)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date < ?")
+            params.append(end)
+        
+        names = ', '.join(f'"{column}"' for column in TWEET_COLUMNS)
+        rows = self._query(
+            f"SELECT {names} FROM results WHERE {' AND '.join(clauses)} ORDER BY polarity LIMIT ?",
+            (*params, int(n))
+        )
+        tweets = [dict(zip(TWEET_COLUMNS, row)) for row in rows]
+        for tweet in tweets:
+            tweet['date'] = _format_date(tweet['date'])
+        return tweets
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM results")[0][0]
+
+    def close(self):
+        """
+        Ferme la connexion SQLite.
+        """
+        self.connection.close()
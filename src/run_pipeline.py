@@ -0,0 +1,429 @@
+"""
+Pipeline de bout en bout : collecte → nettoyage → analyse de sentiment
+
+Au lieu d'enchaîner trois scripts qui se passent des fichiers CSV complets,
+les étapes tournent en même temps dans des threads reliés par des files
+bornées :
+- la collecte dépose chaque page sauvegardée dans la file du nettoyage ;
+- le nettoyage, l'analyse et l'écriture des résultats traitent des micro-lots
+  (taille maximale ou délai d'attente maximal atteint) ;
+- une file pleine bloque l'étape précédente (backpressure) : la mémoire reste
+  bornée même si l'analyse est plus lente que la collecte.
+
+Les tweets analysés sont ajoutés au fichier de résultats quelques secondes
+après leur collecte. La profondeur des files et la latence de chaque étape
+sont affichées périodiquement, puis résumées en fin d'exécution.
+
+Usage :
+    python src/run_pipeline.py
+    TWITTER_REPLAY_DIR=data/replay MAX_TWEETS=20000 python src/run_pipeline.py
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .analyze_tesla_sentiment import TeslaSentimentAnalyzer
+    from .collect_tesla_tweets import TWEET_COLUMNS, TeslaTweetCollector, create_collector
+    from .partitioned_results import PartitionedResults, get_results_partition_dir
+    from .preprocess_tesla import TeslaTextPreprocessor
+    from .results_store import ResultsStore, get_results_db_path
+except ImportError:
+    from analyze_tesla_sentiment import TeslaSentimentAnalyzer
+    from collect_tesla_tweets import TWEET_COLUMNS, TeslaTweetCollector, create_collector
+    from partitioned_results import PartitionedResults, get_results_partition_dir
+    from preprocess_tesla import TeslaTextPreprocessor
+    from results_store import ResultsStore, get_results_db_path
+
+# Étapes du pipeline, dans l'ordre
+STAGES = ('collecte', 'nettoyage', 'analyse', 'écriture')
+
+# Colonne interne : instant de collecte de chaque tweet (latence de bout en bout)
+FETCHED_AT_COLUMN = '_fetched_at'
+
+# Marqueur de fin de flux transmis d'une étape à la suivante
+_END = object()
+
+
+class PipelineStopped(Exception):
+    """
+    Levée dans une étape lorsque le pipeline est arrêté par une autre étape.
+    """
+
+
+class StageMetrics:
+    """
+    Compteurs d'une étape : volume traité, temps de traitement, profondeur de
+    sa file d'entrée, attente due à la backpressure et latence de bout en bout
+    (de la collecte d'un tweet à sa sortie de l'étape).
+    """
+
+    def __init__(self, name: str, inbox: Optional[queue.Queue] = None):
+        self.name = name
+        self.inbox = inbox
+        self.tweets = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self.blocked_time = 0.0
+        self.max_depth = 0
+        self._depth_sum = 0
+        self._depth_samples = 0
+        self._latencies = []
+        self._lock = threading.Lock()
+
+    def sample_queue(self):
+        """
+        Relève la profondeur de la file d'entrée.
+        """
+        if self.inbox is None:
+            return
+        depth = self.inbox.qsize()
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_sum += depth
+            self._depth_samples += 1
+
+    def record(self, df: pd.DataFrame, busy_time: float):
+        """
+        Comptabilise un lot sorti de l'étape.
+        """
+        latencies = time.time() - df[FETCHED_AT_COLUMN].to_numpy(dtype=float)
+        with self._lock:
+            self.tweets += len(df)
+            self.batches += 1
+            self.busy_time += busy_time
+            self._latencies.append(latencies)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs de l'étape (latences en secondes).
+        """
+        with self._lock:
+            latencies = np.concatenate(self._latencies) if self._latencies else np.zeros(0)
+            return {
+                'tweets': self.tweets,
+                'batches': self.batches,
+                'batch_time': self.busy_time / self.batches if self.batches else 0.0,
+                'blocked_time': self.blocked_time,
+                'queue_depth': self.inbox.qsize() if self.inbox is not None else 0,
+                'max_queue_depth': self.max_depth,
+                'mean_queue_depth': self._depth_sum / self._depth_samples if self._depth_samples else 0.0,
+                'latency_p50': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+                'latency_p95': float(np.percentile(latencies, 95)) if len(latencies) else 0.0
+            }
+
+
+class TeslaPipeline:
+    """
+    Collecte, nettoie et analyse les tweets en flux continu.
+    """
+
+    def __init__(
+        self,
+        collector: TeslaTweetCollector,
+        preprocessor: TeslaTextPreprocessor,
+        analyzer: TeslaSentimentAnalyzer,
+        output_file: str = "data/tesla_sentiment_results.csv",
+        batch_size: int = 500,
+        batch_timeout: float = 1.0,
+        queue_size: int = 8,
+        report_interval: float = 5.0,
+        results_db_path: Optional[str] = None,
+        results_partition_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            collector: Collecteur de tweets
+            preprocessor: Preprocessor du nettoyage
+            analyzer: Analyseur de sentiment
+            output_file: Fichier CSV des résultats (les lots y sont ajoutés)
+            batch_size: Nombre maximal de tweets par micro-lot
+            batch_timeout: Délai maximal (secondes) pour compléter un micro-lot
+            queue_size: Nombre maximal de lots en attente entre deux étapes
+            report_interval: Intervalle (secondes) entre deux affichages des
+                métriques (0 = pas d'affichage en cours d'exécution)
+            results_db_path: Base des résultats des dashboards, alimentée lot
+                par lot (None = fichier de résultats seul)
+            results_partition_dir: Répertoire des partitions par jour,
+                alimentées lot par lot (None = pas de partitions)
+        """
+        if batch_size < 1 or queue_size < 1:
+            raise ValueError("batch_size et queue_size doivent être positifs")
+
+        self.collector = collector
+        self.preprocessor = preprocessor
+        self.analyzer = analyzer
+        self.output_file = output_file
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.results_db_path = results_db_path
+        self.results_partition_dir = results_partition_dir
+
+    def _put(self, outbox: queue.Queue, item, metrics: StageMetrics):
+        """
+        Dépose un lot dans la file suivante, en attendant qu'elle ait de la place.
+        """
+        start = time.perf_counter()
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped("Pipeline arrêté par l'échec d'une autre étape")
+            try:
+                outbox.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        metrics.blocked_time += time.perf_counter() - start
+
+    def _get(self, inbox: queue.Queue, timeout: Optional[float]):
+        """
+        Retire un lot de la file d'entrée (None si le délai est écoulé).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped("Pipeline arrêté par l'échec d'une autre étape")
+            wait = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if wait <= 0:
+                return None
+            try:
+                return inbox.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _next_batch(self, inbox: queue.Queue, metrics: StageMetrics) -> Tuple[List[pd.DataFrame], bool]:
+        """
+        Constitue un micro-lot : attend un premier lot, puis complète jusqu'à
+        batch_size tweets ou jusqu'à l'expiration de batch_timeout.
+
+        Returns:
+            (lots reçus, fin du flux atteinte)
+        """
+        item = self._get(inbox, None)
+        metrics.sample_queue()
+        if item is _END:
+            return [], True
+
+        frames = [item]
+        count = len(item)
+        deadline = time.monotonic() + self.batch_timeout
+        while count < self.batch_size:
+            item = self._get(inbox, deadline - time.monotonic())
+            if item is None:
+                break
+            if item is _END:
+                return frames, True
+            frames.append(item)
+            count += len(item)
+        return frames, False
+
+    def _run_stage(
+        self,
+        metrics: StageMetrics,
+        process: Callable[[pd.DataFrame], pd.DataFrame],
+        outbox: Optional[queue.Queue],
+        next_metrics: Optional[StageMetrics]
+    ):
+        """
+        Boucle d'une étape : micro-lot, traitement, dépôt dans la file suivante.
+        """
+        finished = False
+        while not finished:
+            frames, finished = self._next_batch(metrics.inbox, metrics)
+            if not frames:
+                continue
+
+            start = time.perf_counter()
+            df = process(pd.concat(frames, ignore_index=True))
+            metrics.record(df, time.perf_counter() - start)
+
+            if outbox is not None and len(df) > 0:
+                self._put(outbox, df, metrics)
+                next_metrics.sample_queue()
+
+        if outbox is not None:
+            self._put(outbox, _END, metrics)
+
+    def _write_results(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajoute un lot de tweets analysés au fichier de résultats (append + fsync).
+        """
+        results = df.drop(columns=[FETCHED_AT_COLUMN])
+        if self._columns is None:
+            self._columns = list(results.columns)
+
+        write_header = not os.path.exists(self.output_file) or os.path.getsize(self.output_file) == 0
+        with open(self.output_file, 'a', encoding='utf-8', newline='') as f:
+            results.reindex(columns=self._columns).to_csv(f, index=False, header=write_header)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._results_store is not None:
+            self._results_store.write(results)
+        if self._partitions is not None:
+            self._partitions.append(results)
+        return df
+
+    def _report(self):
+        """
+        Affiche périodiquement l'avancement et la profondeur des files.
+        """
+        while not self._done.wait(self.report_interval):
+            parts = []
+            for name in STAGES:
+                summary = self.metrics[name].summary()
+                parts.append(f"{name} {summary['tweets']} (file {summary['queue_depth']}/{self.queue_size})")
+            print("📊 " + " | ".join(parts))
+
+    def run(self, max_tweets: int = 500, raw_file: str = "data/tesla_tweets_raw.csv") -> Dict[str, Dict]:
+        """
+        Exécute le pipeline jusqu'à la fin de la collecte.
+
+        Args:
+            max_tweets: Nombre maximum de tweets à collecter
+            raw_file: Fichier des tweets bruts (sauvegarde de la collecte)
+
+        Returns:
+            Métriques de chaque étape (voir StageMetrics.summary)
+        """
+        print(f"🚀 Pipeline : collecte de {max_tweets} tweets, micro-lots de {self.batch_size} "
+              f"tweets ({self.batch_timeout:.1f}s max), files de {self.queue_size} lots")
+
+        os.makedirs(os.path.dirname(self.output_file) if os.path.dirname(self.output_file) else '.', exist_ok=True)
+        self._columns = None
+        if os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0:
+            # Ajout à un fichier de résultats existant : conserver ses colonnes
+            self._columns = list(pd.read_csv(self.output_file, nrows=0).columns)
+
+        self._results_store = ResultsStore(self.results_db_path) if self.results_db_path else None
+        self._partitions = PartitionedResults(self.results_partition_dir) if self.results_partition_dir else None
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._errors = []
+
+        queues = {name: queue.Queue(maxsize=self.queue_size) for name in STAGES[1:]}
+        self.metrics = {name: StageMetrics(name, queues.get(name)) for name in STAGES}
+
+        def on_page(tweets: List[Dict]):
+            df = pd.DataFrame(tweets)
+            if df['user'].isna().any():
+                # Auteurs absents de l'expansion includes.users (cache, puis GET /2/users)
+                df = self.collector._add_usernames(df)
+            df = df.reindex(columns=TWEET_COLUMNS)
+            df[FETCHED_AT_COLUMN] = time.time()
+            self.metrics['collecte'].record(df, 0.0)
+            self._put(queues['nettoyage'], df, self.metrics['collecte'])
+            self.metrics['nettoyage'].sample_queue()
+
+        def collect():
+            self.collector.collect_tweets(max_tweets, raw_file, on_page=on_page)
+            self._put(queues['nettoyage'], _END, self.metrics['collecte'])
+
+        stages = {
+            'collecte': collect,
+            'nettoyage': lambda: self._run_stage(
+                self.metrics['nettoyage'],
+                lambda df: self.preprocessor.preprocess_dataframe(df, verbose=False),
+                queues['analyse'], self.metrics['analyse']
+            ),
+            'analyse': lambda: self._run_stage(
+                self.metrics['analyse'],
+                lambda df: self.analyzer.analyze_dataframe(df, verbose=False),
+                queues['écriture'], self.metrics['écriture']
+            ),
+            'écriture': lambda: self._run_stage(self.metrics['écriture'], self._write_results, None, None)
+        }
+
+        def run_stage(target: Callable[[], None]):
+            try:
+                target()
+            except PipelineStopped:
+                pass
+            except BaseException as e:
+                # Arrêter les autres étapes (elles ne bloquent plus sur leurs files)
+                self._errors.append(e)
+                self._stop.set()
+
+        threads = [
+            threading.Thread(target=run_stage, args=(target,), name=f"pipeline-{name}", daemon=True)
+            for name, target in stages.items()
+        ]
+        reporter = threading.Thread(target=self._report, daemon=True) if self.report_interval > 0 else None
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        if reporter is not None:
+            reporter.start()
+        for thread in threads:
+            thread.join()
+        self._done.set()
+        if self._results_store is not None:
+            self._results_store.close()
+
+        if self._errors:
+            raise self._errors[0]
+
+        elapsed = time.perf_counter() - start
+        summaries = {name: self.metrics[name].summary() for name in STAGES}
+        written = summaries['écriture']['tweets']
+        print(f"✅ Pipeline terminé : {written} tweets analysés en {elapsed:.1f}s "
+              f"({written / elapsed if elapsed else 0:.0f} tweets/s)")
+        print_metrics(summaries)
+        print(f"💾 Résultats ajoutés à {self.output_file}")
+        return summaries
+
+
+def print_metrics(summaries: Dict[str, Dict]):
+    """
+    Affiche le tableau des métriques par étape.
+    """
+    print(f"\n{'Étape':<10} | {'Tweets':>7} | {'Lots':>5} | {'Temps/lot':>9} | {'File max':>8} | "
+          f"{'File moy.':>9} | {'Bloquée':>8} | {'Latence p50':>11} | {'p95':>7}")
+    print("-" * 98)
+    for name, summary in summaries.items():
+        print(f"{name:<10} | {summary['tweets']:>7} | {summary['batches']:>5} | "
+              f"{summary['batch_time'] * 1000:>7.1f}ms | {summary['max_queue_depth']:>8} | "
+              f"{summary['mean_queue_depth']:>9.1f} | {summary['blocked_time']:>7.2f}s | "
+              f"{summary['latency_p50']:>10.2f}s | {summary['latency_p95']:>6.2f}s")
+
+
+def main():
+    """
+    Fonction principale : exécute le pipeline configuré par l'environnement.
+    """
+    collector = create_collector()
+    if collector is None:
+        return
+
+    preprocessor = TeslaTextPreprocessor(
+        language='english',
+        lemmatize=False,
+        taxonomy_file=os.getenv('TESLA_TAXONOMY_FILE')
+    )
+    analyzer = TeslaSentimentAnalyzer(
+        cache_path=os.getenv('SCORE_CACHE_PATH'),
+        vader_engine=os.getenv('VADER_ENGINE', 'nltk')
+    )
+
+    pipeline = TeslaPipeline(
+        collector,
+        preprocessor,
+        analyzer,
+        batch_size=int(os.getenv('PIPELINE_BATCH_SIZE', '500')),
+        batch_timeout=float(os.getenv('PIPELINE_BATCH_TIMEOUT', '1.0')),
+        queue_size=int(os.getenv('PIPELINE_QUEUE_SIZE', '8')),
+        results_db_path=get_results_db_path(),
+        results_partition_dir=get_results_partition_dir()
+    )
+    pipeline.run(max_tweets=int(os.getenv('MAX_TWEETS', '500')))
+
+
+if __name__ == "__main__":
+    main()
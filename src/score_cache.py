@@ -0,0 +1,172 @@
+"""
+Cache persistant des scores de sentiment
+
+Les tweets sont très répétitifs (copier-coller, spam de bots, citations) :
+ce cache sur disque (SQLite) évite de recalculer les scores VADER/TextBlob
+d'un texte déjà analysé, d'une exécution à l'autre.
+
+Chaque entrée est indexée par l'empreinte (SHA-1) du texte nettoyé et de la
+version de l'analyseur : changer de version de NLTK, de TextBlob ou de
+méthode de scoring invalide donc automatiquement les anciennes entrées.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Sequence, Tuple
+
+# Nombre maximal de paramètres par requête SQLite
+_BATCH_SIZE = 500
+
+
+class SentimentScoreCache:
+    """
+    Cache clé -> scores stocké dans SQLite, borné en nombre d'entrées (LRU).
+
+    Les lectures et écritures se font par lots ; les compteurs hits/misses
+    permettent de suivre l'efficacité du cache. La connexion peut être
+    partagée entre threads (accès sérialisés), par exemple ouverte dans le
+    thread principal puis utilisée par l'étape d'analyse du pipeline.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        columns: Sequence[str],
+        version: str,
+        max_entries: int = 5_000_000
+    ):
+        """
+        Ouvre (ou crée) le cache.
+
+        Args:
+            path: Chemin du fichier SQLite
+            columns: Noms des scores stockés pour chaque texte
+            version: Version de l'analyseur (fait partie de la clé)
+            max_entries: Nombre maximal d'entrées avant éviction des moins
+                récemment utilisées
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) if os.path.dirname(path) else '.', exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        score_columns = ', '.join(f"{column} REAL" for column in self.columns)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS scores "
+            f"(key BLOB PRIMARY KEY, {score_columns}, last_used INTEGER NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_scores_last_used ON scores (last_used)"
+        )
+        self.connection.commit()
+        self._entries = self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def make_key(self, text: str) -> bytes:
+        """
+        Calcule la clé d'un texte : SHA-1 de la version et du texte nettoyé.
+        """
+        return hashlib.sha1(f"{self.version}\0{text}".encode('utf-8')).digest()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Tuple[float, ...]]:
+        """
+        Recherche les scores d'un lot de textes.
+
+        Args:
+            texts: Textes (distincts) à rechercher
+
+        Returns:
+            Dictionnaire texte -> scores pour les textes présents dans le cache
+        """
+        keys = {self.make_key(text): text for text in texts}
+        found = {}
+
+        key_list = list(keys)
+        select_columns = ', '.join(self.columns)
+        with self._lock:
+            for i in range(0, len(key_list), _BATCH_SIZE):
+                batch = key_list[i:i + _BATCH_SIZE]
+                placeholders = ', '.join('?' * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, {select_columns} FROM scores WHERE key IN ({placeholders})",
+                    batch
+                )
+                for row in rows:
+                    found[keys[row[0]]] = tuple(row[1:])
+
+            # Marquer les entrées trouvées comme récemment utilisées
+            if found:
+                now = time.time_ns()
+                self.connection.executemany(
+                    "UPDATE scores SET last_used = ? WHERE key = ?",
+                    [(now, self.make_key(text)) for text in found]
+                )
+                self.connection.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, scores: Dict[str, Sequence[float]]):
+        """
+        Enregistre les scores d'un lot de textes, puis applique l'éviction LRU.
+
+        Args:
+            scores: Dictionnaire texte -> scores (dans l'ordre de columns)
+        """
+        if not scores:
+            return
+
+        now = time.time_ns()
+        placeholders = ', '.join('?' * (len(self.columns) + 2))
+        rows = [(self.make_key(text), *values, now) for text, values in scores.items()]
+        with self._lock:
+            cursor = self.connection.executemany(
+                f"INSERT OR IGNORE INTO scores (key, {', '.join(self.columns)}, last_used) "
+                f"VALUES ({placeholders})",
+                rows
+            )
+            self._entries += max(cursor.rowcount, 0)
+
+            # Éviction des entrées les moins récemment utilisées
+            excess = self._entries - self.max_entries
+            if excess > 0:
+                cursor = self.connection.execute(
+                    "DELETE FROM scores WHERE key IN "
+                    "(SELECT key FROM scores ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+                self._entries -= cursor.rowcount
+            self.connection.commit()
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs du cache (hits, misses, taux de succès, taille).
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self)
+        }
+
+    def close(self):
+        """
+        Ferme la connexion SQLite.
+        """
+        with self._lock:
+            self.connection.close()
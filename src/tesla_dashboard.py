@@ -23,6 +23,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 
 from analyze_tesla_sentiment import TeslaSentimentAnalyzer
+from tesla_storage import find_data_file, read_table
 
 # Chemin vers le logo Tesla
 tesla_logo_path = os.path.join(project_root, "tesla_logo.png")
@@ -130,11 +131,8 @@ def load_data():
         "data/tesla_sentiment_analysis.csv"
     ]
     
-    data_file = None
-    for file_path in possible_files:
-        if os.path.exists(file_path):
-            data_file = file_path
-            break
+    # Variante Parquet de préférence (TESLA_STORAGE_FORMAT=parquet)
+    data_file = find_data_file(possible_files)
     
     if data_file is None:
         st.error(f"❌ Fichier de données introuvable. Cherché : {', '.join(possible_files)}")
@@ -147,11 +145,8 @@ def load_data():
         return None
     
     try:
-        df = pd.read_csv(data_file)
-        
-        # Convertir la colonne date en datetime
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
+        # Colonnes typées à la lecture (date, sentiment catégoriel)
+        df = read_table(data_file)
         
         # Adapter les colonnes si nécessaire pour compatibilité
         # Si 'polarity' n'existe pas, utiliser 'sentiment_score' ou 'vader_compound'
@@ -0,0 +1,730 @@
+"""
+Entrées/sorties des étapes du pipeline Tesla Sentiment Analysis
+
+Ce module regroupe la lecture et l'écriture des fichiers produits par les
+différentes étapes :
+- Fichiers des étapes en CSV ou en Parquet (TESLA_STORAGE_FORMAT=parquet) :
+  colonnes typées (dates, sentiments en catégories, listes de modèles) et
+  lecture d'une partie des colonnes seulement
+- Lecture d'un CSV par chunks de taille bornée
+- Mode streaming : chaque chunk est transformé puis ajouté au fichier de
+  sortie, avec un point de reprise pour ne rien perdre en cas d'arrêt
+- Collecte : segments CSV append-only, compactés périodiquement, curseur
+  de pagination persistant et cache des usernames
+"""
+
+import ast
+import importlib.util
+import json
+import os
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+try:
+    from .tweet_id_index import TweetIdIndex
+except ImportError:
+    from tweet_id_index import TweetIdIndex
+
+
+def write_json_atomic(path: str, data: Dict):
+    """
+    Écrit un fichier JSON de façon atomique (fichier temporaire, fsync, renommage).
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# Formats de stockage des fichiers produits par les étapes
+STORAGE_FORMATS = ('csv', 'parquet')
+
+# Colonnes de classification, stockées en catégories
+SENTIMENT_COLUMNS = ('sentiment', 'sentiment_vader', 'sentiment_textblob')
+SENTIMENT_CATEGORIES = ['negative', 'neutral', 'positive']
+
+
+def get_storage_format() -> str:
+    """
+    Format des fichiers des étapes (TESLA_STORAGE_FORMAT, défaut : csv).
+    """
+    storage_format = os.getenv('TESLA_STORAGE_FORMAT', 'csv').lower()
+    if storage_format not in STORAGE_FORMATS:
+        raise ValueError(
+            f"Format de stockage inconnu : {storage_format} (disponibles : {', '.join(STORAGE_FORMATS)})"
+        )
+    return storage_format
+
+
+def data_path(path: str, storage_format: Optional[str] = None) -> str:
+    """
+    Adapte l'extension d'un fichier au format de stockage.
+    
+    Ex. : data/tesla_tweets_raw.csv -> data/tesla_tweets_raw.parquet
+    """
+    return f"{os.path.splitext(path)[0]}.{storage_format or get_storage_format()}"
+
+
+def is_parquet(path: str) -> bool:
+    return path.endswith('.parquet')
+
+
+def _require_pyarrow():
+    if importlib.util.find_spec('pyarrow') is None:
+        raise ImportError(
+            "Le stockage Parquet nécessite pyarrow. Installez-le avec : pip install pyarrow"
+        )
+
+
+def normalize_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type les colonnes connues des étapes : id entier, date UTC, sentiments
+    en catégories, mentioned_models en listes.
+    """
+    df = df.copy()
+    if 'id' in df.columns and not pd.api.types.is_integer_dtype(df['id']):
+        try:
+            df['id'] = df['id'].astype('int64')
+        except (ValueError, TypeError):
+            pass
+    if 'date' in df.columns and not isinstance(df['date'].dtype, pd.DatetimeTZDtype):
+        try:
+            df['date'] = pd.to_datetime(df['date'], utc=True, format='ISO8601')
+        except ValueError:
+            df['date'] = pd.to_datetime(df['date'], utc=True, format='mixed')
+    for column in SENTIMENT_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            # Des libellés inattendus sont conservés comme catégories supplémentaires
+            extra = sorted(set(df[column].dropna()) - set(SENTIMENT_CATEGORIES))
+            df[column] = pd.Categorical(df[column], categories=SENTIMENT_CATEGORIES + extra)
+    if 'mentioned_models' in df.columns:
+        # En CSV, les listes sont stockées sous leur représentation Python
+        df['mentioned_models'] = [
+            ast.literal_eval(value) if isinstance(value, str)
+            else list(value) if value is not None and not isinstance(value, float) else []
+            for value in df['mentioned_models']
+        ]
+    return df
+
+
+def write_table(df: pd.DataFrame, path: str):
+    """
+    Écrit le fichier d'une étape de façon atomique, en CSV ou en Parquet
+    (selon l'extension ; en Parquet, colonnes typées, compression zstd).
+    """
+    os.makedirs(os.path.dirname(path) if os.path.dirname(path) else '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    if is_parquet(path):
+        _require_pyarrow()
+        normalize_types(df).to_parquet(tmp_path, index=False, compression='zstd')
+    else:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_table(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lit le fichier d'une étape (CSV ou Parquet, selon l'extension), avec des
+    colonnes typées.
+    
+    Args:
+        path: Chemin du fichier
+        columns: Colonnes à lire (les colonnes absentes du fichier sont
+            ignorées) ; None = toutes
+    """
+    if is_parquet(path):
+        _require_pyarrow()
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(path).names)
+            columns = [column for column in columns if column in available]
+        df = pd.read_parquet(path, columns=columns)
+        if 'mentioned_models' in df.columns:
+            df['mentioned_models'] = [list(models) for models in df['mentioned_models']]
+        return df
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda column: column in wanted
+    return normalize_types(pd.read_csv(path, usecols=usecols))
+
+
+def find_data_file(paths: List[str]) -> Optional[str]:
+    """
+    Retourne le premier fichier existant parmi les variantes Parquet puis CSV
+    des chemins donnés.
+    """
+    candidates = [data_path(path, 'parquet') for path in paths] + list(paths)
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def iter_csv_chunks(
+    input_file: str,
+    chunk_size: int,
+    skip_rows: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV par chunks de taille bornée.
+
+    Args:
+        input_file: Chemin du fichier CSV
+        chunk_size: Nombre de lignes par chunk
+        skip_rows: Nombre de lignes de données à ignorer (reprise)
+
+    Yields:
+        DataFrames d'au plus chunk_size lignes
+    """
+    skip = range(1, skip_rows + 1) if skip_rows else None
+    with pd.read_csv(input_file, chunksize=chunk_size, skiprows=skip) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+class StreamCheckpoint:
+    """
+    Point de reprise d'une transformation en streaming.
+
+    Enregistre, après chaque chunk écrit, le nombre de lignes d'entrée
+    consommées et la taille du fichier de sortie. Après un arrêt brutal, la
+    sortie est tronquée à la dernière taille enregistrée et la lecture reprend
+    juste après les lignes déjà traitées.
+    """
+
+    def __init__(self, output_file: str, input_file: str):
+        """
+        Args:
+            output_file: Fichier de sortie du streaming
+            input_file: Fichier d'entrée (un point de reprise d'un autre fichier est ignoré)
+        """
+        self.path = output_file + '.progress.json'
+        self.input_file = os.path.abspath(input_file)
+        self.input_rows = 0
+        self.output_rows = 0
+        self.output_bytes = 0
+
+    def load(self) -> bool:
+        """
+        Charge le point de reprise s'il existe et correspond au fichier d'entrée.
+
+        Returns:
+            True si une reprise est possible
+        """
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if state.get('input_file') != self.input_file:
+            return False
+
+        self.input_rows = state['input_rows']
+        self.output_rows = state['output_rows']
+        self.output_bytes = state['output_bytes']
+        return True
+
+    def save(self):
+        """
+        Enregistre le point de reprise de façon atomique.
+        """
+        write_json_atomic(self.path, {
+            'input_file': self.input_file,
+            'input_rows': self.input_rows,
+            'output_rows': self.output_rows,
+            'output_bytes': self.output_bytes
+        })
+
+    def clear(self):
+        """
+        Supprime le point de reprise (transformation terminée).
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def stream_transform(
+    input_file: str,
+    output_file: str,
+    transform: Callable[[pd.DataFrame], pd.DataFrame],
+    chunk_size: int = 100_000,
+    resume: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Transforme un fichier CSV chunk par chunk en ajoutant le résultat à la sortie.
+
+    La mémoire utilisée reste bornée par la taille d'un chunk, quelle que soit
+    la taille du fichier. Le générateur produit chaque chunk transformé après
+    son écriture, ce qui permet à l'appelant de calculer des statistiques au fil
+    de l'eau.
+
+    Args:
+        input_file: Fichier CSV d'entrée
+        output_file: Fichier CSV de sortie
+        transform: Fonction appliquée à chaque chunk
+        chunk_size: Nombre de lignes lues par chunk
+        resume: Si True, reprend après la dernière ligne traitée lors d'une
+            exécution interrompue
+
+    Yields:
+        Chunks transformés
+    """
+    os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else '.', exist_ok=True)
+
+    checkpoint = StreamCheckpoint(output_file, input_file)
+    if resume and checkpoint.load() and os.path.exists(output_file):
+        print(f"♻️  Reprise après {checkpoint.input_rows} lignes déjà traitées")
+        # Supprimer un éventuel chunk écrit partiellement avant l'arrêt
+        with open(output_file, 'r+b') as f:
+            f.truncate(checkpoint.output_bytes)
+    else:
+        checkpoint = StreamCheckpoint(output_file, input_file)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+    for chunk in iter_csv_chunks(input_file, chunk_size, skip_rows=checkpoint.input_rows):
+        result = transform(chunk)
+
+        write_header = checkpoint.output_bytes == 0
+        if write_header or len(result) > 0:
+            with open(output_file, 'a', encoding='utf-8', newline='') as f:
+                result.to_csv(f, index=False, header=write_header)
+                f.flush()
+                os.fsync(f.fileno())
+                checkpoint.output_bytes = f.tell()
+
+        checkpoint.input_rows += len(chunk)
+        checkpoint.output_rows += len(result)
+        checkpoint.save()
+
+        yield result
+
+    checkpoint.clear()
+
+
+class CollectionCursor:
+    """
+    Curseur de pagination persistant de la collecte de tweets.
+    
+    Enregistré après chaque page sauvegardée, il contient :
+    - le next_token de la pagination en cours (et ses bornes since_id/until_id),
+      pour reprendre exactement à la page suivante après un arrêt ;
+    - les ids (et la date) du tweet le plus récent et du plus ancien collectés :
+      une nouvelle collecte ne demande que les tweets plus récents (since_id) ;
+    - l'état de chaque fenêtre de temps de la collecte concurrente.
+    """
+    
+    def __init__(self, output_file: str, query: str):
+        """
+        Args:
+            output_file: Fichier de sortie de la collecte
+            query: Requête de recherche (un curseur d'une autre requête est ignoré)
+        """
+        self.path = output_file + '.cursor.json'
+        self.query = query
+        self.next_token = None
+        self.since_id = None
+        self.until_id = None
+        self.newest_id = None
+        self.newest_time = None
+        self.oldest_id = None
+        self.windows = {}
+    
+    def load(self) -> bool:
+        """
+        Charge le curseur s'il existe et correspond à la requête.
+        
+        Returns:
+            True si un curseur a été chargé
+        """
+        if not os.path.exists(self.path):
+            return False
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        if state.get('query') != self.query:
+            return False
+        
+        for field in ('next_token', 'since_id', 'until_id', 'newest_id', 'newest_time', 'oldest_id'):
+            setattr(self, field, state.get(field))
+        self.windows = state.get('windows', {})
+        return True
+    
+    def save(self):
+        """
+        Enregistre le curseur de façon atomique.
+        """
+        write_json_atomic(self.path, {
+            'query': self.query,
+            'next_token': self.next_token,
+            'since_id': self.since_id,
+            'until_id': self.until_id,
+            'newest_id': self.newest_id,
+            'newest_time': self.newest_time,
+            'oldest_id': self.oldest_id,
+            'windows': self.windows
+        })
+    
+    def observe(self, tweets: List[Dict]):
+        """
+        Met à jour les ids extrêmes à partir des tweets d'une page.
+        """
+        for tweet in tweets:
+            tweet_id = str(tweet['id'])
+            if self.newest_id is None or int(tweet_id) > int(self.newest_id):
+                self.newest_id = tweet_id
+                self.newest_time = str(tweet['date'])
+            if self.oldest_id is None or int(tweet_id) < int(self.oldest_id):
+                self.oldest_id = tweet_id
+
+
+class UsernameCache:
+    """
+    Cache persistant user_id -> username de la collecte (fichier JSON).
+
+    Les comptes les plus actifs reviennent à chaque collecte : leurs
+    usernames sont conservés d'une exécution à l'autre. Chaque entrée est
+    datée et n'est plus utilisée au-delà de sa durée de validité (ttl),
+    un compte pouvant changer de username.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Chemin du fichier JSON
+            ttl: Durée de validité d'une entrée (secondes)
+            clock: Horloge (secondes depuis l'epoch)
+        """
+        if ttl <= 0:
+            raise ValueError(f"ttl doit être positif (reçu : {ttl})")
+
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._users = {}
+        self._dirty = False
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._users = json.load(f).get('users', {})
+            except (OSError, ValueError):
+                self._users = {}
+
+    def get_many(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Recherche les usernames encore valides d'un lot d'ids.
+
+        Returns:
+            Dictionnaire user_id -> username pour les ids présents dans le cache
+        """
+        user_ids = set(map(str, user_ids))
+        expires_before = self.clock() - self.ttl
+        found = {}
+        for user_id in user_ids:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[1] >= expires_before:
+                found[user_id] = entry[0]
+
+        self.hits += len(found)
+        self.misses += len(user_ids) - len(found)
+        return found
+
+    def update(self, usernames: Dict[str, str]):
+        """
+        Enregistre (ou rafraîchit) des usernames, sans écrire le fichier.
+        """
+        now = self.clock()
+        for user_id, username in usernames.items():
+            self._users[str(user_id)] = [username, now]
+        if usernames:
+            self._dirty = True
+
+    def save(self):
+        """
+        Écrit le cache de façon atomique, sans les entrées expirées.
+        """
+        if not self._dirty:
+            return
+
+        expires_before = self.clock() - self.ttl
+        self._users = {
+            user_id: entry for user_id, entry in self._users.items() if entry[1] >= expires_before
+        }
+        os.makedirs(os.path.dirname(self.path) if os.path.dirname(self.path) else '.', exist_ok=True)
+        write_json_atomic(self.path, {'users': self._users})
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+
+class SegmentStore:
+    """
+    Stockage append-only en segments CSV pour la collecte de tweets.
+    
+    Chaque lot de lignes est ajouté au segment courant puis synchronisé sur
+    disque (fsync) : le coût d'une sauvegarde ne dépend plus de la taille des
+    données déjà collectées. Un manifeste enregistre la taille validée de
+    chaque segment ; après un arrêt brutal, les segments sont tronqués à cette
+    taille (lot écrit partiellement supprimé).
+    
+    La compaction fusionne périodiquement les segments dans le fichier de
+    sortie en supprimant les doublons sur la clé.
+    
+    Avec index_keys=True (clé entière), les clés stockées sont tenues à jour
+    dans un TweetIdIndex : une reprise n'a plus besoin de relire le fichier
+    compacté. L'index est reconstruit si le fichier compacté ne correspond
+    plus à celui enregistré dans le manifeste (taille, date de modification).
+    """
+    
+    def __init__(
+        self,
+        output_file: str,
+        key: str = 'id',
+        segment_max_rows: int = 10_000,
+        compact_every: int = 10,
+        index_keys: bool = False
+    ):
+        """
+        Args:
+            output_file: Fichier compacté (Parquet si son extension est .parquet, sinon CSV)
+            key: Colonne identifiant une ligne (dédoublonnage)
+            segment_max_rows: Nombre de lignes avant de passer au segment suivant
+            compact_every: Nombre de segments au-delà duquel une compaction est lancée
+            index_keys: Si True, maintient un index persistant des clés (entiers)
+        """
+        self.output_file = output_file
+        self.key = key
+        self.segment_max_rows = segment_max_rows
+        self.compact_every = compact_every
+        self.directory = output_file + '.segments'
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        
+        os.makedirs(self.directory, exist_ok=True)
+        self.segments, self.output_fingerprint = self._load_manifest()
+        self._recover()
+        
+        # Chaque session écrit dans un nouveau segment
+        self.current = None
+        self.current_rows = 0
+        self.columns = None
+        
+        self.index = None
+        if index_keys:
+            self._open_index()
+    
+    def _load_manifest(self) -> Tuple[Dict[str, int], Optional[List[int]]]:
+        """
+        Charge la taille validée de chaque segment et l'empreinte du fichier compacté.
+        """
+        if not os.path.exists(self.manifest_path):
+            return {}, None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return manifest['segments'], manifest.get('output')
+        except (OSError, ValueError, KeyError):
+            return {}, None
+    
+    def _save_manifest(self):
+        write_json_atomic(self.manifest_path, {
+            'segments': self.segments,
+            'output': self.output_fingerprint
+        })
+    
+    def _fingerprint_output(self) -> Optional[List[int]]:
+        """
+        Empreinte (taille, date de modification) du fichier compacté.
+        """
+        if not os.path.exists(self.output_file):
+            return None
+        stat = os.stat(self.output_file)
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def _read_keys(self, path: str) -> pd.Series:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return pd.Series([], dtype=str)
+        if is_parquet(path):
+            return read_table(path, columns=[self.key])[self.key].astype(str)
+        return pd.read_csv(path, usecols=[self.key], dtype={self.key: str})[self.key]
+    
+    def _open_index(self):
+        """
+        Ouvre l'index des clés, en le reconstruisant s'il ne correspond plus
+        au fichier compacté.
+        """
+        self.index = TweetIdIndex(self.directory)
+        if not self.index.exists() or self.output_fingerprint != self._fingerprint_output():
+            print("🗂️  Construction de l'index des ids collectés...")
+            self.index.rebuild(self._read_keys(self.output_file).astype('int64').to_numpy())
+            self.output_fingerprint = self._fingerprint_output()
+            self._save_manifest()
+        
+        # Un lot validé peut manquer à l'index après un arrêt brutal :
+        # les segments (petits) sont relus pour le compléter
+        for path in self._segment_paths():
+            self.index.add(self._read_keys(path).astype('int64').to_numpy())
+    
+    def _recover(self):
+        """
+        Tronque les segments à leur dernière taille validée et supprime ceux
+        qui n'ont jamais été validés.
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name not in self.segments and name.startswith('segment-'):
+                os.remove(path)
+        for name, size in self.segments.items():
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                self.segments[name] = 0
+            elif os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+    
+    def _segment_paths(self) -> List[str]:
+        return [
+            os.path.join(self.directory, name)
+            for name, size in sorted(self.segments.items()) if size > 0
+        ]
+    
+    def _rotate(self):
+        """
+        Ouvre un nouveau segment (après compaction si nécessaire).
+        """
+        if len(self.segments) >= self.compact_every:
+            self.compact()
+        
+        number = max((int(name[8:14]) for name in self.segments), default=0) + 1
+        self.current = f"segment-{number:06d}.csv"
+        self.segments[self.current] = 0
+        self.current_rows = 0
+        self.columns = None
+    
+    def append(self, rows: List[Dict]):
+        """
+        Ajoute un lot de lignes au segment courant et le synchronise sur disque.
+        
+        Args:
+            rows: Lignes à ajouter (dictionnaires colonne -> valeur)
+        """
+        if not rows:
+            return
+        
+        if self.current is None or self.current_rows >= self.segment_max_rows:
+            self._rotate()
+        
+        df = pd.DataFrame(rows)
+        if self.columns is None:
+            self.columns = list(df.columns)
+        
+        path = os.path.join(self.directory, self.current)
+        with open(path, 'a', encoding='utf-8', newline='') as f:
+            df.reindex(columns=self.columns).to_csv(f, index=False, header=self.segments[self.current] == 0)
+            f.flush()
+            os.fsync(f.fileno())
+            self.segments[self.current] = f.tell()
+        
+        self.current_rows += len(rows)
+        self._save_manifest()
+        
+        # L'index est mis à jour après la validation du lot : il ne contient
+        # jamais de clé absente des fichiers
+        if self.index is not None:
+            self.index.add(df[self.key].astype('int64').to_numpy())
+    
+    def load_keys(self) -> Set[str]:
+        """
+        Reconstruit l'ensemble des clés déjà stockées (fichier compacté et
+        segments), en ne lisant que la colonne clé.
+        """
+        keys = set()
+        for path in [self.output_file] + self._segment_paths():
+            keys.update(self._read_keys(path))
+        return keys
+    
+    def read_all(self, dtype: Optional[Dict] = None) -> pd.DataFrame:
+        """
+        Lit le fichier compacté et tous les segments (sans dédoublonnage).
+        
+        Args:
+            dtype: Types des colonnes passés à pd.read_csv (appliqués aussi
+                au fichier compacté s'il est en Parquet)
+        """
+        parquet_output = is_parquet(self.output_file)
+        frames = [
+            pd.read_csv(path, dtype=dtype)
+            for path in ([] if parquet_output else [self.output_file]) + self._segment_paths()
+            if os.path.exists(path) and os.path.getsize(path) > 0
+        ]
+        if parquet_output:
+            # Segments typés comme le fichier compacté, pour une concaténation homogène
+            frames = [normalize_types(frame) for frame in frames]
+            if os.path.exists(self.output_file):
+                frames.insert(0, read_table(self.output_file))
+            frames = [
+                frame.astype({
+                    column: column_type for column, column_type in (dtype or {}).items() if column in frame.columns
+                })
+                for frame in frames
+            ]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+    
+    def compact(
+        self,
+        transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        dtype: Optional[Dict] = None
+    ) -> pd.DataFrame:
+        """
+        Fusionne les segments dans le fichier de sortie, dédoublonné sur la clé
+        (la dernière version d'une ligne est conservée).
+        
+        Args:
+            transform: Fonction appliquée au DataFrame fusionné avant écriture
+            dtype: Types des colonnes passés à pd.read_csv
+            
+        Returns:
+            DataFrame écrit dans le fichier de sortie
+        """
+        df = self.read_all(dtype)
+        if len(df) > 0:
+            df = df.drop_duplicates(subset=[self.key], keep='last')
+        if transform is not None:
+            df = transform(df)
+        
+        # Écriture atomique du fichier compacté (CSV ou Parquet), puis suppression des segments
+        write_table(df, self.output_file)
+        
+        if self.index is not None:
+            self.index.rebuild(df[self.key].astype('int64').to_numpy() if len(df) > 0 else [])
+        
+        for path in self._segment_paths():
+            os.remove(path)
+        self.segments = {}
+        self.current = None
+        self.output_fingerprint = self._fingerprint_output()
+        self._save_manifest()
+        
+        return df
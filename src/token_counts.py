@@ -0,0 +1,71 @@
+"""
+Fréquences des mots des tweets pour les WordClouds
+
+Découpe les textes comme WordCloud.process_text (sans collocations) : mots
+de la forme \\w[\\w']*, « 's » final retiré, nombres et mots vides de
+WordCloud exclus, pluriels simples fusionnés avec leur singulier.
+
+Les comptes par mot peuvent ainsi être tenus à jour au fil de l'analyse
+(voir results_store.py) puis passés tels quels à
+WordCloud.generate_from_frequencies, sans recouper tout le texte.
+"""
+
+import importlib.util
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Mapping
+
+_TOKEN_PATTERN = re.compile(r"\w[\w']*")
+
+
+@lru_cache(maxsize=1)
+def _stopwords() -> FrozenSet[str]:
+    """
+    Mots vides de WordCloud, lus dans le fichier du paquet (importer wordcloud
+    chargerait matplotlib).
+    """
+    spec = importlib.util.find_spec('wordcloud')
+    if spec is None or spec.origin is None:
+        raise ImportError("Le module 'wordcloud' est requis pour compter les mots (pip install wordcloud)")
+    path = os.path.join(os.path.dirname(spec.origin), 'stopwords')
+    with open(path, encoding='utf-8') as f:
+        return frozenset(line.strip().lower() for line in f if line.strip())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Découpe un texte en mots (minuscules), sans nombres ni mots vides.
+    """
+    stopwords = _stopwords()
+    words = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if word.endswith("'s"):
+            word = word[:-2]
+        if word and not word.isdigit() and word not in stopwords:
+            words.append(word)
+    return words
+
+
+def count_tokens(texts: Iterable[str]) -> Counter:
+    """
+    Compte les mots d'une suite de textes (valeurs manquantes ignorées).
+    """
+    counts = Counter()
+    for text in texts:
+        if isinstance(text, str):
+            counts.update(tokenize(text))
+    return counts
+
+
+def merge_plurals(counts: Mapping[str, int]) -> Dict[str, int]:
+    """
+    Fusionne les pluriels simples avec leur singulier, comme WordCloud : un mot
+    terminé par « s » (mais pas « ss ») dont le singulier est présent.
+    """
+    merged = {word: count for word, count in counts.items() if count > 0}
+    for word in list(merged):
+        if word.endswith('s') and not word.endswith('ss') and word[:-1] in merged:
+            merged[word[:-1]] += merged.pop(word)
+    return merged
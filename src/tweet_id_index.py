@@ -0,0 +1,212 @@
+"""
+Index persistant des ids de tweets déjà collectés
+
+Lors d'une reprise, la collecte doit savoir quels tweets sont déjà stockés.
+Relire les fichiers CSV pour construire un set Python de chaînes coûte des
+secondes et des gigaoctets à partir de quelques dizaines de millions de
+tweets. Cet index stocke les ids sous forme d'entiers int64 :
+- une base triée (fichier .npy chargé en memory-map : ouverture quasi
+  instantanée, recherche dichotomique en O(log n)) ;
+- un delta append-only des ids ajoutés depuis la dernière fusion, gardé trié
+  en mémoire et fusionné dans la base lorsqu'il devient trop gros ;
+- optionnellement, un filtre de Bloom (numpy) devant la base, qui répond
+  « absent » sans accéder au fichier pour la plupart des ids nouveaux.
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+# Multiplicateurs (impairs, 64 bits) des fonctions de hachage du filtre de Bloom
+_BLOOM_MULTIPLIERS = np.array([
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+    0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9,
+], dtype=np.uint64)
+
+
+class BloomFilter:
+    """
+    Filtre de Bloom vectorisé sur des ids int64.
+
+    might_contain ne donne jamais de faux négatif ; le taux de faux positifs
+    dépend du nombre de bits par id (environ 1 % avec 10 bits et 7 hachages).
+    """
+
+    def __init__(self, capacity: int, bits_per_id: int = 10):
+        """
+        Args:
+            capacity: Nombre d'ids prévu
+            bits_per_id: Nombre de bits alloués par id
+        """
+        if bits_per_id < 1:
+            raise ValueError(f"bits_per_id doit être positif (reçu : {bits_per_id})")
+
+        self.num_bits = max(64, int(capacity) * bits_per_id)
+        self.num_hashes = int(np.clip(round(bits_per_id * np.log(2)), 1, len(_BLOOM_MULTIPLIERS)))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, ids: np.ndarray) -> np.ndarray:
+        keys = ids.astype(np.int64).view(np.uint64)[:, None]
+        with np.errstate(over='ignore'):
+            hashes = keys * _BLOOM_MULTIPLIERS[:self.num_hashes]
+        return (hashes >> np.uint64(17)) % np.uint64(self.num_bits)
+
+    def add(self, ids: np.ndarray):
+        positions = self._positions(ids).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3),
+                         np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+
+    def might_contain(self, ids: np.ndarray) -> np.ndarray:
+        positions = self._positions(ids)
+        bits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+
+class TweetIdIndex:
+    """
+    Ensemble persistant d'ids de tweets (int64).
+
+    Fichiers (dans le répertoire donné) :
+    - ids.npy : base triée, sans doublons
+    - ids.delta : ids ajoutés depuis la dernière fusion (int64 bruts, append + fsync)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        merge_min: int = 100_000,
+        merge_ratio: float = 0.1,
+        bloom_bits_per_id: int = 0
+    ):
+        """
+        Args:
+            directory: Répertoire des fichiers de l'index
+            merge_min: Taille minimale du delta avant fusion dans la base
+            merge_ratio: Fusion dès que le delta dépasse cette fraction de la base
+            bloom_bits_per_id: Bits par id du filtre de Bloom (0 = pas de filtre)
+        """
+        self.directory = directory
+        self.base_path = os.path.join(directory, 'ids.npy')
+        self.delta_path = os.path.join(directory, 'ids.delta')
+        self.merge_min = merge_min
+        self.merge_ratio = merge_ratio
+        self.bloom_bits_per_id = bloom_bits_per_id
+        self.bloom = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.base = self._load_base()
+        self.delta = self._load_delta()
+
+    def exists(self) -> bool:
+        """
+        Indique si l'index a déjà été enregistré sur disque.
+        """
+        return os.path.exists(self.base_path)
+
+    def _load_base(self) -> np.ndarray:
+        if not os.path.exists(self.base_path):
+            return np.empty(0, dtype=np.int64)
+        base = np.load(self.base_path, mmap_mode='r')
+        # Une base vide ne peut pas être projetée en mémoire
+        return base if len(base) > 0 else np.empty(0, dtype=np.int64)
+
+    def _load_delta(self) -> np.ndarray:
+        if not os.path.exists(self.delta_path):
+            return np.empty(0, dtype=np.int64)
+        # Supprimer un id écrit partiellement avant un arrêt brutal
+        size = os.path.getsize(self.delta_path)
+        if size % 8:
+            with open(self.delta_path, 'r+b') as f:
+                f.truncate(size - size % 8)
+        return np.unique(np.fromfile(self.delta_path, dtype=np.int64))
+
+    def _write_base(self, ids: np.ndarray):
+        """
+        Écrit la base de façon atomique et vide le delta.
+        """
+        tmp_path = self.base_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, ids)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.base_path)
+
+        with open(self.delta_path, 'wb') as f:
+            os.fsync(f.fileno())
+
+        self.base = self._load_base()
+        self.delta = np.empty(0, dtype=np.int64)
+        self.bloom = None
+
+    def rebuild(self, ids: np.ndarray):
+        """
+        Remplace le contenu de l'index par les ids donnés.
+        """
+        self._write_base(np.unique(np.asarray(ids, dtype=np.int64)))
+
+    def _bloom_filter(self) -> Optional[BloomFilter]:
+        """
+        Construit le filtre de Bloom de la base à la première recherche.
+        """
+        if self.bloom is None and self.bloom_bits_per_id > 0 and len(self.base) > 0:
+            self.bloom = BloomFilter(len(self.base) * (1 + self.merge_ratio), self.bloom_bits_per_id)
+            self.bloom.add(np.asarray(self.base))
+        return self.bloom
+
+    def contains(self, ids) -> np.ndarray:
+        """
+        Teste l'appartenance d'un lot d'ids (recherche dichotomique).
+
+        Returns:
+            Tableau booléen (True si l'id est déjà dans l'index)
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        found = np.zeros(len(ids), dtype=bool)
+
+        if len(self.base) > 0:
+            candidates = np.arange(len(ids))
+            bloom = self._bloom_filter()
+            if bloom is not None:
+                candidates = candidates[bloom.might_contain(ids)]
+            positions = np.searchsorted(self.base, ids[candidates])
+            positions[positions == len(self.base)] = 0
+            found[candidates] = self.base[positions] == ids[candidates]
+
+        if len(self.delta) > 0:
+            positions = np.searchsorted(self.delta, ids)
+            positions[positions == len(self.delta)] = 0
+            found |= self.delta[positions] == ids
+
+        return found
+
+    def __contains__(self, tweet_id) -> bool:
+        return bool(self.contains([int(tweet_id)])[0])
+
+    def add(self, ids):
+        """
+        Ajoute des ids (append + fsync du delta), puis fusionne si nécessaire.
+        """
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        ids = ids[~self.contains(ids)]
+        if len(ids) == 0:
+            return
+
+        with open(self.delta_path, 'ab') as f:
+            ids.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        self.delta = np.union1d(self.delta, ids)
+
+        if len(self.delta) >= max(self.merge_min, self.merge_ratio * len(self.base)):
+            self.merge()
+
+    def merge(self):
+        """
+        Fusionne le delta dans la base triée.
+        """
+        if len(self.delta) > 0:
+            self._write_base(np.union1d(np.asarray(self.base), self.delta))
+
+    def __len__(self) -> int:
+        return len(self.base) + len(self.delta)
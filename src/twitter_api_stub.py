@@ -0,0 +1,332 @@
+"""
+Serveur local imitant l'API Twitter v2 (GET /2/tweets/search/recent, GET /2/users)
+
+Permet de tester et de mesurer la collecte sans accès à l'API Twitter :
+- Tweets synthétiques répartis sur les 7 derniers jours (ids croissants avec la date)
+- Filtres start_time / end_time / since_id / until_id et pagination par next_token
+- Expansion author_id (includes.users) et recherche d'auteurs par ids
+- Rate limit par fenêtre, avec les en-têtes x-rate-limit-* et des réponses 429
+- Latence réseau simulée
+
+Usage :
+    python src/twitter_api_stub.py [port]
+    TWITTER_API_BASE_URL=http://127.0.0.1:<port> TWITTER_BEARER_TOKEN=stub python src/collect_tesla_tweets.py
+"""
+
+import bisect
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+try:
+    from .generate_test_data import TEST_TWEETS
+except ImportError:
+    from generate_test_data import TEST_TWEETS
+
+SEARCH_PATH = '/2/tweets/search/recent'
+USERS_PATH = '/2/users'
+
+# Nombre maximal d'ids par requête GET /2/users
+MAX_USER_IDS = 100
+
+# Premier id des tweets générés (ordre de grandeur des ids Twitter actuels)
+BASE_TWEET_ID = 1_700_000_000_000_000_000
+
+
+def format_time(value: datetime) -> str:
+    """
+    Formate une date au format de l'API (ISO 8601, UTC).
+    """
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def parse_time(value: str) -> datetime:
+    """
+    Lit une date ISO 8601 (avec 'Z' ou un décalage horaire).
+    """
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class TwitterAPIStub:
+    """
+    Serveur HTTP local servant des tweets synthétiques au format de l'API v2.
+
+    Utilisable comme context manager : l'URL de base est retournée par start().
+    """
+
+    def __init__(
+        self,
+        num_tweets: int = 10_000,
+        num_users: int = 200,
+        latency: float = 0.0,
+        rate_limit: Optional[int] = None,
+        rate_limit_window: float = 900.0,
+        seed: int = 42,
+        port: int = 0
+    ):
+        """
+        Args:
+            num_tweets: Nombre de tweets disponibles
+            num_users: Nombre d'auteurs distincts
+            latency: Latence ajoutée à chaque requête (secondes)
+            rate_limit: Nombre de requêtes autorisées par fenêtre (None = illimité)
+            rate_limit_window: Durée d'une fenêtre de rate limit (secondes)
+            seed: Graine du générateur de tweets
+            port: Port d'écoute (0 = port libre choisi par le système)
+        """
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.port = port
+
+        self.request_count = 0
+        self.throttled_count = 0
+        self.user_lookup_count = 0
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_requests = 0
+        self._server = None
+        self._thread = None
+
+        self._generate(num_tweets, num_users, seed)
+
+    def _generate(self, num_tweets: int, num_users: int, seed: int):
+        """
+        Génère les tweets, du plus ancien au plus récent (ids croissants).
+        """
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(days=7) + timedelta(minutes=5)
+        span = (now - timedelta(minutes=1) - start).total_seconds()
+
+        offsets = sorted(rng.uniform(0, span) for _ in range(num_tweets))
+        texts = [text for text, _ in TEST_TWEETS]
+
+        self.users = {
+            str(900_000_000 + i): f"tesla_fan_{i}" for i in range(num_users)
+        }
+        user_ids = list(self.users)
+
+        self.tweets = []
+        for i, offset in enumerate(offsets):
+            self.tweets.append({
+                'id': str(BASE_TWEET_ID + i * 1_000 + rng.randrange(1_000)),
+                'text': rng.choice(texts),
+                'created_at': format_time(start + timedelta(seconds=offset)),
+                'author_id': rng.choice(user_ids),
+                'public_metrics': {
+                    'retweet_count': rng.randrange(50),
+                    'reply_count': rng.randrange(20),
+                    'like_count': rng.randrange(500),
+                    'quote_count': rng.randrange(10)
+                }
+            })
+        self._times = [start + timedelta(seconds=offset) for offset in offsets]
+        self._ids = [int(tweet['id']) for tweet in self.tweets]
+
+    def search(self, params: Dict[str, str]) -> Dict:
+        """
+        Exécute une recherche (filtres, pagination) et construit la réponse JSON.
+
+        Raises:
+            ValueError: Si un paramètre est invalide (réponse 400)
+        """
+        max_results = int(params.get('max_results', 10))
+        if not 10 <= max_results <= 100:
+            raise ValueError("max_results doit être compris entre 10 et 100")
+
+        # Intervalle [low, high) des tweets correspondant aux filtres
+        low, high = 0, len(self.tweets)
+        if 'start_time' in params:
+            low = max(low, bisect.bisect_left(self._times, parse_time(params['start_time'])))
+        if 'end_time' in params:
+            high = min(high, bisect.bisect_left(self._times, parse_time(params['end_time'])))
+        if 'since_id' in params:
+            low = max(low, bisect.bisect_right(self._ids, int(params['since_id'])))
+        if 'until_id' in params:
+            high = min(high, bisect.bisect_left(self._ids, int(params['until_id'])))
+
+        # Les résultats sont renvoyés du plus récent au plus ancien ;
+        # le next_token est le nombre de tweets déjà renvoyés
+        skip = int(params.get('next_token', 0) or 0)
+        page_high = high - skip
+        page_low = max(low, page_high - max_results)
+        page = self.tweets[page_low:page_high][::-1] if page_high > low else []
+
+        response = {'meta': {'result_count': len(page)}}
+        if page:
+            response['data'] = page
+            response['meta']['newest_id'] = page[0]['id']
+            response['meta']['oldest_id'] = page[-1]['id']
+            if 'author_id' in params.get('expansions', ''):
+                authors = dict.fromkeys(tweet['author_id'] for tweet in page)
+                response['includes'] = {'users': [
+                    {'id': user_id, 'username': self.users[user_id], 'name': self.users[user_id]}
+                    for user_id in authors
+                ]}
+        if page_low > low:
+            response['meta']['next_token'] = str(skip + len(page))
+
+        return response
+
+    def lookup_users(self, params: Dict[str, str]) -> Dict:
+        """
+        Recherche des auteurs par ids (ids inconnus signalés dans 'errors').
+
+        Raises:
+            ValueError: Si la liste d'ids est vide ou trop longue (réponse 400)
+        """
+        user_ids = [user_id for user_id in params.get('ids', '').split(',') if user_id]
+        if not 1 <= len(user_ids) <= MAX_USER_IDS:
+            raise ValueError(f"ids doit contenir entre 1 et {MAX_USER_IDS} ids")
+
+        with self._lock:
+            self.user_lookup_count += 1
+
+        response = {}
+        found = [user_id for user_id in user_ids if user_id in self.users]
+        if found:
+            response['data'] = [
+                {'id': user_id, 'username': self.users[user_id], 'name': self.users[user_id]}
+                for user_id in found
+            ]
+        unknown = [user_id for user_id in user_ids if user_id not in self.users]
+        if unknown:
+            response['errors'] = [
+                {'value': user_id, 'detail': f"Could not find user with ids: [{user_id}].",
+                 'title': 'Not Found Error'}
+                for user_id in unknown
+            ]
+        return response
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        """
+        Comptabilise une requête et retourne les en-têtes x-rate-limit-*.
+
+        Le statut 429 est signalé par un en-tête x-rate-limit-remaining négatif.
+        """
+        with self._lock:
+            self.request_count += 1
+            now = time.time()
+            if now - self._window_start >= self.rate_limit_window:
+                self._window_start = now
+                self._window_requests = 0
+            self._window_requests += 1
+
+            if self.rate_limit is None:
+                return {}
+
+            remaining = self.rate_limit - self._window_requests
+            if remaining < 0:
+                self.throttled_count += 1
+            return {
+                'x-rate-limit-limit': str(self.rate_limit),
+                'x-rate-limit-remaining': str(remaining),
+                'x-rate-limit-reset': str(int(self._window_start + self.rate_limit_window) + 1)
+            }
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict, headers: Dict[str, str] = None):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                url = urlparse(self.path)
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                routes = {SEARCH_PATH: stub.search, USERS_PATH: stub.lookup_users}
+                if url.path not in routes:
+                    self._send(404, {'title': 'Not Found Error', 'detail': url.path})
+                    return
+
+                if not self.headers.get('Authorization', '').startswith('Bearer '):
+                    self._send(401, {'title': 'Unauthorized', 'detail': 'Unauthorized'})
+                    return
+
+                headers = stub._rate_limit_headers()
+                if int(headers.get('x-rate-limit-remaining', 0)) < 0:
+                    headers['x-rate-limit-remaining'] = '0'
+                    self._send(429, {'title': 'Too Many Requests', 'detail': 'Too Many Requests'}, headers)
+                    return
+
+                try:
+                    body = routes[url.path](params)
+                except ValueError as e:
+                    self._send(400, {'title': 'Invalid Request', 'detail': str(e)}, headers)
+                    return
+                self._send(200, body, headers)
+
+        return Handler
+
+    def start(self) -> str:
+        """
+        Démarre le serveur dans un thread.
+
+        Returns:
+            URL de base à passer au collecteur (api_base_url)
+        """
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """
+        Arrête le serveur.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> 'TwitterAPIStub':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """
+    Lance le serveur au premier plan.
+    """
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    stub = TwitterAPIStub(port=port)
+    print(f"🧪 API Twitter locale sur {stub.start()} ({len(stub.tweets)} tweets)")
+    print("   Ctrl+C pour arrêter")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
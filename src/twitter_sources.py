@@ -0,0 +1,288 @@
+"""
+Sources de tweets du collecteur (format de l'API Twitter v2)
+
+TeslaTweetCollector n'accède à l'API qu'au travers d'une TwitterSource :
+- HTTPTwitterSource : API Twitter (ou serveur local, voir twitter_api_stub.py)
+- ReplayTwitterSource : pages JSON enregistrées sur disque, rejouées avec une
+  latence et des réponses 429 simulées, pour mesurer la collecte sans quota
+
+Usage :
+    python src/twitter_sources.py generate data/replay 20000
+    python src/twitter_sources.py record data/replay 50
+    TWITTER_REPLAY_DIR=data/replay python src/collect_tesla_tweets.py
+"""
+
+import glob
+import json
+import os
+import random
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import tweepy
+
+# URL de l'API Twitter (remplaçable par un serveur local, voir twitter_api_stub.py)
+DEFAULT_API_BASE_URL = "https://api.twitter.com"
+
+# Exceptions tweepy des codes d'erreur HTTP (5xx : TwitterServerError)
+_HTTP_ERRORS = {
+    400: tweepy.BadRequest,
+    401: tweepy.Unauthorized,
+    403: tweepy.Forbidden,
+    404: tweepy.NotFound,
+    429: tweepy.TooManyRequests
+}
+
+
+class TwitterSource(ABC):
+    """
+    Interface d'une source de tweets.
+
+    Les erreurs sont signalées par les exceptions tweepy (BadRequest,
+    Unauthorized, Forbidden, NotFound, TooManyRequests, TwitterServerError),
+    comme avec tweepy.Client.
+    """
+
+    @abstractmethod
+    def search_recent(self, params: Dict) -> Tuple[Dict, Dict]:
+        """
+        Équivalent de GET /2/tweets/search/recent.
+
+        Returns:
+            (réponse JSON, en-têtes HTTP)
+        """
+
+    @abstractmethod
+    def lookup_users(self, user_ids: List[str]) -> Dict:
+        """
+        Équivalent de GET /2/users (au plus 100 ids).
+
+        Returns:
+            Réponse JSON (auteurs trouvés dans 'data')
+        """
+
+
+class HTTPTwitterSource(TwitterSource):
+    """
+    Accès HTTP direct à l'API Twitter v2.
+    """
+
+    def __init__(self, bearer_token: str, base_url: str = DEFAULT_API_BASE_URL, timeout: float = 30):
+        """
+        Args:
+            bearer_token: Token Bearer de l'API v2
+            base_url: URL de l'API
+            timeout: Délai maximal d'une requête (secondes)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = f"Bearer {bearer_token}"
+
+    def _get(self, path: str, params: Dict) -> Tuple[Dict, Dict]:
+        """
+        Effectue une requête GET (bloquante) et convertit les erreurs HTTP
+        en exceptions tweepy, comme tweepy.Client.
+        """
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+        if response.status_code in _HTTP_ERRORS:
+            raise _HTTP_ERRORS[response.status_code](response)
+        if response.status_code >= 500:
+            raise tweepy.TwitterServerError(response)
+        if not 200 <= response.status_code < 300:
+            raise tweepy.HTTPException(response)
+        return response.json(), response.headers
+
+    def search_recent(self, params: Dict) -> Tuple[Dict, Dict]:
+        return self._get('/2/tweets/search/recent', params)
+
+    def lookup_users(self, user_ids: List[str]) -> Dict:
+        page, _ = self._get('/2/users', {'ids': ','.join(user_ids), 'user.fields': 'username,name'})
+        return page
+
+
+def _error_response(status_code: int, reason: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """
+    Construit une réponse HTTP d'erreur (pour les exceptions tweepy).
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response._content = json.dumps({'title': reason, 'detail': reason}).encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+
+class ReplayTwitterSource(TwitterSource):
+    """
+    Rejoue des pages de résultats search/recent enregistrées sur disque.
+
+    Les pages (page-000001.json, ...) sont servies dans l'ordre de leur
+    pagination : la première page répond à une requête sans next_token, la
+    suivante au next_token de la précédente. Les autres paramètres (since_id,
+    fenêtres de temps) sont ignorés : la source est faite pour mesurer la
+    boucle de collecte séquentielle. Les auteurs des expansions
+    includes.users répondent aux requêtes GET /2/users.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 42
+    ):
+        """
+        Args:
+            directory: Répertoire des pages JSON
+            latency: Latence ajoutée à chaque requête (secondes)
+            throttle_rate: Probabilité qu'une requête reçoive un 429
+            retry_after: Délai avant la réinitialisation annoncée par un 429 (secondes)
+            seed: Graine du tirage des 429
+        """
+        if not 0 <= throttle_rate < 1:
+            raise ValueError(f"throttle_rate doit être compris entre 0 et 1 (reçu : {throttle_rate})")
+
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.throttled_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        paths = sorted(glob.glob(os.path.join(directory, 'page-*.json')))
+        if not paths:
+            raise ValueError(f"Aucune page à rejouer dans {directory}")
+
+        self.pages = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.pages.append(json.load(f))
+
+        # next_token de la requête -> page servie
+        self._pages_by_token = {None: 0}
+        for i, page in enumerate(self.pages[:-1]):
+            token = page.get('meta', {}).get('next_token')
+            if token:
+                self._pages_by_token[token] = i + 1
+
+        self.users = {
+            user['id']: user
+            for page in self.pages for user in page.get('includes', {}).get('users', [])
+        }
+
+    def _request(self):
+        """
+        Comptabilise une requête, applique la latence et tire un éventuel 429.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.request_count += 1
+            throttled = self._random.random() < self.throttle_rate
+            if throttled:
+                self.throttled_count += 1
+        if throttled:
+            raise tweepy.TooManyRequests(_error_response(
+                429, 'Too Many Requests', {'x-rate-limit-reset': str(time.time() + self.retry_after)}
+            ))
+
+    def search_recent(self, params: Dict) -> Tuple[Dict, Dict]:
+        self._request()
+        token = params.get('next_token')
+        if token not in self._pages_by_token:
+            raise tweepy.BadRequest(_error_response(400, 'Invalid Request'))
+        return self.pages[self._pages_by_token[token]], {}
+
+    def lookup_users(self, user_ids: List[str]) -> Dict:
+        self._request()
+        return {'data': [self.users[user_id] for user_id in user_ids if user_id in self.users]}
+
+
+def record_pages(source: TwitterSource, directory: str, params: Dict, max_pages: Optional[int] = None) -> int:
+    """
+    Enregistre les pages successives d'une recherche, pour les rejouer.
+
+    Args:
+        source: Source interrogée (API Twitter, serveur local...)
+        directory: Répertoire de destination
+        params: Paramètres de la recherche
+        max_pages: Nombre maximal de pages (None = jusqu'à la dernière)
+
+    Returns:
+        Nombre de pages enregistrées
+    """
+    os.makedirs(directory, exist_ok=True)
+    params = dict(params)
+    params.pop('next_token', None)
+
+    count = 0
+    while max_pages is None or count < max_pages:
+        page, _ = source.search_recent(params)
+        count += 1
+        with open(os.path.join(directory, f"page-{count:06d}.json"), 'w', encoding='utf-8') as f:
+            json.dump(page, f)
+
+        next_token = page.get('meta', {}).get('next_token')
+        if not next_token:
+            break
+        params['next_token'] = next_token
+    return count
+
+
+def generate_replay_pages(directory: str, num_tweets: int = 10_000, num_users: int = 200, seed: int = 42) -> int:
+    """
+    Écrit des pages synthétiques (tweets du serveur local, 100 par page).
+
+    Returns:
+        Nombre de pages écrites
+    """
+    try:
+        from .twitter_api_stub import TwitterAPIStub
+    except ImportError:
+        from twitter_api_stub import TwitterAPIStub
+
+    stub = TwitterAPIStub(num_tweets=num_tweets, num_users=num_users, seed=seed)
+
+    class StubSource(TwitterSource):
+        def search_recent(self, params: Dict) -> Tuple[Dict, Dict]:
+            return stub.search(params), {}
+
+        def lookup_users(self, user_ids: List[str]) -> Dict:
+            return stub.lookup_users({'ids': ','.join(user_ids)})
+
+    return record_pages(StubSource(), directory, {'max_results': 100, 'expansions': 'author_id'})
+
+
+def main():
+    """
+    Génère des pages synthétiques ou enregistre des pages de l'API Twitter.
+    """
+    if len(sys.argv) < 3 or sys.argv[1] not in ('generate', 'record'):
+        print("Usage : python src/twitter_sources.py generate|record <répertoire> [tweets|pages]")
+        return
+
+    command, directory = sys.argv[1], sys.argv[2]
+    if command == 'generate':
+        num_tweets = int(sys.argv[3]) if len(sys.argv) > 3 else 10_000
+        count = generate_replay_pages(directory, num_tweets)
+    else:
+        try:
+            from .collect_tesla_tweets import TeslaTweetCollector
+        except ImportError:
+            from collect_tesla_tweets import TeslaTweetCollector
+
+        collector = TeslaTweetCollector()
+        max_pages = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        count = record_pages(collector.source, directory, collector._search_params(), max_pages)
+    print(f"💾 {count} pages enregistrées dans {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Rendu des images WordCloud du dashboard
+
+Fonctions sans état, exécutées dans un pool de processus (voir
+worker_pools.py) : elles reçoivent les fréquences des mots et retournent
+l'image encodée. Le WordCloud est dessiné directement par PIL
+(generate_from_frequencies puis to_image), sans passer par matplotlib.
+"""
+
+from io import BytesIO
+from typing import Dict
+
+from wordcloud import WordCloud
+
+# Formats d'image servis (format de l'URL -> format PIL, type MIME)
+IMAGE_FORMATS = {
+    'png': ('PNG', 'image/png'),
+    'webp': ('WEBP', 'image/webp')
+}
+
+# Nombre maximal de mots affichés
+MAX_WORDS = 100
+
+
+def render_wordcloud(frequencies: Dict[str, int], image_format: str = 'png') -> bytes:
+    """
+    Génère le WordCloud de fréquences de mots et retourne l'image encodée.
+
+    Le placement des mots est déterministe (random_state fixe) : les mêmes
+    fréquences donnent la même image.
+
+    Args:
+        frequencies: Mot -> nombre d'occurrences (seuls les MAX_WORDS plus
+            fréquents sont affichés)
+        image_format: 'png' ou 'webp'
+    """
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Format d'image inconnu : {image_format} (disponibles : {', '.join(IMAGE_FORMATS)})")
+    if not frequencies:
+        raise ValueError("Aucun mot à afficher")
+
+    wordcloud = WordCloud(
+        width=800,
+        height=400,
+        background_color='white',
+        colormap='Reds',
+        max_words=MAX_WORDS,
+        relative_scaling=0.5,
+        collocations=False,
+        random_state=0
+    ).generate_from_frequencies(frequencies)
+
+    pil_format, _ = IMAGE_FORMATS[image_format]
+    img_buffer = BytesIO()
+    wordcloud.to_image().save(img_buffer, format=pil_format)
+    return img_buffer.getvalue()
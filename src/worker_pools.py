@@ -0,0 +1,202 @@
+"""
+Pools de workers bornés pour les endpoints du dashboard
+
+Les endpoints FastAPI sont asynchrones : un calcul pandas ou un rendu de
+WordCloud exécuté directement dans un handler bloque la boucle asyncio, donc
+toutes les autres requêtes du worker uvicorn. Chaque calcul est confié à un
+pool dédié :
+
+- Un pool de threads pour les requêtes courtes (lecture, filtres, agrégats).
+- Un pool de processus pour les rendus d'images : le rendu du WordCloud
+  (Python pur) garde le GIL et ralentirait aussi les threads des requêtes
+  courtes.
+
+Chaque pool limite le nombre de calculs simultanés (max_workers) et de
+calculs en attente (max_queue, au-delà la requête est refusée) ; il mesure
+le temps d'attente de chaque calcul avant son exécution.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Types de pools disponibles
+POOL_KINDS = ('thread', 'process')
+
+# Nombre de mesures conservées pour les percentiles
+_SAMPLES = 1000
+
+
+class PoolSaturatedError(RuntimeError):
+    """
+    Levée quand la file d'attente d'un pool est pleine.
+    """
+
+
+def _percentile(samples, fraction: float) -> float:
+    """
+    Percentile (plus proche rang) d'une liste de mesures.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class WorkerPool:
+    """
+    Pool borné (threads ou processus) utilisable depuis la boucle asyncio.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int = 64, kind: str = 'thread'):
+        """
+        Args:
+            name: Nom du pool (métriques)
+            max_workers: Nombre maximal de calculs simultanés
+            max_queue: Nombre maximal de calculs en attente d'un worker
+            kind: 'thread' ou 'process' (fonctions et arguments sérialisables)
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers doit être positif (reçu : {max_workers})")
+        if max_queue < 0:
+            raise ValueError(f"max_queue doit être positif ou nul (reçu : {max_queue})")
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Type de pool inconnu : {kind} (disponibles : {', '.join(POOL_KINDS)})")
+
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.running = 0
+        self.queued = 0
+        self._queue_times = deque(maxlen=_SAMPLES)
+        self._run_times = deque(maxlen=_SAMPLES)
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_executor(self) -> Executor:
+        """
+        Crée l'exécuteur au premier calcul (les processus ne démarrent pas à l'import).
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                if self.kind == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"{self.name}-pool"
+                    )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Sémaphore des workers, lié à la boucle asyncio courante.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Exécute func(*args, **kwargs) dans le pool, sans bloquer la boucle asyncio.
+
+        Raises:
+            PoolSaturatedError: Si max_queue calculs attendent déjà un worker
+        """
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(
+                f"Pool {self.name} saturé ({self.running} calculs en cours, {self.queued} en attente)"
+            )
+
+        self.submitted += 1
+        self.queued += 1
+        queued_at = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+        started_at = time.perf_counter()
+        self._queue_times.append(started_at - queued_at)
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self._run_times.append(time.perf_counter() - started_at)
+            semaphore.release()
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Retourne les compteurs du pool et les temps d'attente et d'exécution
+        (moyenne, p50, p99, max sur les derniers calculs), en secondes.
+        """
+        queue_times, run_times = list(self._queue_times), list(self._run_times)
+        return {
+            'kind': self.kind,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'running': self.running,
+            'queued': self.queued,
+            'queue_seconds': {
+                'mean': sum(queue_times) / len(queue_times) if queue_times else 0.0,
+                'p50': _percentile(queue_times, 0.5),
+                'p99': _percentile(queue_times, 0.99),
+                'max': max(queue_times, default=0.0)
+            },
+            'run_seconds': {
+                'mean': sum(run_times) / len(run_times) if run_times else 0.0,
+                'p50': _percentile(run_times, 0.5),
+                'p99': _percentile(run_times, 0.99),
+                'max': max(run_times, default=0.0)
+            }
+        }
+
+    def shutdown(self):
+        """
+        Arrête les workers (les calculs en cours se terminent).
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+def pool_from_env(name: str, prefix: str, default_workers: int, default_kind: str = 'thread') -> WorkerPool:
+    """
+    Crée un pool configuré par les variables <prefix>_WORKERS, <prefix>_QUEUE
+    et <prefix>_POOL (thread ou process).
+    """
+    return WorkerPool(
+        name,
+        max_workers=int(os.getenv(f'{prefix}_WORKERS', str(default_workers))),
+        max_queue=int(os.getenv(f'{prefix}_QUEUE', '64')),
+        kind=os.getenv(f'{prefix}_POOL', default_kind)
+    )